@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Award Versions
+
+This utility resolves the award rates, allowances, time categories, time
+bands and overtime rules that were in force on a given date. The top-level sections of
+config.json form the version that starts on award.effectiveDate. Later (or
+earlier) versions are listed in config["awardVersions"]:
+
+    "awardVersions": [
+        {
+            "effectiveDate": "2025-07-01",
+            "casual": {...},
+            "allowances": {...}
+        }
+    ]
+
+Each version only needs the sections that changed. Any section it omits is
+inherited from the version before it. Dates before the earliest version use
+the earliest version.
+
+Single dates are resolved with a binary search over the effective dates.
+Batches of dates are resolved by sorting them once and sweeping through the
+version spans.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from config_cache import ConfigCache
+
+# Config sections that can change from one award version to the next
+VERSIONED_SECTIONS = ("casual", "allowances", "timeCategories", "timeBands", "overtime")
+
+class AwardVersionIndex(TypedDict):
+    """Sorted effective dates with the resolved config for each version"""
+    dates: List[str]
+    configs: List[Dict]
+
+# Indexes already built, by the config they were built from
+_INDEX_CACHE = ConfigCache()
+
+def build_award_versions(config_data: Dict) -> AwardVersionIndex:
+    """
+    Build the sorted list of award versions from a config.
+
+    Args:
+        config_data: The full config, optionally containing "awardVersions"
+
+    Returns:
+        An index with the effective dates and a complete config per version
+    """
+    base = {key: value for key, value in config_data.items() if key != "awardVersions"}
+    base_date = base.get("award", {}).get("effectiveDate", "0001-01-01")
+
+    # Collect the versions in date order, starting with the top-level one
+    versions = [(base_date, {})]
+    for version in config_data.get("awardVersions", []):
+        if "effectiveDate" not in version:
+            raise ValueError("Award version is missing an effectiveDate")
+        versions.append((version["effectiveDate"], version))
+    versions.sort(key=lambda item: item[0])
+
+    dates = []
+    configs = []
+    previous = base
+    for effective_date, version in versions:
+        if dates and dates[-1] == effective_date:
+            raise ValueError(f"Duplicate award version effective {effective_date}")
+
+        resolved = dict(previous) if version else dict(base)
+        for section in VERSIONED_SECTIONS:
+            if section in version:
+                resolved[section] = version[section]
+        resolved["award"] = {**base.get("award", {}), "effectiveDate": effective_date}
+
+        dates.append(effective_date)
+        configs.append(resolved)
+        previous = resolved
+
+    return {"dates": dates, "configs": configs}
+
+def get_award_versions(config_data: Dict) -> AwardVersionIndex:
+    """Return the award version index for a config, building it once."""
+    return _INDEX_CACHE.get_or_build(config_data, lambda: build_award_versions(config_data))
+
+def get_award_config(config_data: Dict, date_str: str) -> Dict:
+    """
+    Return the config that applies on a date.
+
+    Configs without "awardVersions" are returned unchanged, so callers can pass
+    either the raw config or an already resolved version.
+    """
+    if "awardVersions" not in config_data:
+        return config_data
+
+    index = get_award_versions(config_data)
+    position = bisect_right(index["dates"], date_str) - 1
+    return index["configs"][max(position, 0)]
+
+def get_version_spans(config_data: Dict) -> List[Tuple[str, Optional[str], Dict]]:
+    """
+    Return (start, end, config) spans for every award version.
+
+    The end date is exclusive and None for the current version.
+    """
+    if "awardVersions" not in config_data:
+        return [(config_data.get("award", {}).get("effectiveDate", "0001-01-01"), None, config_data)]
+
+    index = get_award_versions(config_data)
+    ends = index["dates"][1:] + [None]
+    return list(zip(index["dates"], ends, index["configs"]))
+
+def resolve_award_configs(dates: List[str], config_data: Dict) -> List[Dict]:
+    """
+    Resolve the applicable config for a batch of dates.
+
+    The dates are visited in sorted order while walking the version spans, so
+    the whole batch costs one sort rather than one search per date.
+
+    Returns:
+        A list of configs in the same order as the dates
+    """
+    spans = get_version_spans(config_data)
+    resolved: List[Dict] = [spans[0][2]] * len(dates)
+
+    span_index = 0
+    for position in sorted(range(len(dates)), key=dates.__getitem__):
+        date_str = dates[position]
+        while span_index + 1 < len(spans) and date_str >= spans[span_index + 1][0]:
+            span_index += 1
+        resolved[position] = spans[span_index][2]
+
+    return resolved
@@ -7,6 +7,10 @@ It reads data from:
 - shiftspay.json: Contains processed shift information with pay details
 - payperiods.json: Contains pay period information for each employer
 - user.json: Contains user and employer information
+- config.json: Contains pay rates and award rules
+
+Pay category rates are taken from the award version in force at the start of
+each period, and tax uses the tax scale in force on the pay date.
 
 The script updates the payperiods.json file with:
 - Shifts that fall within each pay period
@@ -19,17 +23,56 @@ The script updates the payperiods.json file with:
 The script also updates the user.json file with:
 - Updated next pay dates for each employer
 
+and writes taxreconciliation.json with each financial year's withholding
+across all employers compared with the estimated annual tax (see
+tax_reconciliation.py). cashflow.json isn't refreshed; run
+cashflow_series.py afterwards when it's needed.
+
+Pass --workers to aggregate and tax pay periods on a pool of worker
+processes. Each employer's periods are split into blocks that are processed
+independently and merged back in order, so the output matches a serial run.
+
+Pass --profile to write cProfile, collapsed stack and allocation reports for
+each stage (see profiling.py).
+
+Pass --db to read shift pay and employers from a SQLite store and write the
+pay periods and next pay dates back to it, instead of the JSON files (see
+storage.py).
+
+Pass --binary-store to read shift pay from a memory-mapped binary shift
+store written by calculate_shift_pay.py instead of shiftspay.json, and
+aggregate the pay periods directly on its records (see shift_store.py).
+Aggregation then runs in this process, so it can't be combined with
+--workers. Reading the store needs NumPy (pip install numpy); no other
+option does.
+
+Pass --delta to also write the pay periods and employers that changed since
+the last run as an NDJSON patch stream (see delta_output.py). The data files
+are then left untouched when nothing changed.
+
 Usage:
-    python calculate_pay_periods.py
+    python calculate_pay_periods.py [--workers N] [--profile [DIR]] [--db PATH] [--delta PATH]
+                                    [--binary-store PATH]
 """
 
+import argparse
+import calendar
+import copy
 import json
 import os
-from typing import Dict, List, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
+from importlib.util import find_spec
 
 # Import the tax calculator
 from tax_calculator import calculate_tax
+from tax_reconciliation import print_reconciliations, reconcile_financial_years
+from award_versions import get_award_config
+from overtime import get_overtime_description, get_overtime_rates
+from null_profiler import NullProfiler
+
+# Number of pay periods handed to a worker at a time in parallel mode
+DEFAULT_PERIOD_BLOCK_SIZE = 26
 
 # Paths to data files
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -37,6 +80,11 @@ DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
 SHIFTSPAY_FILE = os.path.join(DATA_DIR, "shiftspay.json")
 PAYPERIODS_FILE = os.path.join(DATA_DIR, "payperiods.json")
 USER_FILE = os.path.join(DATA_DIR, "user.json")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+RECONCILIATION_FILE = os.path.join(DATA_DIR, "taxreconciliation.json")
+
+# Default directory for --profile reports
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
 
 def load_json_file(file_path: str) -> Dict:
     """Load and parse a JSON file."""
@@ -61,10 +109,15 @@ def save_json_file(file_path: str, data: Dict) -> None:
     
     print(f"Saved data to {file_path}")
 
-def get_next_pay_date(payday, days_to_add=0):
-    """Calculate the next pay date based on today's date, payday, and optional days to add."""
+def get_next_pay_date(payday, days_to_add=0, today=None):
+    """
+    Calculate the next pay date based on today's date, payday, and optional days to add.
+    
+    Pass today as a date to calculate from another day than the current one.
+    """
     # Get today's date
-    today = datetime.now().date()
+    if today is None:
+        today = datetime.now().date()
     
     # Map day names to weekday numbers (0 = Monday, 6 = Sunday)
     day_map = {
@@ -90,8 +143,39 @@ def get_next_pay_date(payday, days_to_add=0):
     
     return next_pay_date.strftime("%Y-%m-%d")
 
-def generate_pay_periods(employer, start_date_str, end_date_str):
-    """Generate pay periods for an employer between start and end dates."""
+def build_period_pay_categories(employer, period_start_str, config_data):
+    """
+    Build the empty pay categories for a period using the award rates in force.
+    
+    Returns None when the employer's level isn't in the award version in force.
+    """
+    award_config = get_award_config(config_data, period_start_str)
+    if employer["level"] not in award_config["casual"]:
+        return None
+    pay_rates = dict(award_config["casual"][employer["level"]]["rates"])
+    
+    # Overtime tiers are listed after the award's own categories
+    overtime_rates = get_overtime_rates(award_config, employer["level"])
+    pay_rates.update({category: rate for category, rate in overtime_rates.items() if category not in pay_rates})
+    
+    return [
+        {
+            "category": category,
+            "hours": 0,
+            "rate": rate,
+            "description": (get_overtime_description(award_config, category) if category in overtime_rates
+                            else award_config["timeCategories"].get(category, category))
+        }
+        for category, rate in pay_rates.items()
+    ]
+
+def generate_pay_periods(employer, start_date_str, end_date_str, config_data, verbose=True):
+    """
+    Generate pay periods for an employer between start and end dates.
+    
+    Periods whose award version doesn't have the employer's level get no pay
+    categories, with a warning if verbose.
+    """
     # Convert string dates to datetime objects
     start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
     end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
@@ -115,6 +199,7 @@ def generate_pay_periods(employer, start_date_str, end_date_str):
     
     # Generate periods
     periods = []
+    missing_level_starts = []
     current_start = first_period_start
     
     while current_start <= end_date:
@@ -133,6 +218,11 @@ def generate_pay_periods(employer, start_date_str, end_date_str):
         if days_to_adjust > 0:
             pay_date += timedelta(days=days_to_adjust)
         
+        pay_categories = build_period_pay_categories(employer, current_start.strftime("%Y-%m-%d"), config_data)
+        if pay_categories is None:
+            missing_level_starts.append(current_start.strftime("%Y-%m-%d"))
+            pay_categories = []
+        
         # Create the period
         period = {
             "startDate": current_start.strftime("%Y-%m-%d"),
@@ -143,38 +233,7 @@ def generate_pay_periods(employer, start_date_str, end_date_str):
             "grossPay": 0,
             "tax": 0,
             "netPay": 0,
-            "payCategories": [
-                {
-                    "category": "ordinary",
-                    "hours": 0,
-                    "rate": 32.06,
-                    "description": "Regular hours (Monday to Friday during day)"
-                },
-                {
-                    "category": "evening_mon_fri",
-                    "hours": 0,
-                    "rate": 38.48,
-                    "description": "Monday to Friday after 6pm"
-                },
-                {
-                    "category": "saturday",
-                    "hours": 0,
-                    "rate": 38.48,
-                    "description": "Saturday (higher rate)"
-                },
-                {
-                    "category": "sunday",
-                    "hours": 0,
-                    "rate": 44.89,
-                    "description": "Sunday (higher rate)"
-                },
-                {
-                    "category": "public_holiday",
-                    "hours": 0,
-                    "rate": 64.13,
-                    "description": "Public holiday (double pay)"
-                }
-            ],
+            "payCategories": pay_categories,
             "allowanceTotal": 0,
             "allowances": [],
             "totalGrossPay": 0
@@ -185,22 +244,38 @@ def generate_pay_periods(employer, start_date_str, end_date_str):
         # Move to the next period
         current_start = current_end + timedelta(days=1)
     
+    if missing_level_starts and verbose:
+        print(f"Warning: level {employer['level']} of employer {employer['id']} isn't in the award "
+              f"for {len(missing_level_starts)} pay periods from {missing_level_starts[0]}; "
+              f"their pay categories are left empty")
+    
     return periods
 
-def calculate_pay_periods():
-    """Main function to calculate pay periods."""
-    # Load data
-    shiftspay_data = load_json_file(SHIFTSPAY_FILE)
+def create_pay_periods(shiftspay_data: Dict, user_data: Dict, config_data: Dict,
+                       verbose: bool = True, today: Optional[date] = None) -> Dict:
+    """
+    Create empty pay periods for every employer.
+    
+    Periods cover the date range of each employer's shifts, or the current
+    month for employers without shifts.
     
-    # Load user data
-    user_data = load_json_file(USER_FILE)
+    Args:
+        shiftspay_data: Processed shifts, as stored in shiftspay.json
+        user_data: User and employer information, as stored in user.json
+        config_data: Pay rates and award rules, as stored in config.json
+        verbose: Print progress messages
+        today: The current date for employers without shifts, or None for today
     
+    Returns:
+        The pay periods data with empty periods
+    """
     # Create a fresh payperiods data structure
     payperiods_data = {"payPeriods": []}
     
     # Initialize payperiods data if empty
     if not payperiods_data["payPeriods"]:
-        print("Initializing pay periods data structure")
+        if verbose:
+            print("Initializing pay periods data structure")
         for employer in user_data["employers"]:
             payperiods_data["payPeriods"].append({
                 "employerId": employer["id"],
@@ -216,7 +291,8 @@ def calculate_pay_periods():
             employer = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
             
             if employer:
-                print(f"Generating pay periods for {employer_data['employer']}")
+                if verbose:
+                    print(f"Generating pay periods for {employer_data['employer']}")
                 # Get min and max dates from shifts to determine period range
                 employer_shifts = [shift for shift in shiftspay_data["shifts"] 
                                   if shift["employerId"] == employer_id]
@@ -228,178 +304,363 @@ def calculate_pay_periods():
                     max_date = max(shift_dates)
                     
                     # Generate periods for this date range
-                    periods = generate_pay_periods(employer, min_date, max_date)
+                    periods = generate_pay_periods(employer, min_date, max_date, config_data, verbose)
                     employer_data["periods"] = periods
                 else:
                     # No shifts, use current month
-                    today = datetime.now()
-                    start_of_month = datetime(today.year, today.month, 1)
-                    end_of_month = datetime(today.year, today.month + 1, 1) - timedelta(days=1)
+                    current_day = today or datetime.now().date()
+                    start_of_month = datetime(current_day.year, current_day.month, 1)
+                    last_day = calendar.monthrange(current_day.year, current_day.month)[1]
+                    end_of_month = datetime(current_day.year, current_day.month, last_day)
                     start_date = start_of_month.strftime("%Y-%m-%d")
                     end_date = end_of_month.strftime("%Y-%m-%d")
                     
-                    periods = generate_pay_periods(employer, start_date, end_date)
+                    periods = generate_pay_periods(employer, start_date, end_date, config_data, verbose)
                     employer_data["periods"] = periods
     
-    # Process each employer's pay periods
+    return payperiods_data
+
+def aggregate_pay_periods(payperiods_data: Dict, shiftspay_data: Dict,
+                          user_data: Dict) -> Dict[str, List[Optional[float]]]:
+    """
+    Sum the shifts that fall within each pay period.
+    
+    Sets the shift dates, hours, pay categories, gross pay and allowances of
+    every period. Tax is applied separately by apply_pay_period_tax.
+    
+    Returns:
+        The unrounded total gross amount of each period, by employer ID, in
+        the same order as the periods (None where the employer is unknown)
+    """
+    gross_amounts = {}
+    
     for employer_data in payperiods_data["payPeriods"]:
         employer_id = employer_data["employerId"]
+        employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
         
         # Get all shifts for this employer
         employer_shifts = [shift for shift in shiftspay_data["shifts"] 
                           if shift["employerId"] == employer_id]
         
-        # Process each pay period
+        employer_amounts = []
         for period in employer_data["periods"]:
-            start_date = period["startDate"]
-            end_date = period["endDate"]
-            
-            # Find shifts that fall within this pay period
-            period_shifts = [shift for shift in employer_shifts 
-                            if start_date <= shift["date"] <= end_date]
-            
-            # Store just the dates of each shift in the period
-            period["shifts"] = [shift["date"] for shift in period_shifts]
-            
-            # Calculate totals - simply sum up values from shifts
-            total_hours = 0
-            total_gross_pay = 0
-            total_allowances = 0
-            
-            # Dictionary to track allowances by name
-            allowances_by_name = {}
-            
-            # Reset pay categories hours
-            for category in period["payCategories"]:
-                category["hours"] = 0
-            
-            # Process each shift
-            for shift in period_shifts:
-                # Add hours worked
-                total_hours += shift["hoursWorked"]
-                
-                # Add gross pay
-                total_gross_pay += shift["grossPay"]
-                
-                # Tax and net pay now calculated at pay period level
-                
-                # Process allowances if present
-                if "allowances" in shift and shift["allowances"]:
-                    # Add to total allowances
-                    if "allowanceTotal" in shift:
-                        total_allowances += shift["allowanceTotal"]
-                    else:
-                        # Calculate from individual allowances if allowanceTotal not present
-                        shift_allowance_total = sum(allowance["amount"] for allowance in shift["allowances"])
-                        total_allowances += shift_allowance_total
-                    
-                    # Group allowances by name
-                    for allowance in shift["allowances"]:
-                        allowance_name = allowance["name"]
-                        allowance_amount = allowance["amount"]
-                        
-                        if allowance_name in allowances_by_name:
-                            allowances_by_name[allowance_name]["amount"] += allowance_amount
-                        else:
-                            allowances_by_name[allowance_name] = {
-                                "name": allowance_name,
-                                "amount": allowance_amount,
-                                "type": allowance.get("type", ""),
-                                "notes": allowance.get("notes", "")
-                            }
-                
-                # Add hours to each pay category
-                for shift_category in shift["payCategories"]:
-                    # Find matching category in period
-                    period_category = next(
-                        (cat for cat in period["payCategories"] 
-                         if cat["category"] == shift_category["category"]), 
-                        None
-                    )
-                    
-                    if period_category:
-                        period_category["hours"] += shift_category["hours"]
-            
-            # Get employer info for tax calculation
-            employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
+            employer_amounts.append(aggregate_pay_period(period, employer_shifts, employer_info is not None))
+        gross_amounts[employer_id] = employer_amounts
+    
+    return gross_amounts
+
+def aggregate_pay_period(period: Dict, employer_shifts: List[Dict], update_totals: bool = True) -> Optional[float]:
+    """
+    Sum the shifts that fall within one pay period.
+    
+    Returns:
+        The unrounded total gross amount, or None if totals weren't updated
+    """
+    start_date = period["startDate"]
+    end_date = period["endDate"]
+    
+    # Find shifts that fall within this pay period
+    period_shifts = [shift for shift in employer_shifts 
+                    if start_date <= shift["date"] <= end_date]
+    
+    # Store just the dates of each shift in the period
+    period["shifts"] = [shift["date"] for shift in period_shifts]
+    
+    # Calculate totals - simply sum up values from shifts
+    total_hours = 0
+    total_gross_pay = 0
+    total_allowances = 0
+    
+    # Dictionary to track allowances by name
+    allowances_by_name = {}
+    
+    # Reset pay categories hours
+    for category in period["payCategories"]:
+        category["hours"] = 0
+    
+    # Process each shift
+    for shift in period_shifts:
+        # Add hours worked
+        total_hours += shift["hoursWorked"]
+        
+        # Add gross pay
+        total_gross_pay += shift["grossPay"]
+        
+        # Tax and net pay now calculated at pay period level
+        
+        # Process allowances if present
+        if "allowances" in shift and shift["allowances"]:
+            # Add to total allowances
+            if "allowanceTotal" in shift:
+                total_allowances += shift["allowanceTotal"]
+            else:
+                # Calculate from individual allowances if allowanceTotal not present
+                shift_allowance_total = sum(allowance["amount"] for allowance in shift["allowances"])
+                total_allowances += shift_allowance_total
             
-            if not employer_info:
-                print(f"Warning: Employer {employer_id} not found in user data")
-                continue
+            # Group allowances by name
+            for allowance in shift["allowances"]:
+                allowance_name = allowance["name"]
+                allowance_amount = allowance["amount"]
                 
-            # Get tax settings from employer
-            pay_cycle = employer_info.get("paycycle", "weekly")
-            claims_tax_free_threshold = employer_info.get("taxFreeThreshold", True)
-            
-            # Calculate total gross pay for the period
-            total_gross_amount = total_gross_pay + total_allowances
-            rounded_gross = round(total_gross_amount, 2)
-            
-            # Determine the effective pay period length
-            start_date = datetime.strptime(period["startDate"], "%Y-%m-%d")
-            end_date = datetime.strptime(period["endDate"], "%Y-%m-%d")
-            period_days = (end_date - start_date).days + 1  # Include both start and end dates
-            
-            # Adjust calculation based on period length if needed
-            # For example, if a weekly pay cycle spans more than 7 days, adjust the calculation
-            period_adjustment = 1.0
-            if pay_cycle == "weekly" and period_days > 7:
-                # If period is longer than a week, adjust the calculation
-                period_adjustment = period_days / 7.0
-                print(f"Adjusting weekly pay cycle for period of {period_days} days: factor {period_adjustment}")
-            elif pay_cycle == "fortnightly" and period_days > 14:
-                # If period is longer than a fortnight, adjust the calculation
-                period_adjustment = period_days / 14.0
-                print(f"Adjusting fortnightly pay cycle for period of {period_days} days: factor {period_adjustment}")
-            
-            # Debug output
-            print(f"\nTax calculation for {employer_info['name']} pay period {period['startDate']} to {period['endDate']}:")
-            print(f"  Total gross amount: ${rounded_gross:.2f}")
-            print(f"  Pay cycle: {pay_cycle}")
-            print(f"  Claims tax-free threshold: {claims_tax_free_threshold}")
-            print(f"  Period days: {period_days} (adjustment factor: {period_adjustment:.2f})")
-            
-            # Calculate tax for the entire pay period
-            tax = calculate_tax(
-                rounded_gross,  # Use the rounded gross pay including allowances
-                pay_cycle,     # 'weekly', 'fortnightly', or 'monthly'
-                claims_tax_free_threshold,  # Whether employee claims tax-free threshold
-                True,          # Assuming employee has provided TFN
-                False,         # Assuming employee is not a foreign resident
-                0              # Assuming no tax offset amount
+                if allowance_name in allowances_by_name:
+                    allowances_by_name[allowance_name]["amount"] += allowance_amount
+                else:
+                    allowances_by_name[allowance_name] = {
+                        "name": allowance_name,
+                        "amount": allowance_amount,
+                        "type": allowance.get("type", ""),
+                        "notes": allowance.get("notes", "")
+                    }
+        
+        # Add hours to each pay category
+        for shift_category in shift["payCategories"]:
+            # Find matching category in period
+            period_category = next(
+                (cat for cat in period["payCategories"] 
+                 if cat["category"] == shift_category["category"]), 
+                None
             )
             
-            # Apply period adjustment if needed
-            if period_adjustment != 1.0 and pay_cycle != "monthly":
-                # For monthly pay cycles, the calculation already accounts for varying month lengths
-                # For weekly/fortnightly, we need to adjust based on the actual period length
-                tax = tax * period_adjustment
-                print(f"  Adjusted tax: ${tax:.2f} (after period adjustment)")
-            else:
-                print(f"  Calculated tax: ${tax:.2f}")
+            if period_category:
+                period_category["hours"] += shift_category["hours"]
+    
+    # Periods of unknown employers keep their zero totals
+    if not update_totals:
+        return None
+    
+    # Calculate total gross pay for the period
+    total_gross_amount = total_gross_pay + total_allowances
+    
+    # Update period totals - use rounded values for display
+    period["totalHours"] = round(total_hours, 2)
+    period["grossPay"] = round(total_gross_pay, 2)
+    period["allowanceTotal"] = round(total_allowances, 2)
+    period["totalGrossPay"] = round(total_gross_amount, 2)
+    
+    # Add allowances to the period
+    period["allowances"] = list(allowances_by_name.values())
+    
+    # Round all allowance amounts
+    for allowance in period["allowances"]:
+        allowance["amount"] = round(allowance["amount"], 2)
+    
+    return total_gross_amount
+
+def calculate_period_tax(total_gross_amount: float, employer_info: Dict, period: Dict,
+                         verbose: bool = True) -> float:
+    """
+    Calculate the PAYG withholding for a pay period's total gross amount.
+    
+    Pass verbose=False to skip the debug output, e.g. when evaluating many
+    hypothetical totals.
+    """
+    # Get tax settings from employer
+    pay_cycle = employer_info.get("paycycle", "weekly")
+    claims_tax_free_threshold = employer_info.get("taxFreeThreshold", True)
+    
+    rounded_gross = round(total_gross_amount, 2)
+    
+    # Determine the effective pay period length
+    start_date = datetime.strptime(period["startDate"], "%Y-%m-%d")
+    end_date = datetime.strptime(period["endDate"], "%Y-%m-%d")
+    period_days = (end_date - start_date).days + 1  # Include both start and end dates
+    
+    # Adjust calculation based on period length if needed
+    # For example, if a weekly pay cycle spans more than 7 days, adjust the calculation
+    period_adjustment = 1.0
+    if pay_cycle == "weekly" and period_days > 7:
+        # If period is longer than a week, adjust the calculation
+        period_adjustment = period_days / 7.0
+        if verbose:
+            print(f"Adjusting weekly pay cycle for period of {period_days} days: factor {period_adjustment}")
+    elif pay_cycle == "fortnightly" and period_days > 14:
+        # If period is longer than a fortnight, adjust the calculation
+        period_adjustment = period_days / 14.0
+        if verbose:
+            print(f"Adjusting fortnightly pay cycle for period of {period_days} days: factor {period_adjustment}")
+    
+    # Debug output
+    if verbose:
+        print(f"\nTax calculation for {employer_info['name']} pay period {period['startDate']} to {period['endDate']}:")
+        print(f"  Total gross amount: ${rounded_gross:.2f}")
+        print(f"  Pay cycle: {pay_cycle}")
+        print(f"  Claims tax-free threshold: {claims_tax_free_threshold}")
+        print(f"  Period days: {period_days} (adjustment factor: {period_adjustment:.2f})")
+    
+    # Calculate tax for the entire pay period
+    tax = calculate_tax(
+        rounded_gross,  # Use the rounded gross pay including allowances
+        pay_cycle,     # 'weekly', 'fortnightly', or 'monthly'
+        claims_tax_free_threshold,  # Whether employee claims tax-free threshold
+        True,          # Assuming employee has provided TFN
+        False,         # Assuming employee is not a foreign resident
+        0,             # Assuming no tax offset amount
+        period["payDate"]  # Use the tax scale in force on the pay date
+    )
+    
+    # Apply period adjustment if needed
+    if period_adjustment != 1.0 and pay_cycle != "monthly":
+        # For monthly pay cycles, the calculation already accounts for varying month lengths
+        # For weekly/fortnightly, we need to adjust based on the actual period length
+        tax = tax * period_adjustment
+        if verbose:
+            print(f"  Adjusted tax: ${tax:.2f} (after period adjustment)")
+    elif verbose:
+        print(f"  Calculated tax: ${tax:.2f}")
+    
+    return tax
+
+def apply_pay_period_tax(payperiods_data: Dict, gross_amounts: Dict[str, List[Optional[float]]],
+                         user_data: Dict, verbose: bool = True) -> None:
+    """Calculate tax and net pay for every aggregated pay period, printing the working if verbose."""
+    for employer_data in payperiods_data["payPeriods"]:
+        employer_id = employer_data["employerId"]
+        
+        # Get employer info for tax calculation
+        employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
+        
+        if not employer_info:
+            if verbose:
+                print(f"Warning: Employer {employer_id} not found in user data")
+            continue
+        
+        for period, total_gross_amount in zip(employer_data["periods"], gross_amounts[employer_id]):
+            tax = calculate_period_tax(total_gross_amount, employer_info, period, verbose)
             
             # Calculate net pay
             net_pay = total_gross_amount - tax
             
-            # Update period totals - use rounded values for display
-            period["totalHours"] = round(total_hours, 2)
-            period["grossPay"] = round(total_gross_pay, 2)
-            period["allowanceTotal"] = round(total_allowances, 2)
-            period["totalGrossPay"] = round(total_gross_amount, 2)
             period["tax"] = round(tax, 2)
             period["netPay"] = round(net_pay, 2)
-            
-            # Add allowances to the period
-            period["allowances"] = list(allowances_by_name.values())
-            
-            # Round all allowance amounts
-            for allowance in period["allowances"]:
-                allowance["amount"] = round(allowance["amount"], 2)
+
+def process_period_block(task: Tuple[List[Dict], List[Dict], Optional[Dict], bool]) -> List[Dict]:
+    """
+    Aggregate and tax a block of one employer's pay periods.
+    
+    Runs in a worker process in parallel mode.
+    
+    Args:
+        task: (periods, shifts of the employer within the block's dates, employer info,
+            whether to print the tax working)
+    
+    Returns:
+        The processed periods, in the same order
+    """
+    periods, block_shifts, employer_info, verbose = task
+    
+    for period in periods:
+        total_gross_amount = aggregate_pay_period(period, block_shifts, employer_info is not None)
+        if employer_info is None:
+            continue
+        
+        tax = calculate_period_tax(total_gross_amount, employer_info, period, verbose)
+        period["tax"] = round(tax, 2)
+        period["netPay"] = round(total_gross_amount - tax, 2)
+    
+    return periods
+
+def partition_period_blocks(payperiods_data: Dict, shiftspay_data: Dict, user_data: Dict,
+                            block_size: int, verbose: bool = True
+                            ) -> Tuple[List[int], List[Tuple[List[Dict], List[Dict], Optional[Dict], bool]]]:
+    """
+    Split every employer's periods into blocks with just the shifts they need.
+    
+    Shifts are partitioned by employer once, then each block gets the shifts
+    between its first start date and last end date, in their original order.
+    
+    Returns:
+        The index in payperiods_data["payPeriods"] that owns each block, and
+        the blocks as tasks for process_period_block
+    """
+    shifts_by_employer: Dict[str, List[Dict]] = {}
+    for shift in shiftspay_data["shifts"]:
+        shifts_by_employer.setdefault(shift["employerId"], []).append(shift)
     
-    # Write the data to the payperiods.json file
-    save_json_file(PAYPERIODS_FILE, payperiods_data)
+    owners = []
+    tasks = []
+    for employer_index, employer_data in enumerate(payperiods_data["payPeriods"]):
+        employer_id = employer_data["employerId"]
+        employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
+        if not employer_info and verbose:
+            print(f"Warning: Employer {employer_id} not found in user data")
+        
+        employer_shifts = shifts_by_employer.get(employer_id, [])
+        periods = employer_data["periods"]
+        for block_start in range(0, len(periods), block_size):
+            block = periods[block_start:block_start + block_size]
+            first_date = block[0]["startDate"]
+            last_date = block[-1]["endDate"]
+            block_shifts = [shift for shift in employer_shifts
+                            if first_date <= shift["date"] <= last_date]
+            owners.append(employer_index)
+            tasks.append((block, block_shifts, employer_info, verbose))
     
-    # Update next pay dates in user.json based on today's date
+    return owners, tasks
+
+def aggregate_and_tax_parallel(payperiods_data: Dict, shiftspay_data: Dict, user_data: Dict,
+                               workers: int, block_size: int = DEFAULT_PERIOD_BLOCK_SIZE,
+                               verbose: bool = True) -> None:
+    """
+    Aggregate and tax all pay periods on a pool of worker processes.
+    
+    Blocks are merged back in their original order, so the result is the
+    same as aggregate_pay_periods followed by apply_pay_period_tax.
+    """
+    # Imported here so the process pool machinery is only loaded for parallel runs
+    from concurrent.futures import ProcessPoolExecutor
+    
+    owners, tasks = partition_period_blocks(payperiods_data, shiftspay_data, user_data, block_size, verbose)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(process_period_block, tasks))
+    
+    # Workers return copies, so rebuild each employer's periods from its blocks in order
+    merged_periods: List[List[Dict]] = [[] for _ in payperiods_data["payPeriods"]]
+    for employer_index, periods in zip(owners, results):
+        merged_periods[employer_index].extend(periods)
+    
+    for employer_data, periods in zip(payperiods_data["payPeriods"], merged_periods):
+        employer_data["periods"] = periods
+
+def build_pay_periods(shiftspay_data: Dict, user_data: Dict, config_data: Dict,
+                      workers: int = 1, verbose: bool = True, today: Optional[date] = None) -> Dict:
+    """
+    Build pay periods with totals and tax for every employer.
+    
+    Args:
+        shiftspay_data: Processed shifts, as stored in shiftspay.json
+        user_data: User and employer information, as stored in user.json
+        config_data: Pay rates and award rules, as stored in config.json
+        workers: Number of worker processes; 1 runs everything in this process
+        verbose: Print progress and tax working
+        today: The current date for employers without shifts, or None for today
+    
+    Returns:
+        The pay periods data, as stored in payperiods.json
+    """
+    payperiods_data = create_pay_periods(shiftspay_data, user_data, config_data, verbose, today)
+    if workers > 1:
+        aggregate_and_tax_parallel(payperiods_data, shiftspay_data, user_data, workers, verbose=verbose)
+    else:
+        gross_amounts = aggregate_pay_periods(payperiods_data, shiftspay_data, user_data)
+        apply_pay_period_tax(payperiods_data, gross_amounts, user_data, verbose)
+    return payperiods_data
+
+def get_next_pay_dates(payperiods_data: Dict, user_data: Dict,
+                       today: Optional[date] = None) -> Dict[str, str]:
+    """
+    Work out the next pay date of each employer with pay periods.
+    
+    Args:
+        payperiods_data: The pay periods data, as stored in payperiods.json
+        user_data: User and employer information, as stored in user.json
+        today: The date to count from, or None for today
+    
+    Returns:
+        The next pay date (YYYY-MM-DD) by employer ID; today if it is payday
+    """
+    next_pay_dates = {}
     for employer_data in payperiods_data["payPeriods"]:
         employer_id = employer_data["employerId"]
         
@@ -407,34 +668,152 @@ def calculate_pay_periods():
         employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
         
         if employer_info:
-            # Get the payday from employer info
-            payday = employer_info["payday"]
-            
-            # Get today's date as a string
-            today_str = datetime.now().date().strftime("%Y-%m-%d")
+            # get_next_pay_date gives today's date when today is the payday
+            next_pay_dates[employer_id] = get_next_pay_date(employer_info["payday"], today=today)
+    
+    return next_pay_dates
+
+def update_next_pay_dates(payperiods_data: Dict, user_data: Dict) -> None:
+    """Update the next pay date of each employer in user_data based on today's date."""
+    next_pay_dates = get_next_pay_dates(payperiods_data, user_data)
+    for employer_info in user_data["employers"]:
+        if employer_info["id"] in next_pay_dates:
+            employer_info["nextPayDate"] = next_pay_dates[employer_info["id"]]
+
+def calculate_pay_periods(profile_dir: Optional[str] = None, workers: int = 1,
+                          db_path: Optional[str] = None, delta_path: Optional[str] = None,
+                          shift_store_path: Optional[str] = None):
+    """
+    Main function to calculate pay periods.
+    
+    Args:
+        profile_dir: Directory for per-stage profile reports, or None to skip profiling
+        workers: Number of worker processes for aggregation and tax
+        db_path: SQLite store to use instead of the JSON files, if any
+        delta_path: File to write the changed periods and employers to as an NDJSON patch, if any
+        shift_store_path: Binary shift store to read shift pay from instead of shiftspay.json, if any
+    """
+    if profile_dir:
+        # Imported here so cProfile, pstats and tracemalloc are only loaded when profiling
+        from profiling import StageProfiler
+        profiler = StageProfiler(profile_dir, "calculate_pay_periods")
+    else:
+        profiler = NullProfiler()
+    
+    with profiler.stage("load"):
+        if shift_store_path:
+            # Imported here so NumPy is only loaded when the binary store is used
+            from shift_store import ShiftStore, aggregate_store_periods
             
-            # If today is the employer's payday, use today's date
-            today_weekday = datetime.now().date().weekday()
-            day_map = {
-                "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
-                "Friday": 4, "Saturday": 5, "Sunday": 6
-            }
-            payday_weekday = day_map[payday]
+            # Map the binary store; only each employer's first and last shift become objects
+            shift_store = ShiftStore(shift_store_path)
+            shiftspay_data = shift_store.get_date_ranges()
+        
+        if db_path:
+            # Load shift pay and user data from the store; imported here so
+            # sqlite3 is only loaded when the store is used
+            from storage import PayStore
+            store = PayStore(db_path)
+            if not shift_store_path:
+                shiftspay_data = {"shifts": store.get_shift_pay()}
+            user_data = store.get_user()
+        else:
+            # Load data
+            if not shift_store_path:
+                shiftspay_data = load_json_file(SHIFTSPAY_FILE)
             
-            if today_weekday == payday_weekday:
-                # Today is the payday, use today's date
-                next_pay_date = today_str
+            # Load user data
+            user_data = load_json_file(USER_FILE)
+        
+        # Load award config for pay rates
+        config_data = load_json_file(CONFIG_FILE)
+    
+    if workers > 1 and not shift_store_path:
+        # Aggregation and tax run together in the workers
+        with profiler.stage("aggregate_tax_parallel"):
+            payperiods_data = create_pay_periods(shiftspay_data, user_data, config_data)
+            aggregate_and_tax_parallel(payperiods_data, shiftspay_data, user_data, workers)
+    else:
+        with profiler.stage("aggregate"):
+            payperiods_data = create_pay_periods(shiftspay_data, user_data, config_data)
+            if shift_store_path:
+                gross_amounts = aggregate_store_periods(shift_store, payperiods_data, user_data)
+                shift_store.close()
+            else:
+                gross_amounts = aggregate_pay_periods(payperiods_data, shiftspay_data, user_data)
+        
+        with profiler.stage("tax"):
+            apply_pay_period_tax(payperiods_data, gross_amounts, user_data)
+    
+    with profiler.stage("reconcile"):
+        # Compare each financial year's withholding with the estimated annual tax
+        reconciliations = reconcile_financial_years(payperiods_data, user_data)
+        print_reconciliations(reconciliations)
+    
+    with profiler.stage("save"):
+        previous_user_data = copy.deepcopy(user_data) if delta_path else None
+        
+        # Update next pay dates in user.json based on today's date
+        update_next_pay_dates(payperiods_data, user_data)
+        
+        if delta_path:
+            # Imported here so the delta writer (and sqlite3) is only loaded when used
+            from delta_output import count_ops, diff_employers, diff_pay_periods, write_patch_stream
+            if db_path:
+                previous_payperiods_data = store.get_payperiods_data()
+            elif os.path.exists(PAYPERIODS_FILE):
+                previous_payperiods_data = load_json_file(PAYPERIODS_FILE)
             else:
-                # Find the next occurrence of the payday
-                next_pay_date = get_next_pay_date(payday)
+                previous_payperiods_data = {"payPeriods": []}
+            ops = (diff_pay_periods(previous_payperiods_data, payperiods_data)
+                   + diff_employers(previous_user_data, user_data))
+            write_patch_stream(delta_path, ops)
+            print(f"Wrote {count_ops(ops)} to {delta_path}")
+        
+        if db_path:
+            # Write only the changed periods and employers to the store
+            period_changes = store.sync_pay_periods(payperiods_data)
+            employer_changes = store.sync_user(user_data)
+            store.close()
+            print(f"Updated {db_path}: {period_changes['upserted']} pay periods upserted, "
+                  f"{period_changes['deleted']} deleted, {employer_changes['upserted']} employers updated")
+        elif delta_path and not ops:
+            print("No pay period or employer changes, left the data files unchanged")
+        else:
+            # Write the data to the payperiods.json file
+            save_json_file(PAYPERIODS_FILE, payperiods_data)
             
-            # Update the employer's next pay date
-            employer_info["nextPayDate"] = next_pay_date
+            # Write the user data back to the file
+            save_json_file(USER_FILE, user_data)
+        
+        # The reconciliation is a derived report, so it is written as JSON in both modes
+        save_json_file(RECONCILIATION_FILE, {"financialYears": reconciliations})
     
-    # Write the user data back to the file
-    save_json_file(USER_FILE, user_data)
+    profiler.write_summary()
     
     print("Pay periods created and next pay dates updated successfully!")
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Aggregate shift pay into pay periods.")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                        help=f"Write profile reports for each stage to DIR (default {PROFILE_DIR})")
+    parser.add_argument("--db", help="Read and write through this SQLite store instead of the JSON files")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for aggregation and tax (default 1, 0 for one per CPU)")
+    parser.add_argument("--delta", metavar="PATH",
+                        help="Write the changed pay periods and employers to PATH as an NDJSON patch")
+    parser.add_argument("--binary-store", metavar="PATH",
+                        help="Read shift pay from this binary shift store instead of shiftspay.json")
+    args = parser.parse_args(argv)
+    if args.binary_store and args.workers != 1:
+        parser.error("--binary-store aggregates in this process and can't be used with --workers")
+    if args.binary_store and find_spec("numpy") is None:
+        parser.error("--binary-store needs NumPy to read the store (pip install numpy)")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
 if __name__ == "__main__":
-    calculate_pay_periods()
+    args = parse_args()
+    calculate_pay_periods(args.profile, args.workers, args.db, args.delta, args.binary_store)
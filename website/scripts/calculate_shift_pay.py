@@ -8,15 +8,60 @@ It reads data from:
 - user.json: Contains employee level and employer information
 - config.json: Contains pay rates and award rules
 
+Each shift is priced with the award version in force on its date (see
+award_versions.py), so recomputing history keeps the historical rates.
+Public holidays come from config.json where listed and are generated from
+rules for other years (see public_holidays.py).
+
+Shifts with the same signature (day classes, start, end, employer level,
+state, allowances and award version) reuse cached pay components (see
+pay_cache.py). Pass --cache-file to keep the cache between runs.
+
+Hours past the daily or weekly thresholds, or worked without the minimum
+rest between shifts, are paid as overtime when config.json has an "overtime"
+section (see overtime.py).
+
+Pass --profile to write cProfile, collapsed stack and allocation reports for
+each stage (see profiling.py).
+
+Pass --db to read shifts and employers from a SQLite store and write the
+computed shift pay back to it, instead of the JSON files (see storage.py).
+
+Shifts are validated when loaded (see roster_validation.py). Duplicates,
+unparseable records and shifts for unknown employers are reported and not
+paid; overlaps and zero-length shifts are reported only. Pass
+--validation-report to write the issues as JSON, and --strict to stop
+without writing anything if there are any errors.
+
+Pass --binary-store to also write the computed shifts to a fixed-width
+binary store that calculate_pay_periods.py can memory-map (see
+shift_store.py).
+
+Pass --delta to also write the shifts that changed since the last run as an
+NDJSON patch stream (see delta_output.py). shiftspay.json is then left
+untouched when nothing changed.
+
 Usage:
-    python calculate_shift_pay.py
+    python calculate_shift_pay.py [--cache-file PATH] [--cache-size N] [--profile [DIR]] [--db PATH]
+                                  [--delta PATH] [--validation-report PATH] [--strict]
+                                  [--binary-store PATH]
 """
 
+import argparse
 import json
 import os
 from datetime import datetime, time, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 
+from award_versions import get_award_config, resolve_award_configs
+from overtime import apply_overtime
+from pay_cache import DEFAULT_CACHE_SIZE, ShiftPayCache, get_config_fingerprint
+from null_profiler import NullProfiler
+from public_holidays import get_holiday_dates
+from roster_validation import filter_shifts, find_roster_issues, make_issue, summarize_issues
+from shift_units import MINUTES_PER_DAY
+from time_bands import get_time_bands, split_minutes
+
 # Paths to data files
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
@@ -25,6 +70,12 @@ USER_FILE = os.path.join(DATA_DIR, "user.json")
 CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
 SHIFTSPAY_FILE = os.path.join(DATA_DIR, "shiftspay.json")
 
+# Default directory for --profile reports
+PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+
+# Roster validation issues printed before the rest are summarised
+MAX_PRINTED_ISSUES = 20
+
 def load_json_file(file_path: str) -> Dict:
     """Load and parse a JSON file."""
     with open(file_path, 'r') as f:
@@ -41,90 +92,61 @@ def parse_time(time_str: str) -> time:
     return time(hours, minutes)
 
 def is_public_holiday(date_str: str, state: str, config: Dict) -> bool:
-    """Check if a date is a public holiday in the given state."""
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    year = date_obj.year
-    
-    # If the year isn't in the config, return False
-    if str(year) not in config["publicHolidays"]:
-        return False
+    """
+    Check if a date is a public holiday in the given state.
     
-    holidays = config["publicHolidays"][str(year)]
+    Holidays listed in config["publicHolidays"] take precedence; other years
+    are generated from rules (see public_holidays.py).
+    """
+    return date_str in get_holiday_dates(config["publicHolidays"], int(date_str[:4]), state)
+
+def get_shift_minutes(start_time: str, end_time: str) -> Tuple[int, int]:
+    """Return the shift start and end in minutes after midnight of the shift date."""
+    start = parse_time(start_time)
+    end = parse_time(end_time)
     
-    # Check national holidays
-    for holiday in holidays.get("national", []):
-        if holiday["date"] == date_str:
-            return True
+    start_minute = start.hour * 60 + start.minute
+    end_minute = end.hour * 60 + end.minute
     
-    # Check state-specific holidays
-    for holiday in holidays.get(state, []):
-        if holiday["date"] == date_str:
-            # Skip regional holidays unless we want to implement regional checking
-            if "regional" in holiday and isinstance(holiday["regional"], bool) and holiday["regional"]:
-                continue
-            return True
+    # If end time is before start time, it means the shift ends on the next day
+    if end_minute < start_minute:
+        end_minute += MINUTES_PER_DAY
     
-    return False
+    return start_minute, end_minute
+
+def get_shift_holidays(date_obj: datetime, end_minute: int, is_holiday: bool,
+                       state: str, config_data: Optional[Dict]) -> List[bool]:
+    """Return whether each calendar day touched by a shift is a public holiday."""
+    holidays = [is_holiday]
+    for day in range(1, (end_minute - 1) // MINUTES_PER_DAY + 1):
+        next_date = (date_obj + timedelta(days=day)).strftime("%Y-%m-%d")
+        holidays.append(config_data is not None and is_public_holiday(next_date, state, config_data))
+    return holidays
 
 def calculate_hours_in_categories(date_str: str, start_time: str, end_time: str, 
-                                 is_holiday: bool, state: str) -> Dict[str, float]:
+                                 is_holiday: bool, state: str,
+                                 config_data: Optional[Dict] = None) -> Dict[str, float]:
     """
     Calculate hours worked in different pay categories.
     Returns a dictionary with categories as keys and hours as values.
-    """
-    start = parse_time(start_time)
-    end = parse_time(end_time)
     
-    # Create datetime objects for easier calculation
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    start_dt = datetime.combine(date_obj, start)
-    end_dt = datetime.combine(date_obj, end)
-    
-    # If end time is before start time, it means the shift ends on the next day
-    if end_dt < start_dt:
-        end_dt = end_dt + timedelta(days=1)
+    Hours are split using the time bands in config_data (see time_bands.py).
+    Shifts that run past midnight are split by calendar day, checking each
+    later day for a public holiday when config_data is given.
+    """
+    start_minute, end_minute = get_shift_minutes(start_time, end_time)
     
     # Get day of week (0 = Monday, 6 = Sunday)
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
     day_of_week = date_obj.weekday()
     
-    # Initialize categories
-    categories = {
-        "ordinary": 0,
-        "evening_mon_fri": 0,
-        "saturday": 0,
-        "sunday": 0,
-        "public_holiday": 0
-    }
+    # Work out which calendar days of the shift are public holidays
+    holidays = get_shift_holidays(date_obj, end_minute, is_holiday, state, config_data)
     
-    # If it's a public holiday, all hours go to public_holiday
-    if is_holiday:
-        total_hours = (end_dt - start_dt).total_seconds() / 3600
-        categories["public_holiday"] = total_hours
-        return categories
-    
-    # Process based on day of week
-    if day_of_week == 5:  # Saturday
-        total_hours = (end_dt - start_dt).total_seconds() / 3600
-        categories["saturday"] = total_hours
-    elif day_of_week == 6:  # Sunday
-        total_hours = (end_dt - start_dt).total_seconds() / 3600
-        categories["sunday"] = total_hours
-    else:  # Monday to Friday
-        # Evening rate applies after 6pm
-        evening_start = datetime.combine(date_obj, time(18, 0))
-        
-        if start_dt >= evening_start:
-            # Shift starts after 6pm, all hours at evening rate
-            categories["evening_mon_fri"] = (end_dt - start_dt).total_seconds() / 3600
-        elif end_dt <= evening_start:
-            # Shift ends before 6pm, all hours at ordinary rate
-            categories["ordinary"] = (end_dt - start_dt).total_seconds() / 3600
-        else:
-            # Shift spans 6pm, split between ordinary and evening
-            categories["ordinary"] = (evening_start - start_dt).total_seconds() / 3600
-            categories["evening_mon_fri"] = (end_dt - evening_start).total_seconds() / 3600
+    minutes = split_minutes(get_time_bands(config_data), start_minute, end_minute,
+                            day_of_week, holidays)
     
-    return categories
+    return {category: category_minutes / 60 for category, category_minutes in minutes.items()}
 
 def calculate_break_minutes(hours_worked: float, config: Dict) -> int:
     """Calculate unpaid break minutes based on hours worked."""
@@ -142,8 +164,9 @@ def calculate_break_minutes(hours_worked: float, config: Dict) -> int:
     
     return 0
 
-def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_data: Dict) -> List[Dict]:
-    """Calculate applicable allowances for a shift based on employer settings."""
+def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_data: Dict,
+                                    verbose: bool = True) -> List[Dict]:
+    """Calculate applicable allowances for a shift based on employer settings, printing the working if verbose."""
     # Get the allowances from config
     if "allowances" not in config_data or "items" not in config_data["allowances"]:
         return []
@@ -156,7 +179,8 @@ def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_dat
     config_allowances = config_data["allowances"]["items"]
     
     # For debugging
-    print(f"Processing allowances for {employer_info['name']}")
+    if verbose:
+        print(f"Processing allowances for {employer_info['name']}")
     
     # Get shift details for allowance calculations
     shift_date = shift["date"]
@@ -188,10 +212,12 @@ def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_dat
         # Find the allowance in the config
         config_allowance = next((a for a in config_allowances if a["name"] == allowance_name), None)
         if not config_allowance:
-            print(f"Allowance '{allowance_name}' not found in config")
+            if verbose:
+                print(f"Allowance '{allowance_name}' not found in config")
             continue
             
-        print(f"Processing allowance: {allowance_name}, type: {config_allowance.get('type', 'unknown')}")
+        if verbose:
+            print(f"Processing allowance: {allowance_name}, type: {config_allowance.get('type', 'unknown')}")
         
         # Calculate the allowance amount based on type
         allowance_type = config_allowance.get("type", "")
@@ -201,27 +227,32 @@ def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_dat
             # Hourly allowances are multiplied by shift hours
             rate = config_allowance.get("rate", 0)
             allowance_amount = rate * shift_hours
-            print(f"Hourly allowance: {rate} * {shift_hours} = {allowance_amount}")
+            if verbose:
+                print(f"Hourly allowance: {rate} * {shift_hours} = {allowance_amount}")
         elif allowance_type == "per-shift":
             # Per-shift allowances are applied once per shift
             allowance_amount = config_allowance.get("rate", 0)
-            print(f"Per-shift allowance: {allowance_amount}")
+            if verbose:
+                print(f"Per-shift allowance: {allowance_amount}")
         elif allowance_type == "weekly":
             # Weekly allowances are pro-rated based on a 38-hour week
             rate = config_allowance.get("rate", 0)
             allowance_amount = (rate / 38) * shift_hours
-            print(f"Weekly allowance: ({rate}/38) * {shift_hours} = {allowance_amount}")
+            if verbose:
+                print(f"Weekly allowance: ({rate}/38) * {shift_hours} = {allowance_amount}")
         elif allowance_type == "meal" and "rate" in config_allowance:
             # Meal allowances - use the first meal rate
             if isinstance(config_allowance["rate"], list) and len(config_allowance["rate"]) > 0:
                 allowance_amount = config_allowance["rate"][0]
             else:
                 allowance_amount = config_allowance.get("rate", 0)
-            print(f"Meal allowance: {allowance_amount}")
+            if verbose:
+                print(f"Meal allowance: {allowance_amount}")
         
         # Only add allowances with a calculable amount
         if allowance_amount > 0:
-            print(f"Adding allowance: {allowance_name}, amount: {allowance_amount}")
+            if verbose:
+                print(f"Adding allowance: {allowance_name}, amount: {allowance_amount}")
             applicable_allowances.append({
                 "name": allowance_name,
                 "amount": round(allowance_amount, 2),
@@ -231,8 +262,50 @@ def calculate_applicable_allowances(shift: Dict, employer_info: Dict, config_dat
     
     return applicable_allowances
 
-def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict) -> Dict:
-    """Calculate pay details for a single shift."""
+def get_shift_signature(shift: Dict, employer_info: Dict, is_holiday: bool,
+                        config_data: Dict) -> List[Any]:
+    """
+    Build the cache signature of a shift.
+    
+    Two shifts with the same signature have the same pay components. Each
+    calendar day of the shift is classed as its weekday or as a public holiday.
+    """
+    start_minute, end_minute = get_shift_minutes(shift["start"], shift["end"])
+    date_obj = datetime.strptime(shift["date"], "%Y-%m-%d")
+    holidays = get_shift_holidays(date_obj, end_minute, is_holiday,
+                                  employer_info["state"], config_data)
+    day_classes = ["holiday" if holiday else (date_obj.weekday() + day) % 7
+                   for day, holiday in enumerate(holidays)]
+    
+    allowance_plan = [
+        [allowance["name"], allowance.get("notes", "")]
+        for allowance in employer_info.get("applicableAllowances", [])
+        if allowance.get("enabled", False)
+    ]
+    
+    return [
+        day_classes,
+        start_minute,
+        end_minute,
+        employer_info["level"],
+        employer_info["state"],
+        allowance_plan,
+        config_data.get("award", {}).get("effectiveDate"),
+        get_config_fingerprint(config_data)
+    ]
+
+def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict,
+                        cache: Optional[ShiftPayCache] = None, verbose: bool = True) -> Dict:
+    """
+    Calculate pay details for a single shift.
+    
+    When a cache is given, shifts with a known signature reuse the cached pay
+    components and only the shift's own fields are copied onto them. Pass
+    verbose=False to skip the allowance debug output.
+    """
+    # Use the award version in force on the shift date
+    config_data = get_award_config(config_data, shift["date"])
+    
     # Get employer info
     employer_id = shift["employerId"]
     employer_info = next((emp for emp in user_data["employers"] if emp["id"] == employer_id), None)
@@ -247,9 +320,19 @@ def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict) -> Dict
     # Check if public holiday
     is_holiday = is_public_holiday(shift["date"], state, config_data)
     
+    # Reuse the pay components of an identical shift if we've seen one
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(get_shift_signature(shift, employer_info, is_holiday, config_data))
+        components = cache.get(cache_key)
+        if components is not None:
+            result = shift.copy()
+            result.update(components)
+            return result
+    
     # Calculate hours in different categories
     hours_by_category = calculate_hours_in_categories(
-        shift["date"], shift["start"], shift["end"], is_holiday, state
+        shift["date"], shift["start"], shift["end"], is_holiday, state, config_data
     )
     
     # Get pay rates for the level
@@ -294,7 +377,7 @@ def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict) -> Dict
     avg_pay_rate = round(total_pay / adjusted_hours, 2) if adjusted_hours > 0 else 0
     
     # Calculate applicable allowances
-    allowances = calculate_applicable_allowances(shift, employer_info, config_data)
+    allowances = calculate_applicable_allowances(shift, employer_info, config_data, verbose)
     
     # Calculate the total gross pay (base pay + allowances)
     total_gross_pay = total_pay
@@ -306,8 +389,7 @@ def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict) -> Dict
     # Tax calculation moved to pay period calculation
     
     # Create the result
-    result = shift.copy()
-    result.update({
+    components = {
         "hoursWorked": round(adjusted_hours, 2),
         "isPublicHoliday": is_holiday,
         "payCategories": pay_categories,
@@ -317,35 +399,161 @@ def calculate_shift_pay(shift: Dict, user_data: Dict, config_data: Dict) -> Dict
         "allowanceTotal": round(allowance_total, 2),
         "totalGrossPay": round(total_gross_pay, 2),
         "unpaidBreakMinutes": unpaid_break_minutes
-    })
+    }
+    
+    if cache is not None:
+        cache.put(cache_key, components)
+    
+    result = shift.copy()
+    result.update(components)
     
     return result
 
-def main():
-    """Main function to process all shifts and update shiftspay.json."""
-    print("Loading data files...")
-    shifts_data = load_json_file(SHIFTS_FILE)
-    user_data = load_json_file(USER_FILE)
-    config_data = load_json_file(CONFIG_FILE)
+def process_shifts(shifts: List[Dict], user_data: Dict, config_data: Dict,
+                   cache: Optional[ShiftPayCache] = None, verbose: bool = True,
+                   errors: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Calculate pay for a list of shifts.
     
-    print(f"Processing {len(shifts_data['shifts'])} shifts...")
+    Shifts that fail to process are left out of the result. They are reported
+    if verbose, and added to errors (when given) as "pricing_error" issues in
+    the roster_validation.py format, indexed by position in shifts. Overtime
+    is then reclassified across the shifts when the config has overtime rules
+    (see overtime.py).
+    """
+    # Resolve the award version for every shift in one pass
+    award_configs = resolve_award_configs([shift["date"] for shift in shifts], config_data)
     
     # Calculate pay for each shift
     processed_shifts = []
-    for shift in shifts_data["shifts"]:
+    for index, (shift, award_config) in enumerate(zip(shifts, award_configs)):
         try:
-            processed_shift = calculate_shift_pay(shift, user_data, config_data)
+            processed_shift = calculate_shift_pay(shift, user_data, award_config, cache, verbose)
             processed_shifts.append(processed_shift)
-            print(f"Processed shift on {shift['date']} for {shift['employer']}")
+            if verbose:
+                print(f"Processed shift on {shift['date']} for {shift['employer']}")
         except Exception as e:
-            print(f"Error processing shift on {shift['date']}: {e}")
+            if verbose:
+                print(f"Error processing shift on {shift['date']}: {e}")
+            if errors is not None:
+                errors.append(make_issue("pricing_error", "error", index, shift,
+                                         f"Can't calculate pay for shift on {shift['date']}: {e!r}"))
+    
+    return apply_overtime(processed_shifts, user_data, config_data)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Calculate pay for each shift.")
+    parser.add_argument("--cache-file", help="Load and save the shift pay cache in this file")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Maximum number of cached shift signatures (default {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                        help=f"Write profile reports for each stage to DIR (default {PROFILE_DIR})")
+    parser.add_argument("--db", help="Read and write through this SQLite store instead of the JSON files")
+    parser.add_argument("--delta", metavar="PATH", help="Write the changed shifts to PATH as an NDJSON patch")
+    parser.add_argument("--validation-report", metavar="PATH", help="Write roster validation issues to PATH as JSON")
+    parser.add_argument("--strict", action="store_true", help="Stop if roster validation finds any errors")
+    parser.add_argument("--binary-store", metavar="PATH", help="Also write the computed shifts to this binary shift store")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to process all shifts and update shiftspay.json."""
+    args = parse_args(argv)
+    if args.profile:
+        # Imported here so cProfile, pstats and tracemalloc are only loaded when profiling
+        from profiling import StageProfiler
+        profiler = StageProfiler(args.profile, "calculate_shift_pay")
+    else:
+        profiler = NullProfiler()
+    
+    with profiler.stage("load"):
+        print("Loading data files...")
+        if args.db:
+            # Imported here so sqlite3 is only loaded when the store is used
+            from storage import open_store
+            store = open_store(args.db, SHIFTS_FILE, USER_FILE)
+            shifts_data = {"shifts": store.get_shifts()}
+            user_data = store.get_user()
+        else:
+            shifts_data = load_json_file(SHIFTS_FILE)
+            user_data = load_json_file(USER_FILE)
+        config_data = load_json_file(CONFIG_FILE)
+        
+        if args.cache_file:
+            cache = ShiftPayCache.load(args.cache_file, args.cache_size)
+            print(f"Loaded {len(cache)} cached shift signatures from {args.cache_file}")
+        else:
+            cache = ShiftPayCache(args.cache_size)
+    
+    with profiler.stage("validate"):
+        employer_ids = {employer["id"] for employer in user_data["employers"]}
+        issues = find_roster_issues(shifts_data["shifts"], employer_ids)
+        if issues:
+            counts = ", ".join(f"{count} {issue_type}" for issue_type, count in summarize_issues(issues).items())
+            print(f"Roster validation found {len(issues)} issues ({counts})")
+            for issue in issues[:MAX_PRINTED_ISSUES]:
+                print(f"  {issue['severity'].capitalize()}: shift {issue['index']}: {issue['message']}")
+            if len(issues) > MAX_PRINTED_ISSUES:
+                print(f"  ... and {len(issues) - MAX_PRINTED_ISSUES} more")
+        
+        if args.validation_report:
+            save_json_file(args.validation_report, {"summary": summarize_issues(issues), "issues": issues})
+            print(f"Saved roster validation report to {args.validation_report}")
+        
+        if args.strict and any(issue["severity"] == "error" for issue in issues):
+            raise SystemExit("Roster validation failed, no files were updated")
+        
+        shifts = filter_shifts(shifts_data["shifts"], issues)
+    
+    print(f"Processing {len(shifts)} shifts...")
+    
+    with profiler.stage("shift_pay"):
+        processed_shifts = process_shifts(shifts, user_data, config_data, cache)
     
     # Create the output data structure
     output_data = {"shifts": processed_shifts}
     
-    # Save to shiftspay.json
-    save_json_file(SHIFTSPAY_FILE, output_data)
-    print(f"Updated {SHIFTSPAY_FILE} with {len(processed_shifts)} processed shifts")
+    # Save to shiftspay.json, or just the changed rows to the store
+    with profiler.stage("save"):
+        if args.delta:
+            # Imported here so the delta writer (and sqlite3) is only loaded when used
+            from delta_output import count_ops, diff_shifts, write_patch_stream
+            if args.db:
+                previous_shifts = store.get_shift_pay()
+            elif os.path.exists(SHIFTSPAY_FILE):
+                previous_shifts = load_json_file(SHIFTSPAY_FILE)["shifts"]
+            else:
+                previous_shifts = []
+            ops = diff_shifts(previous_shifts, processed_shifts)
+            write_patch_stream(args.delta, ops)
+            print(f"Wrote {count_ops(ops)} to {args.delta}")
+        
+        if args.db:
+            changes = store.sync_shift_pay(processed_shifts)
+            store.close()
+            print(f"Updated {args.db} with {len(processed_shifts)} processed shifts "
+                  f"({changes['upserted']} upserted, {changes['deleted']} deleted)")
+        elif args.delta and not ops:
+            print(f"No shift changes, left {SHIFTSPAY_FILE} unchanged")
+        else:
+            save_json_file(SHIFTSPAY_FILE, output_data)
+            print(f"Updated {SHIFTSPAY_FILE} with {len(processed_shifts)} processed shifts")
+        
+        if args.binary_store:
+            # Imported here so the store module (and NumPy) is only loaded when used
+            from shift_store import write_shift_store
+            write_shift_store(args.binary_store, processed_shifts, list(config_data["timeCategories"]))
+            print(f"Saved {len(processed_shifts)} processed shifts to {args.binary_store}")
+    
+    stats = cache.stats()
+    print(f"Shift pay cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"(hit rate {stats['hitRate']:.1%}, {stats['size']} entries)")
+    
+    if args.cache_file:
+        cache.save(args.cache_file)
+        print(f"Saved shift pay cache to {args.cache_file}")
+    
+    profiler.write_summary()
 
 if __name__ == "__main__":
     main()
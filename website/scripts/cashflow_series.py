@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Cashflow Series
+
+This script precomputes cashflow series from the pay periods, so a chart
+doesn't have to rebuild them from the full pay period list. The pipeline
+doesn't run it and the frontend doesn't read cashflow.json yet: run it by
+hand after calculate_pay_periods.py when the series are needed.
+
+It reads payperiods.json (or the SQLite store with --db) and writes
+cashflow.json with:
+- daily: one entry per day from the first to the last pay date, with the net
+  pay received that day and the running balance, per employer and in total
+- levels: the daily series downsampled to weekly (Monday to Sunday), monthly
+  and quarterly buckets, with the sum of inflows and the min, max and closing
+  running balance in each bucket
+
+The running balance starts from an opening balance: the net pay received
+before the first day of the series, so --start doesn't reset it to zero.
+
+Series are stored as columns (one list per value) keyed by "total" and each
+employer ID, so a chart can fetch just the resolution for its zoom level.
+Amounts are summed in whole cents, so every level totals to the same figure.
+
+Usage:
+    python cashflow_series.py [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--db PATH]
+"""
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+# Paths to data files
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+PAYPERIODS_FILE = os.path.join(DATA_DIR, "payperiods.json")
+CASHFLOW_FILE = os.path.join(DATA_DIR, "cashflow.json")
+
+TOTAL_SERIES = "total"
+
+def week_start(day: date) -> date:
+    """Return the Monday of a date's week."""
+    return day - timedelta(days=day.weekday())
+
+def month_start(day: date) -> date:
+    """Return the first day of a date's month."""
+    return day.replace(day=1)
+
+def quarter_start(day: date) -> date:
+    """Return the first day of a date's calendar quarter."""
+    return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+
+# Downsampled levels, each with the function giving a day's bucket start
+LEVELS: Dict[str, Callable[[date], date]] = {
+    "weekly": week_start,
+    "monthly": month_start,
+    "quarterly": quarter_start,
+}
+
+def to_dollars(values: List[int]) -> List[float]:
+    """Convert a column of cents to dollars."""
+    return [value / 100 for value in values]
+
+def build_daily_series(payperiods_data: Dict, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None) -> Dict:
+    """
+    Build the daily inflow and running balance series in cents.
+
+    Args:
+        payperiods_data: The payperiods.json structure
+        start_date: First day of the series, or None for the first pay date
+        end_date: Last day of the series, or None for the last pay date
+
+    Returns:
+        The first day, the number of days, and opening balances, inflows and
+        balances by series key
+    """
+    # Net pay in cents by pay date for each employer
+    inflows_by_date: Dict[str, Dict[str, int]] = {}
+    for employer_data in payperiods_data["payPeriods"]:
+        employer_inflows = inflows_by_date.setdefault(employer_data["employerId"], {})
+        for period in employer_data["periods"]:
+            if period.get("payDate") and period.get("netPay"):
+                employer_inflows[period["payDate"]] = (
+                    employer_inflows.get(period["payDate"], 0) + round(period["netPay"] * 100)
+                )
+
+    pay_dates = [pay_date for employer_inflows in inflows_by_date.values() for pay_date in employer_inflows]
+    first_day = date.fromisoformat(start_date or min(pay_dates, default=date.today().isoformat()))
+    last_day = date.fromisoformat(end_date or max(pay_dates, default=first_day.isoformat()))
+    days = max((last_day - first_day).days + 1, 0)
+
+    series_keys = list(inflows_by_date) + [TOTAL_SERIES]
+    inflows = {key: [0] * days for key in series_keys}
+    opening = {key: 0 for key in series_keys}
+    for employer_id, employer_inflows in inflows_by_date.items():
+        for pay_date, amount in employer_inflows.items():
+            offset = (date.fromisoformat(pay_date) - first_day).days
+            if offset < 0:
+                opening[employer_id] += amount
+                opening[TOTAL_SERIES] += amount
+            elif offset < days:
+                inflows[employer_id][offset] += amount
+                inflows[TOTAL_SERIES][offset] += amount
+
+    balances = {}
+    for key, values in inflows.items():
+        balance = opening[key]
+        running = []
+        for value in values:
+            balance += value
+            running.append(balance)
+        balances[key] = running
+
+    return {"firstDay": first_day, "days": days, "opening": opening, "inflows": inflows, "balances": balances}
+
+def downsample(daily: Dict, bucket_start: Callable[[date], date]) -> Dict:
+    """
+    Downsample daily series into buckets in one pass.
+
+    Returns:
+        Bucket start dates, and per series key the sum of inflows and the min,
+        max and closing balance of each bucket, in dollars
+    """
+    starts: List[str] = []
+    columns = {key: {"sum": [], "min": [], "max": [], "close": []} for key in daily["inflows"]}
+
+    current_bucket = None
+    for offset in range(daily["days"]):
+        bucket = bucket_start(daily["firstDay"] + timedelta(days=offset))
+        new_bucket = bucket != current_bucket
+        if new_bucket:
+            current_bucket = bucket
+            starts.append(bucket.isoformat())
+
+        for key, column in columns.items():
+            inflow = daily["inflows"][key][offset]
+            balance = daily["balances"][key][offset]
+            if new_bucket:
+                column["sum"].append(inflow)
+                column["min"].append(balance)
+                column["max"].append(balance)
+                column["close"].append(balance)
+            else:
+                column["sum"][-1] += inflow
+                column["min"][-1] = min(column["min"][-1], balance)
+                column["max"][-1] = max(column["max"][-1], balance)
+                column["close"][-1] = balance
+
+    return {
+        "starts": starts,
+        "series": {
+            key: {name: to_dollars(values) for name, values in column.items()}
+            for key, column in columns.items()
+        }
+    }
+
+def build_cashflow_series(payperiods_data: Dict, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None) -> Dict:
+    """Build the daily cashflow series and its downsampled levels."""
+    daily = build_daily_series(payperiods_data, start_date, end_date)
+    last_day = daily["firstDay"] + timedelta(days=max(daily["days"] - 1, 0))
+
+    return {
+        "startDate": daily["firstDay"].isoformat(),
+        "endDate": last_day.isoformat(),
+        "employers": [
+            {"employerId": employer_data["employerId"], "employer": employer_data["employer"]}
+            for employer_data in payperiods_data["payPeriods"]
+        ],
+        "openingBalance": {key: value / 100 for key, value in daily["opening"].items()},
+        "daily": {
+            "inflows": {key: to_dollars(values) for key, values in daily["inflows"].items()},
+            "balance": {key: to_dollars(values) for key, values in daily["balances"].items()},
+        },
+        "levels": {name: downsample(daily, bucket_start) for name, bucket_start in LEVELS.items()},
+    }
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Precompute daily and downsampled cashflow series.")
+    parser.add_argument("--start", help="First day of the series (default: first pay date)")
+    parser.add_argument("--end", help="Last day of the series (default: last pay date)")
+    parser.add_argument("--db", help="Read pay periods from this SQLite store instead of payperiods.json")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.db:
+        # Imported here so sqlite3 is only loaded when the store is used
+        from storage import PayStore
+        with PayStore(args.db) as store:
+            payperiods_data = store.get_payperiods_data()
+    else:
+        with open(PAYPERIODS_FILE, 'r') as f:
+            payperiods_data = json.load(f)
+
+    cashflow_data = build_cashflow_series(payperiods_data, args.start, args.end)
+
+    with open(CASHFLOW_FILE, 'w') as f:
+        json.dump(cashflow_data, f, separators=(",", ":"))
+
+    print(f"Saved {len(cashflow_data['daily']['inflows'][TOTAL_SERIES])} days of cashflow "
+          f"from {cashflow_data['startDate']} to {cashflow_data['endDate']} to {CASHFLOW_FILE}")
+
+if __name__ == "__main__":
+    main()
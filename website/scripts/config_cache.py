@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Config Cache
+
+This utility memoizes values derived from a config section, such as the
+award version index, compiled time bands, config fingerprints and public
+holiday dates, so each is worked out once per config instead of once per
+shift.
+
+Entries are keyed by the identity of the section (plus any extra key parts)
+and hold a reference to it, so a freed section's id() being reused can never
+match a stale entry. Config dicts can't be weakly referenced, and hashing a
+config on every lookup would cost more than most of the values being cached,
+so each cache is instead a bounded LRU: once more sections than its size have
+been seen, the least recently used entries and their config references are
+dropped.
+
+Lookups and updates are locked, so caches can be shared between threads. A
+missing value may be built by two threads at once; both get an equal value
+and the later one is kept.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+DEFAULT_CONFIG_CACHE_SIZE = 32
+
+T = TypeVar("T")
+
+class ConfigCache:
+    """Bounded, thread-safe LRU of values derived from config sections."""
+
+    def __init__(self, maxsize: int = DEFAULT_CONFIG_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Dict, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, source: Dict, build: Callable[[], T], *key: Hashable) -> T:
+        """
+        Return the cached value for a config section, building it on a miss.
+
+        Args:
+            source: The config section the value is derived from
+            build: Called with no arguments to build the value on a miss
+            key: Extra key parts, for values that also depend on other arguments
+        """
+        cache_key = (id(source),) + key
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] is source:
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+
+        value = build()
+        with self._lock:
+            self._entries[cache_key] = (source, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Delta Output
+
+This utility compares newly computed results with the previous ones and
+writes only the changes, so the front end or a sync job can apply a small
+patch instead of reloading whole data files.
+
+Records are matched by stable keys:
+- shift: (employerId, date, start, end)
+- period: (employerId, startDate)
+- employer: (id,)
+
+Changes are written as an NDJSON patch stream, one compact JSON object per
+line:
+
+    {"op":"upsert","type":"shift","key":["A","2025-01-07","09:00","17:15"],"value":{...}}
+    {"op":"upsert","type":"period","key":["A","2025-01-06"],"employer":"Company A","value":{...}}
+    {"op":"delete","type":"period","key":["A","2024-12-30"]}
+
+Upserts come first, in the order of the new data, followed by deletes. A run
+with no changes writes an empty file.
+
+Usage:
+    python delta_output.py apply PATCH [--data-dir DIR]
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage import encode, shift_key
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+
+def period_key(employer_id: str, period: Dict) -> Tuple[str, str]:
+    """Return the stable (employerId, startDate) key of a pay period."""
+    return (employer_id, period["startDate"])
+
+def diff_records(record_type: str, previous: Dict[Tuple, Dict], current: Dict[Tuple, Dict],
+                 extra: Optional[Dict[Tuple, Dict]] = None) -> List[Dict]:
+    """
+    Compare keyed records and return upsert and delete operations.
+
+    Args:
+        record_type: Type name written into each operation
+        previous: Previous records by key
+        current: New records by key, in output order
+        extra: Additional fields to write into the upsert for a key, if any
+
+    Returns:
+        Upserts for new or changed records, then deletes for removed records
+    """
+    ops = []
+    for key, record in current.items():
+        old_record = previous.get(key)
+        if old_record is not None and encode(old_record) == encode(record):
+            continue
+        op = {"op": "upsert", "type": record_type, "key": list(key)}
+        if extra and key in extra:
+            op.update(extra[key])
+        op["value"] = record
+        ops.append(op)
+
+    for key in previous:
+        if key not in current:
+            ops.append({"op": "delete", "type": record_type, "key": list(key)})
+
+    return ops
+
+def diff_shifts(previous_shifts: List[Dict], current_shifts: List[Dict]) -> List[Dict]:
+    """Return the operations that turn previous_shifts into current_shifts."""
+    return diff_records(
+        "shift",
+        {shift_key(shift): shift for shift in previous_shifts},
+        {shift_key(shift): shift for shift in current_shifts}
+    )
+
+def diff_pay_periods(previous_data: Dict, current_data: Dict) -> List[Dict]:
+    """Return the operations that turn one payperiods.json structure into another."""
+    def index(payperiods_data: Dict) -> Dict[Tuple, Dict]:
+        return {
+            period_key(employer_data["employerId"], period): period
+            for employer_data in payperiods_data.get("payPeriods", [])
+            for period in employer_data["periods"]
+        }
+
+    # Upserts carry the employer name so a consumer can add a new employer entry
+    employer_names = {
+        period_key(employer_data["employerId"], period): {"employer": employer_data["employer"]}
+        for employer_data in current_data.get("payPeriods", [])
+        for period in employer_data["periods"]
+    }
+
+    return diff_records("period", index(previous_data), index(current_data), employer_names)
+
+def diff_employers(previous_user: Dict, current_user: Dict) -> List[Dict]:
+    """Return the operations that turn one user's employer list into another."""
+    return diff_records(
+        "employer",
+        {(employer["id"],): employer for employer in previous_user.get("employers", [])},
+        {(employer["id"],): employer for employer in current_user.get("employers", [])}
+    )
+
+def count_ops(ops: List[Dict]) -> str:
+    """Describe a patch as e.g. '3 upserts, 1 delete'."""
+    upserts = sum(1 for op in ops if op["op"] == "upsert")
+    deletes = len(ops) - upserts
+    return (f"{upserts} upsert{'s' if upserts != 1 else ''}, "
+            f"{deletes} delete{'s' if deletes != 1 else ''}")
+
+def write_patch_stream(file_path: str, ops: Iterable[Dict]) -> None:
+    """Write operations to an NDJSON file, replacing any previous patch."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial patch
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'w') as f:
+        for op in ops:
+            f.write(json.dumps(op, separators=(",", ":")))
+            f.write("\n")
+    os.replace(temp_path, file_path)
+
+def read_patch_stream(file_path: str) -> Iterator[Dict]:
+    """Yield the operations in an NDJSON patch file."""
+    with open(file_path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def apply_patch(ops: Iterable[Dict], shiftspay_data: Optional[Dict] = None,
+                payperiods_data: Optional[Dict] = None, user_data: Optional[Dict] = None) -> None:
+    """
+    Apply operations in place to shiftspay.json, payperiods.json and user.json structures.
+
+    Operations for a structure that isn't given are ignored. New shifts and
+    employers are appended; new periods are inserted in start date order.
+    """
+    for op in ops:
+        key = tuple(op["key"])
+        upsert = op["op"] == "upsert"
+
+        if op["type"] == "shift" and shiftspay_data is not None:
+            apply_to_list(shiftspay_data["shifts"], shift_key, key, op.get("value") if upsert else None)
+
+        elif op["type"] == "employer" and user_data is not None:
+            apply_to_list(user_data.setdefault("employers", []), lambda employer: (employer["id"],),
+                          key, op.get("value") if upsert else None)
+
+        elif op["type"] == "period" and payperiods_data is not None:
+            employer_id, start_date = key
+            employer_data = next((item for item in payperiods_data["payPeriods"]
+                                  if item["employerId"] == employer_id), None)
+            if employer_data is None:
+                if not upsert:
+                    continue
+                employer_data = {"employerId": employer_id, "employer": op.get("employer", employer_id),
+                                 "periods": []}
+                payperiods_data["payPeriods"].append(employer_data)
+
+            periods = employer_data["periods"]
+            if upsert and not any(period["startDate"] == start_date for period in periods):
+                position = next((index for index, period in enumerate(periods)
+                                 if period["startDate"] > start_date), len(periods))
+                periods.insert(position, op["value"])
+            else:
+                apply_to_list(periods, lambda period: (employer_id, period["startDate"]),
+                              key, op.get("value") if upsert else None)
+
+def apply_to_list(records: List[Dict], key_fn, key: Tuple, value: Optional[Dict]) -> None:
+    """Replace, append or (when value is None) remove the record with the given key."""
+    for index, record in enumerate(records):
+        if key_fn(record) == key:
+            if value is None:
+                del records[index]
+            else:
+                records[index] = value
+            return
+
+    if value is not None:
+        records.append(value)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Apply NDJSON patch streams to the JSON data files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    apply_parser = subparsers.add_parser("apply", help="Apply a patch to the data files")
+    apply_parser.add_argument("patch", help="NDJSON patch file")
+    apply_parser.add_argument("--data-dir", default=DATA_DIR, help=f"Data directory (default {DATA_DIR})")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    ops = list(read_patch_stream(args.patch))
+    types = {op["type"] for op in ops}
+
+    # Only load and rewrite the files the patch touches
+    files = {
+        "shift": ("shiftspay.json", 4),
+        "period": ("payperiods.json", 2),
+        "employer": ("user.json", 2),
+    }
+    data = {}
+    for record_type in types:
+        file_name, _ = files[record_type]
+        with open(os.path.join(args.data_dir, file_name), 'r') as f:
+            data[record_type] = json.load(f)
+
+    apply_patch(ops, data.get("shift"), data.get("period"), data.get("employer"))
+
+    for record_type, record_data in data.items():
+        file_name, indent = files[record_type]
+        with open(os.path.join(args.data_dir, file_name), 'w') as f:
+            json.dump(record_data, f, indent=indent)
+        print(f"Updated {file_name}")
+
+    print(f"Applied {count_ops(ops)} from {args.patch}")
+
+if __name__ == "__main__":
+    main()
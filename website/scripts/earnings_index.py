@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Earnings Index
+
+This utility answers date-range earnings questions ("net pay from employer A
+between two dates", "hours this financial year") without scanning every shift
+or pay period.
+
+For each employer, shifts are sorted by date and prefix sums are kept of
+hours, gross pay, allowances, total gross pay and hours per pay category. Pay
+periods are sorted by pay date with prefix sums of total gross pay, tax and
+net pay. A range query is then two binary searches and a subtraction.
+
+Money is summed in whole cents and hours in hundredths of an hour, so range
+totals are exact and match the rounded figures in shiftspay.json and
+payperiods.json.
+
+Usage:
+    python earnings_index.py --start 2025-01-01 --end 2025-03-31 [--employer A]
+    python earnings_index.py --financial-year 2024
+"""
+
+import argparse
+import json
+import os
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from shift_units import to_hundredths
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+SHIFTSPAY_FILE = os.path.join(DATA_DIR, "shiftspay.json")
+PAYPERIODS_FILE = os.path.join(DATA_DIR, "payperiods.json")
+
+# Shift fields summed by the index, all held in hundredths
+SHIFT_FIELDS = ("hoursWorked", "grossPay", "allowanceTotal", "totalGrossPay")
+
+# Pay period fields summed by the index, all held in hundredths
+PERIOD_FIELDS = ("totalHours", "totalGrossPay", "tax", "netPay")
+
+def prefix_sums(values: List[int]) -> List[int]:
+    """Return prefix sums with a leading zero, so sum(values[i:j]) = p[j] - p[i]."""
+    return list(accumulate(values, initial=0))
+
+def financial_year_range(year: int) -> Tuple[str, str]:
+    """Return the first and last dates of the financial year starting 1 July of year."""
+    return f"{year}-07-01", f"{year + 1}-06-30"
+
+class EarningsIndex:
+    """Prefix-sum index over shift pay and pay periods for range queries."""
+
+    def __init__(self, shifts: List[Dict], payperiods_data: Optional[Dict] = None):
+        self.categories: List[str] = []
+        self._shift_dates: Dict[str, List[str]] = {}
+        self._shift_sums: Dict[str, Dict[str, List[int]]] = {}
+        self._period_dates: Dict[str, List[str]] = {}
+        self._period_sums: Dict[str, Dict[str, List[int]]] = {}
+
+        self._index_shifts(shifts)
+        if payperiods_data is not None:
+            self._index_periods(payperiods_data)
+
+    @classmethod
+    def from_files(cls, shiftspay_file: str = SHIFTSPAY_FILE,
+                   payperiods_file: Optional[str] = PAYPERIODS_FILE) -> "EarningsIndex":
+        """Build an index from shiftspay.json and (optionally) payperiods.json."""
+        with open(shiftspay_file, 'r') as f:
+            shifts = json.load(f)["shifts"]
+
+        payperiods_data = None
+        if payperiods_file:
+            with open(payperiods_file, 'r') as f:
+                payperiods_data = json.load(f)
+
+        return cls(shifts, payperiods_data)
+
+    def _index_shifts(self, shifts: List[Dict]) -> None:
+        """Sort each employer's shifts by date and build the prefix sums."""
+        shifts_by_employer: Dict[str, List[Dict]] = {}
+        for shift in shifts:
+            shifts_by_employer.setdefault(shift["employerId"], []).append(shift)
+            for category in shift.get("payCategories", []):
+                if category["category"] not in self.categories:
+                    self.categories.append(category["category"])
+
+        for employer_id, employer_shifts in shifts_by_employer.items():
+            employer_shifts.sort(key=lambda shift: shift["date"])
+            self._shift_dates[employer_id] = [shift["date"] for shift in employer_shifts]
+
+            sums = {
+                field: prefix_sums([to_hundredths(shift.get(field, 0)) for shift in employer_shifts])
+                for field in SHIFT_FIELDS
+            }
+            for category in self.categories:
+                sums[f"category:{category}"] = prefix_sums([
+                    sum(to_hundredths(item["hours"]) for item in shift.get("payCategories", [])
+                        if item["category"] == category)
+                    for shift in employer_shifts
+                ])
+            self._shift_sums[employer_id] = sums
+
+    def _index_periods(self, payperiods_data: Dict) -> None:
+        """Sort each employer's pay periods by pay date and build the prefix sums."""
+        for employer_data in payperiods_data["payPeriods"]:
+            periods = sorted(employer_data["periods"], key=lambda period: period["payDate"])
+            employer_id = employer_data["employerId"]
+            self._period_dates[employer_id] = [period["payDate"] for period in periods]
+            self._period_sums[employer_id] = {
+                field: prefix_sums([to_hundredths(period.get(field, 0)) for period in periods])
+                for field in PERIOD_FIELDS
+            }
+
+    @staticmethod
+    def _range(dates: List[str], start_date: Optional[str], end_date: Optional[str]) -> Tuple[int, int]:
+        """Return the slice of a sorted date list within an inclusive date range."""
+        low = bisect_left(dates, start_date) if start_date is not None else 0
+        high = bisect_right(dates, end_date) if end_date is not None else len(dates)
+        return low, max(low, high)
+
+    def _employers(self, employer_id: Optional[str], dates: Dict[str, List[str]]) -> List[str]:
+        if employer_id is None:
+            return list(dates)
+        return [employer_id] if employer_id in dates else []
+
+    def shift_totals(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     employer_id: Optional[str] = None) -> Dict:
+        """
+        Total the shifts worked within an inclusive date range.
+
+        Args:
+            start_date: First date (YYYY-MM-DD), or None for no lower bound
+            end_date: Last date (YYYY-MM-DD), or None for no upper bound
+            employer_id: Only count this employer's shifts, or None for all employers
+
+        Returns:
+            The shift count, hoursWorked, grossPay, allowanceTotal,
+            totalGrossPay and hours per pay category
+        """
+        count = 0
+        totals = {field: 0 for field in SHIFT_FIELDS}
+        category_totals = {category: 0 for category in self.categories}
+
+        for employer in self._employers(employer_id, self._shift_dates):
+            low, high = self._range(self._shift_dates[employer], start_date, end_date)
+            count += high - low
+            sums = self._shift_sums[employer]
+            for field in SHIFT_FIELDS:
+                totals[field] += sums[field][high] - sums[field][low]
+            for category in self.categories:
+                category_sums = sums[f"category:{category}"]
+                category_totals[category] += category_sums[high] - category_sums[low]
+
+        result: Dict = {"shifts": count}
+        result.update({field: value / 100 for field, value in totals.items()})
+        result["categories"] = {category: hours / 100 for category, hours in category_totals.items()}
+        return result
+
+    def period_totals(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      employer_id: Optional[str] = None) -> Dict:
+        """
+        Total the pay periods paid within an inclusive date range.
+
+        Returns:
+            The period count, totalHours, totalGrossPay, tax and netPay
+        """
+        count = 0
+        totals = {field: 0 for field in PERIOD_FIELDS}
+
+        for employer in self._employers(employer_id, self._period_dates):
+            low, high = self._range(self._period_dates[employer], start_date, end_date)
+            count += high - low
+            sums = self._period_sums[employer]
+            for field in PERIOD_FIELDS:
+                totals[field] += sums[field][high] - sums[field][low]
+
+        result: Dict = {"periods": count}
+        result.update({field: value / 100 for field, value in totals.items()})
+        return result
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Query earnings totals for a date range.")
+    parser.add_argument("--start", help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--financial-year", type=int, metavar="YEAR",
+                        help="Use the financial year starting 1 July YEAR")
+    parser.add_argument("--employer", help="Only include this employer ID")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    start_date, end_date = args.start, args.end
+    if args.financial_year is not None:
+        start_date, end_date = financial_year_range(args.financial_year)
+
+    index = EarningsIndex.from_files()
+    print("Shifts worked:", json.dumps(index.shift_totals(start_date, end_date, args.employer), indent=2))
+    print("Pay periods paid:", json.dumps(index.period_totals(start_date, end_date, args.employer), indent=2))
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Null Profiler
+
+This utility stands in for profiling.StageProfiler when --profile isn't
+given. It has the same stage() and write_summary() methods and does nothing,
+so the scripts can always wrap their stages without importing cProfile,
+pstats and tracemalloc on every run.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+class NullProfiler:
+    """Profiler that doesn't profile anything."""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Run the with block unprofiled."""
+        yield
+
+    def write_summary(self) -> None:
+        """Write nothing."""
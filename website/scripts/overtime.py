@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Overtime Engine
+
+This utility reclassifies shift hours as overtime from the hours worked
+across shifts, which calculate_shift_pay can't see when it prices a shift on
+its own. It is enabled by an "overtime" section in config.json (or in an
+award version):
+
+    "overtime": {
+        "dailyHours": 9,
+        "weeklyHours": 38,
+        "minRestHours": 10,
+        "tiers": [
+            {"hours": 3, "category": "overtime_first_3", "multiplier": 1.75},
+            {"hours": null, "category": "overtime_after_3", "multiplier": 2.25}
+        ]
+    }
+
+- dailyHours: ordinary hours in a day; later hours that day are overtime
+- weeklyHours: ordinary hours in a week (Monday to Sunday); later hours that
+  week are overtime
+- minRestHours: the first shift of a work day is overtime in full when it
+  starts less than this many hours after the last shift of the previous work
+  day for the same employer ended. Later shifts the same day, such as the
+  second half of a split shift, aren't checked
+- tiers: the overtime worked in a day is paid in tiers, each lasting "hours"
+  (null for the last tier). A tier is paid at casual[level]["rates"][category]
+  when the level lists that category, otherwise at "multiplier" times the
+  level's hourly_rate. "description" can be given for categories not in
+  timeCategories.
+
+Any threshold can be left out to turn it off. Without an "overtime" section
+shifts are returned unchanged.
+
+Shifts count towards the day and week they start in. Each employer's shifts
+are sorted by start and walked once, rolling the daily and weekly ordinary
+hour totals over when the walk crosses into a new day or week, so the pass is
+linear in the number of shifts after the sort however long the history is.
+
+Overtime comes off a shift's pay categories in proportion to their hours,
+the same way unpaid breaks are deducted, and is added back as the tier
+categories. Hours are counted in hundredths of an hour so the running totals
+don't drift.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from award_versions import get_award_config
+from shift_units import MINUTES_PER_DAY, get_shift_interval, to_hundredths
+
+def is_overtime_configured(config_data: Dict) -> bool:
+    """Return whether the config or any of its award versions has overtime rules."""
+    return "overtime" in config_data or any(
+        "overtime" in version for version in config_data.get("awardVersions", [])
+    )
+
+def get_overtime_rates(config_data: Dict, level: str) -> Dict[str, float]:
+    """Return the rate of each overtime tier category for an employee level."""
+    level_config = config_data["casual"][level]
+    rates = {}
+    for tier in (config_data.get("overtime") or {}).get("tiers", []):
+        category = tier["category"]
+        if category in level_config["rates"]:
+            rates[category] = level_config["rates"][category]
+        else:
+            rates[category] = round(level_config["hourly_rate"] * tier["multiplier"], 2)
+    return rates
+
+def get_overtime_description(config_data: Dict, category: str) -> str:
+    """Return the description of an overtime category."""
+    if category in config_data["timeCategories"]:
+        return config_data["timeCategories"][category]
+    tier = next((tier for tier in config_data["overtime"]["tiers"] if tier["category"] == category), {})
+    return tier.get("description", category)
+
+def split_into_tiers(tiers: List[Dict], worked: int, overtime: int) -> List[Tuple[str, int]]:
+    """
+    Split overtime into tiers.
+
+    Args:
+        tiers: The configured overtime tiers
+        worked: Overtime already worked that day, in hundredths of an hour
+        overtime: Overtime to split, in hundredths of an hour
+
+    Returns:
+        (category, hundredths) for each tier the overtime falls in
+    """
+    if not tiers:
+        raise ValueError("Overtime rules need at least one tier")
+
+    parts = []
+    tier_end = 0
+    for position, tier in enumerate(tiers):
+        is_last = tier.get("hours") is None or position == len(tiers) - 1
+        tier_end = None if tier.get("hours") is None else tier_end + to_hundredths(tier["hours"])
+        # Overtime past the end of the last tier stays in the last tier
+        take = overtime if is_last else min(overtime, max(tier_end - worked, 0))
+        if take > 0:
+            parts.append((tier["category"], take))
+            worked += take
+            overtime -= take
+        if is_last or overtime == 0:
+            break
+
+    return parts
+
+def deduct_proportionally(hours: List[int], amount: int) -> List[int]:
+    """
+    Take an amount off a list of hours in proportion to each entry.
+
+    Works in whole hundredths, giving the leftover hundredths to the entries
+    with the largest remainders so the result adds up exactly.
+    """
+    total = sum(hours)
+    keep = total - amount
+    if total <= 0 or keep <= 0:
+        return [0] * len(hours)
+
+    kept = [value * keep // total for value in hours]
+    by_remainder = sorted(range(len(hours)), key=lambda i: hours[i] * keep % total, reverse=True)
+    for i in by_remainder[:keep - sum(kept)]:
+        kept[i] += 1
+    return kept
+
+def reclassify_shift(shift: Dict, parts: List[Tuple[str, int]], config_data: Dict, level: str) -> Dict:
+    """
+    Return a copy of a processed shift with some of its hours moved to overtime categories.
+
+    The shift keeps its gross pay for the hours that don't move, so only the
+    moved hours are repriced. Recomputing the whole shift from its rounded
+    category hours could shift its pay by a cent.
+    """
+    overtime = sum(amount for _, amount in parts)
+    category_hours = [to_hundredths(category["hours"]) for category in shift["payCategories"]]
+    kept_hours = deduct_proportionally(category_hours, overtime)
+
+    pay_categories = []
+    total_pay = shift["grossPay"]
+    for category, hours, kept in zip(shift["payCategories"], category_hours, kept_hours):
+        total_pay -= (hours - kept) / 100 * category["rate"]
+        if kept == hours:
+            pay_categories.append(dict(category))
+        elif kept > 0:
+            pay_categories.append({**category, "hours": kept / 100})
+
+    rates = get_overtime_rates(config_data, level)
+    for category, amount in parts:
+        total_pay += amount / 100 * rates[category]
+        pay_categories.append({
+            "category": category,
+            "hours": amount / 100,
+            "rate": rates[category],
+            "description": get_overtime_description(config_data, category)
+        })
+
+    # Overtime only moves hours, so the hours worked don't change
+    hours_worked = shift["hoursWorked"]
+
+    result = dict(shift)
+    result.update({
+        "hoursWorked": hours_worked,
+        "overtimeHours": overtime / 100,
+        "payCategories": pay_categories,
+        "payRate": round(total_pay / hours_worked, 2) if hours_worked > 0 else 0,
+        "grossPay": round(total_pay, 2),
+        "totalGrossPay": round(total_pay + shift.get("allowanceTotal", 0), 2),
+    })
+    return result
+
+def get_ordinary_limit(rules: Dict, day_ordinary: int, week_ordinary: int) -> Optional[int]:
+    """Return the ordinary hours left before the daily or weekly threshold, or None if unlimited."""
+    limits = []
+    if rules.get("dailyHours") is not None:
+        limits.append(to_hundredths(rules["dailyHours"]) - day_ordinary)
+    if rules.get("weeklyHours") is not None:
+        limits.append(to_hundredths(rules["weeklyHours"]) - week_ordinary)
+    return max(min(limits), 0) if limits else None
+
+def apply_overtime(shifts: List[Dict], user_data: Dict, config_data: Dict) -> List[Dict]:
+    """
+    Reclassify overtime in processed shifts.
+
+    Args:
+        shifts: Processed shifts from calculate_shift_pay
+        user_data: The user.json structure
+        config_data: The full config, with "overtime" rules at the top level
+            or in award versions
+
+    Returns:
+        The shifts in their original order, with copies replacing the shifts
+        that have overtime
+    """
+    if not is_overtime_configured(config_data):
+        return shifts
+
+    levels = {employer["id"]: employer["level"] for employer in user_data["employers"]}
+
+    # Place each employer's shifts on a timeline in absolute minutes
+    timelines: Dict[str, List[Tuple[int, int, int]]] = {}
+    for index, shift in enumerate(shifts):
+        start, end = get_shift_interval(shift)
+        timelines.setdefault(shift["employerId"], []).append((start, end, index))
+
+    result = list(shifts)
+    for employer_id, intervals in timelines.items():
+        intervals.sort()
+
+        current_day = current_week = None
+        day_ordinary = day_overtime = week_ordinary = 0
+        last_end = previous_day_end = None
+        for start, end, index in intervals:
+            shift = shifts[index]
+
+            # Roll the windows over when the shift starts on a new day or week
+            day = start // MINUTES_PER_DAY
+            new_day = day != current_day
+            if new_day:
+                current_day = day
+                day_ordinary = day_overtime = 0
+                previous_day_end = last_end
+            # Day ordinals count from Monday 1 January of year 1
+            week = (day - 1) // 7
+            if week != current_week:
+                current_week = week
+                week_ordinary = 0
+
+            hours = sum(to_hundredths(category["hours"]) for category in shift["payCategories"])
+            award_config = get_award_config(config_data, shift["date"])
+            rules = award_config.get("overtime")
+
+            overtime = 0
+            if rules:
+                min_rest = rules.get("minRestHours")
+                if (min_rest is not None and new_day and previous_day_end is not None
+                        and start - previous_day_end < min_rest * 60):
+                    overtime = hours
+                else:
+                    limit = get_ordinary_limit(rules, day_ordinary, week_ordinary)
+                    if limit is not None:
+                        overtime = max(hours - limit, 0)
+
+            day_ordinary += hours - overtime
+            week_ordinary += hours - overtime
+            if overtime > 0:
+                parts = split_into_tiers(rules["tiers"], day_overtime, overtime)
+                day_overtime += overtime
+                result[index] = reclassify_shift(shift, parts, award_config, levels[employer_id])
+
+            last_end = end if last_end is None else max(last_end, end)
+
+    return result
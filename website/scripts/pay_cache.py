@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shift Pay Cache
+
+This utility memoizes computed shift pay components. Rosters repeat the same
+weekday, start, end and employer week after week, so the categories, breaks
+and allowances for a shift signature only need to be worked out once. The
+date-specific fields of a shift are stamped onto a copy of the cached
+components by the caller.
+
+The cache is a bounded LRU with hit-rate statistics, and can be saved to and
+loaded from a local JSON file so it survives between runs. Keys include a
+fingerprint of the award version, so a changed config never reuses stale
+entries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config_cache import ConfigCache
+
+# Bump when the shape of cached components changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Config sections that affect the pay components of a shift
+FINGERPRINT_SECTIONS = ("award", "breaks", "casual", "timeCategories", "timeBands", "allowances")
+
+# Fingerprints, by the config they were computed from
+_FINGERPRINT_CACHE = ConfigCache()
+
+def compute_config_fingerprint(config_data: Dict) -> str:
+    """Hash the config sections used to price a shift."""
+    sections = {section: config_data.get(section) for section in FINGERPRINT_SECTIONS}
+    encoded = json.dumps(sections, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+def get_config_fingerprint(config_data: Dict) -> str:
+    """Return a short hash of the config sections used to price a shift."""
+    return _FINGERPRINT_CACHE.get_or_build(config_data, lambda: compute_config_fingerprint(config_data))
+
+def copy_pay_components(components: Dict) -> Dict:
+    """Copy pay components so callers never share nested lists or dicts."""
+    copied = dict(components)
+    copied["payCategories"] = [dict(category) for category in components["payCategories"]]
+    copied["allowances"] = [dict(allowance) for allowance in components["allowances"]]
+    return copied
+
+class ShiftPayCache:
+    """Bounded LRU cache of shift pay components keyed by shift signature."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(signature: List[Any]) -> str:
+        """Encode a signature as a stable string key."""
+        return json.dumps(signature, separators=(",", ":"))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached components, or None on a miss."""
+        with self._lock:
+            components = self._entries.get(key)
+            if components is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_pay_components(components)
+
+    def put(self, key: str, components: Dict) -> None:
+        """Store a copy of the components, evicting the least recently used entry."""
+        components = copy_pay_components(components)
+        with self._lock:
+            self._entries[key] = components
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and size statistics."""
+        # Read the counters together so they describe the same moment
+        with self._lock:
+            hits, misses, evictions, size = self.hits, self.misses, self.evictions, len(self._entries)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": evictions,
+            "size": size,
+            "maxsize": self.maxsize
+        }
+
+    def save(self, file_path: str) -> None:
+        """Save the cache entries to a JSON file, least recently used first."""
+        with self._lock:
+            data = {
+                "version": CACHE_FORMAT_VERSION,
+                "entries": list(self._entries.items())
+            }
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file first so a failed run can't corrupt the cache
+        temp_path = file_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str, maxsize: int = DEFAULT_CACHE_SIZE) -> "ShiftPayCache":
+        """
+        Load a cache from a JSON file.
+
+        A missing file, unreadable file or file from another cache format
+        version gives an empty cache.
+        """
+        cache = cls(maxsize)
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cache
+
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return cache
+
+        # Keep the most recently used entries if the file holds more than fits
+        for key, components in data.get("entries", [])[-maxsize:]:
+            cache._entries[key] = components
+
+        return cache
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Pay Engine
+
+This utility runs the pay pipeline in memory, for services that embed it
+instead of running calculate_shift_pay.py and calculate_pay_periods.py:
+
+    engine = PayEngine(config_data, user_data)
+    result = engine.run(shifts, today=date(2025, 4, 28))
+    result["shifts"], result["payPeriods"], result["nextPayDates"], result["issues"]
+
+An engine is built once from the config and user data and copies them, so
+later changes by the caller don't leak into running calculations. Its
+methods take shift batches as lists of dicts in the shifts.json shape and
+return new data in the shiftspay.json and payperiods.json shapes. They never
+read or write files, never print, and never change the engine's data or the
+shifts passed in, so one engine can serve many threads at once. The state
+shared between calls is locked internally: the engine's shift pay cache (see
+pay_cache.py), the module-level caches of award versions, time bands,
+config fingerprints and holiday dates (see config_cache.py) and the
+generated public holidays (see public_holidays.py).
+
+Shifts are validated the same way as in calculate_shift_pay.py (see
+roster_validation.py): duplicates, unparseable records and shifts for
+unknown employers are returned as issues and not paid. Shifts whose pay
+can't be calculated, for example because the employer's level is missing
+from the award, are returned as "pricing_error" issues.
+"""
+
+import copy
+import json
+from datetime import date
+from typing import Dict, List, Optional
+
+from calculate_pay_periods import CONFIG_FILE, USER_FILE, build_pay_periods, get_next_pay_dates
+from calculate_shift_pay import process_shifts
+from pay_cache import DEFAULT_CACHE_SIZE, ShiftPayCache
+from roster_validation import find_roster_issues, get_paid_indices
+
+class PayEngine:
+    """Thread-safe in-memory shift pay, pay period and next pay date calculator."""
+
+    def __init__(self, config_data: Dict, user_data: Dict, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.config_data = copy.deepcopy(config_data)
+        self.user_data = copy.deepcopy(user_data)
+        self.employer_ids = {employer["id"] for employer in self.user_data["employers"]}
+        self.cache = ShiftPayCache(cache_size)
+
+    @classmethod
+    def from_files(cls, config_file: str = CONFIG_FILE, user_file: str = USER_FILE,
+                   cache_size: int = DEFAULT_CACHE_SIZE) -> "PayEngine":
+        """Build an engine from config.json and user.json."""
+        with open(config_file, 'r') as f:
+            config_data = json.load(f)
+        with open(user_file, 'r') as f:
+            user_data = json.load(f)
+
+        return cls(config_data, user_data, cache_size)
+
+    def validate_shifts(self, shifts: List[Dict]) -> List[Dict]:
+        """Return the roster validation issues of a batch of shifts."""
+        return find_roster_issues(shifts, self.employer_ids)
+
+    def calculate_shifts(self, shifts: List[Dict]) -> Dict:
+        """
+        Calculate pay for a batch of shifts.
+
+        Returns:
+            {"shifts": processed shifts as in shiftspay.json, "issues": roster
+            validation and pricing issues, ordered by shift index}
+        """
+        issues = self.validate_shifts(shifts)
+        paid_indices = get_paid_indices(shifts, issues)
+        errors: List[Dict] = []
+        processed_shifts = process_shifts([shifts[index] for index in paid_indices], self.user_data,
+                                          self.config_data, self.cache, verbose=False, errors=errors)
+
+        # Point pricing errors back at the batch that was passed in
+        for error in errors:
+            error["index"] = paid_indices[error["index"]]
+        issues.extend(errors)
+        issues.sort(key=lambda issue: issue["index"])
+        return {"shifts": processed_shifts, "issues": issues}
+
+    def calculate_pay_periods(self, processed_shifts: List[Dict], today: Optional[date] = None) -> Dict:
+        """
+        Build pay periods with totals and tax from processed shifts.
+
+        Args:
+            processed_shifts: Shifts returned by calculate_shifts
+            today: The current date for employers without shifts, or None for today
+
+        Returns:
+            The pay periods data, as stored in payperiods.json
+        """
+        return build_pay_periods({"shifts": processed_shifts}, self.user_data, self.config_data,
+                                 verbose=False, today=today)
+
+    def get_next_pay_dates(self, payperiods_data: Dict, today: Optional[date] = None) -> Dict[str, str]:
+        """Return the next pay date (YYYY-MM-DD) by employer ID, counting from today."""
+        return get_next_pay_dates(payperiods_data, self.user_data, today)
+
+    def run(self, shifts: List[Dict], today: Optional[date] = None) -> Dict:
+        """
+        Run the whole pipeline on a batch of shifts.
+
+        Returns:
+            The processed shifts, pay periods ("payPeriods" as in
+            payperiods.json), next pay dates by employer ID and roster
+            validation issues
+        """
+        calculated = self.calculate_shifts(shifts)
+        payperiods_data = self.calculate_pay_periods(calculated["shifts"], today)
+
+        return {
+            "shifts": calculated["shifts"],
+            "payPeriods": payperiods_data["payPeriods"],
+            "nextPayDates": self.get_next_pay_dates(payperiods_data, today),
+            "issues": calculated["issues"]
+        }
+
+    def cache_stats(self) -> Dict:
+        """Return the shift pay cache statistics."""
+        return self.cache.stats()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler
+
+This utility profiles the stages of a pipeline run (loading, per-shift pay,
+period aggregation, tax, saving). Each stage is wrapped in cProfile and
+tracemalloc, and writes:
+
+- <prefix>-NN-<stage>.pstats: cProfile data for pstats, snakeviz and similar tools
+- <prefix>-NN-<stage>.folded: collapsed stacks for flamegraph.pl or speedscope
+- <prefix>-NN-<stage>-alloc.txt: the top allocation sites during the stage
+
+plus <prefix>-summary.txt with the time, memory and hottest functions of
+every stage.
+
+cProfile records caller/callee pairs rather than full stacks, so the
+collapsed stacks are rebuilt from the call graph. Time is split between
+callers in proportion to the time each one spent calling the function.
+
+Usage:
+    profiler = StageProfiler(output_dir, "calculate_shift_pay")
+    with profiler.stage("load"):
+        ...
+    profiler.write_summary()
+
+The pipeline scripts only import this module when --profile is given, and
+wrap their stages in a null_profiler.NullProfiler otherwise.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 10
+
+# Collapsed stacks stop at this depth or when a path holds less than this
+# fraction of the stage's time
+MAX_STACK_DEPTH = 64
+MIN_STACK_FRACTION = 0.0005
+
+# (file, line, function name) as used by pstats
+FunctionKey = Tuple[str, int, str]
+
+def format_frame(function: FunctionKey) -> str:
+    """Format a pstats function key as a flame graph frame name."""
+    file_name, line, name = function
+    if file_name == "~":
+        return name
+    return f"{os.path.basename(file_name)}:{name}:{line}"
+
+def collapse_stacks(stats: pstats.Stats) -> List[Tuple[str, int]]:
+    """
+    Rebuild collapsed stacks from cProfile call graph data.
+
+    Returns:
+        (semicolon separated stack, self time in microseconds) pairs
+    """
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+
+    # Build callee lists from the caller data cProfile keeps
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((function, caller_stats[3]))
+
+    roots = [function for function, data in raw_stats.items()
+             if not any(caller in raw_stats for caller in data[4])]
+    total_time = sum(raw_stats[root][3] for root in roots) or 1.0
+
+    weights: Dict[str, float] = {}
+    # Each entry: (function, stack so far, frames on the stack, fraction of the function's time)
+    pending = [(root, format_frame(root), {root}, 1.0) for root in roots]
+    while pending:
+        function, stack, on_stack, fraction = pending.pop()
+        _, _, self_time, cumulative_time, _ = raw_stats[function]
+
+        if self_time * fraction > 0:
+            weights[stack] = weights.get(stack, 0.0) + self_time * fraction
+
+        if len(on_stack) >= MAX_STACK_DEPTH:
+            continue
+
+        for callee, edge_time in callees.get(function, []):
+            callee_time = raw_stats[callee][3]
+            if callee in on_stack or callee_time <= 0:
+                continue
+            path_time = fraction * edge_time
+            if path_time / total_time < MIN_STACK_FRACTION:
+                continue
+            pending.append((callee, f"{stack};{format_frame(callee)}",
+                            on_stack | {callee}, path_time / callee_time))
+
+    return sorted((stack, round(weight * 1_000_000)) for stack, weight in weights.items()
+                  if round(weight * 1_000_000) > 0)
+
+class StageProfiler:
+    """Profiles named pipeline stages with cProfile and tracemalloc."""
+
+    def __init__(self, output_dir: str, prefix: str):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.summaries: List[str] = []
+        self._stage_count = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{self.prefix}-{name}")
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the code run inside the with block as one stage."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._stage_count += 1
+        stage_name = f"{self._stage_count:02d}-{name}"
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(25)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        memory_before, _ = tracemalloc.get_traced_memory()
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+            self._write_stage(stage_name, profile, before, after, elapsed,
+                              memory_after - memory_before, memory_peak - memory_before)
+
+    def _write_stage(self, stage_name: str, profile: cProfile.Profile,
+                     before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                     elapsed: float, memory_change: int, memory_peak: int) -> None:
+        """Write the pstats, collapsed stack and allocation reports for a stage."""
+        profile.dump_stats(self._path(f"{stage_name}.pstats"))
+
+        stats = pstats.Stats(profile)
+        with open(self._path(f"{stage_name}.folded"), 'w') as f:
+            for stack, weight in collapse_stacks(stats):
+                f.write(f"{stack} {weight}\n")
+
+        # Ignore the profilers' own allocations
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, pstats.__file__),
+        ]
+        allocations = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        with open(self._path(f"{stage_name}-alloc.txt"), 'w') as f:
+            f.write(f"Top {TOP_ALLOCATIONS} allocation sites for stage {stage_name}\n\n")
+            for allocation in allocations[:TOP_ALLOCATIONS]:
+                f.write(f"{allocation}\n")
+
+        hottest = io.StringIO()
+        pstats.Stats(profile, stream=hottest).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        self.summaries.append(
+            f"Stage {stage_name}: {elapsed:.3f}s, "
+            f"memory change {memory_change / 1024:.1f} KiB, peak {memory_peak / 1024:.1f} KiB\n"
+            f"{hottest.getvalue().strip()}\n"
+        )
+        print(f"Profiled stage {stage_name} in {elapsed:.3f}s")
+
+    def write_summary(self) -> None:
+        """Write the summary of all profiled stages."""
+        if not self.summaries:
+            return
+
+        summary_path = self._path("summary.txt")
+        with open(summary_path, 'w') as f:
+            f.write("\n\n".join(self.summaries))
+        print(f"Saved profile reports to {self.output_dir}")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Public Holiday Generator
+
+This utility works out Australian public holidays for any year from rules,
+so shifts outside the years listed in config["publicHolidays"] still get
+public holiday rates.
+
+Rules cover:
+- fixed dates (Anzac Day, Christmas Day)
+- the nth or last weekday of a month (King's Birthday, Labour Day)
+- dates relative to Easter Sunday (Good Friday to Easter Monday)
+- weekend substitution: Australia Day moves to the Monday, while New Year's
+  Day, Christmas Day and Boxing Day keep the weekend day and add an
+  "observed" weekday
+
+Generated holidays use the same shape as a year in config["publicHolidays"]:
+a list of {"date", "name"} entries for "national" and for each state. Each
+date is listed once: holidays that fall together share an entry with their
+names joined, and state holidays on a national one are left to "national".
+Holidays set by proclamation each year (show days, regional holidays, the
+Friday before the AFL Grand Final) aren't generated and should be listed in
+the config.
+
+Entries in config["publicHolidays"] take precedence: when the config lists a
+year, each section it gives (national or a state) replaces the generated one.
+
+Lookups are memoized per (year, state) as a set of dates, so checking a
+shift against wide date ranges costs one set lookup.
+
+Usage:
+    python public_holidays.py YEAR [STATE]
+"""
+
+import argparse
+import json
+import threading
+from datetime import date, timedelta
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from config_cache import ConfigCache
+
+MONDAY, TUESDAY, WEDNESDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = range(7)
+
+STATES = ("ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA")
+
+def easter_sunday(year: int) -> date:
+    """Return the date of Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """Return the nth given weekday of a month, or the last one when n is -1."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def weekday_on_or_after(day: date, weekday: int) -> date:
+    """Return the first given weekday on or after a date."""
+    return day + timedelta(days=(weekday - day.weekday()) % 7)
+
+# Holiday rules: (name, function giving the date in a year)
+HolidayRule = Tuple[str, Callable[[int], date]]
+
+def fixed(month: int, day: int) -> Callable[[int], date]:
+    return lambda year: date(year, month, day)
+
+def nth(month: int, weekday: int, n: int) -> Callable[[int], date]:
+    return lambda year: nth_weekday(year, month, weekday, n)
+
+def easter(offset: int) -> Callable[[int], date]:
+    return lambda year: easter_sunday(year) + timedelta(days=offset)
+
+NATIONAL_RULES: List[HolidayRule] = [
+    ("Good Friday", easter(-2)),
+    ("Easter Saturday", easter(-1)),
+    ("Easter Sunday", easter(0)),
+    ("Easter Monday", easter(1)),
+    ("Anzac Day", fixed(4, 25)),
+]
+
+STATE_RULES: Dict[str, List[HolidayRule]] = {
+    "ACT": [
+        ("Canberra Day", nth(3, MONDAY, 2)),
+        ("Reconciliation Day", lambda year: weekday_on_or_after(date(year, 5, 27), MONDAY)),
+        ("King's Birthday", nth(6, MONDAY, 2)),
+        ("Labour Day", nth(10, MONDAY, 1)),
+    ],
+    "NSW": [
+        ("King's Birthday", nth(6, MONDAY, 2)),
+        ("Labour Day", nth(10, MONDAY, 1)),
+    ],
+    "NT": [
+        ("May Day", nth(5, MONDAY, 1)),
+        ("King's Birthday", nth(6, MONDAY, 2)),
+        ("Picnic Day", nth(8, MONDAY, 1)),
+    ],
+    "QLD": [
+        ("Labour Day", nth(5, MONDAY, 1)),
+        ("King's Birthday", nth(10, MONDAY, 1)),
+    ],
+    "SA": [
+        ("Adelaide Cup Day", nth(3, MONDAY, 2)),
+        ("King's Birthday", nth(6, MONDAY, 2)),
+        ("Labour Day", nth(10, MONDAY, 1)),
+    ],
+    "TAS": [
+        ("Eight Hours Day", nth(3, MONDAY, 2)),
+        ("King's Birthday", nth(6, MONDAY, 2)),
+    ],
+    "VIC": [
+        ("Labour Day", nth(3, MONDAY, 2)),
+        ("King's Birthday", nth(6, MONDAY, 2)),
+        ("Melbourne Cup Day", nth(11, TUESDAY, 1)),
+    ],
+    "WA": [
+        ("Labour Day", nth(3, MONDAY, 1)),
+        ("Western Australia Day", nth(6, MONDAY, 1)),
+        ("King's Birthday", nth(9, MONDAY, -1)),
+    ],
+}
+
+def holiday(day: date, name: str) -> Dict[str, str]:
+    return {"date": day.isoformat(), "name": name}
+
+def merge_holidays(holidays: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Sort holidays by date, joining the names of holidays that share a date (e.g. Anzac Day on Easter Monday)."""
+    by_date: Dict[str, Dict[str, str]] = {}
+    for item in sorted(holidays, key=lambda item: item["date"]):
+        if item["date"] in by_date:
+            by_date[item["date"]]["name"] += f" / {item['name']}"
+        else:
+            by_date[item["date"]] = dict(item)
+    return list(by_date.values())
+
+def get_substituted_holidays(year: int) -> List[Dict[str, str]]:
+    """Return the national holidays that move or gain an observed day when they fall on a weekend."""
+    holidays = []
+
+    new_year = date(year, 1, 1)
+    holidays.append(holiday(new_year, "New Year's Day"))
+    if new_year.weekday() >= SATURDAY:
+        holidays.append(holiday(weekday_on_or_after(new_year, MONDAY), "New Year's Day observed"))
+
+    # Australia Day itself moves to the Monday
+    australia_day = date(year, 1, 26)
+    if australia_day.weekday() >= SATURDAY:
+        holidays.append(holiday(weekday_on_or_after(australia_day, MONDAY), "Australia Day holiday"))
+    else:
+        holidays.append(holiday(australia_day, "Australia Day"))
+
+    christmas = date(year, 12, 25)
+    boxing_day = date(year, 12, 26)
+    holidays.append(holiday(christmas, "Christmas Day"))
+    holidays.append(holiday(boxing_day, "Boxing Day"))
+    if christmas.weekday() == SATURDAY:
+        holidays.append(holiday(date(year, 12, 27), "Christmas Day observed"))
+        holidays.append(holiday(date(year, 12, 28), "Boxing Day observed"))
+    elif christmas.weekday() == SUNDAY:
+        # Boxing Day is already the Monday, so Christmas is observed on the Tuesday
+        holidays.append(holiday(date(year, 12, 27), "Christmas Day observed"))
+    elif boxing_day.weekday() == SATURDAY:
+        holidays.append(holiday(date(year, 12, 28), "Boxing Day observed"))
+
+    return holidays
+
+# Generated holidays by year, with the lock guarding it
+_GENERATED_CACHE: Dict[int, Dict[str, List[Dict[str, str]]]] = {}
+_GENERATED_LOCK = threading.Lock()
+
+def generate_public_holidays(year: int) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Generate the national and state public holidays of a year from the rules.
+
+    Returns:
+        Holidays by section ("national" and each state), sorted by date
+    """
+    with _GENERATED_LOCK:
+        generated = _GENERATED_CACHE.get(year)
+    if generated is None:
+        national = get_substituted_holidays(year)
+        national.extend(holiday(rule(year), name) for name, rule in NATIONAL_RULES)
+
+        generated = {"national": merge_holidays(national)}
+        national_dates = {item["date"] for item in generated["national"]}
+        # State holidays on a national holiday (e.g. SA's Proclamation Day on Boxing Day)
+        # are already listed under national
+        for state, rules in STATE_RULES.items():
+            generated[state] = merge_holidays([holiday(rule(year), name) for name, rule in rules
+                                               if rule(year).isoformat() not in national_dates])
+        with _GENERATED_LOCK:
+            _GENERATED_CACHE[year] = generated
+
+    return {section: [dict(item) for item in holidays] for section, holidays in generated.items()}
+
+def get_public_holidays(config_holidays: Dict, year: int) -> Dict[str, List[Dict]]:
+    """
+    Get the public holidays of a year, with config entries overriding generated ones.
+
+    Args:
+        config_holidays: config["publicHolidays"], by year then section
+        year: The year to get holidays for
+
+    Returns:
+        Holidays by section ("national" and each state)
+    """
+    holidays = generate_public_holidays(year)
+    holidays.update(config_holidays.get(str(year), {}))
+    return holidays
+
+# Holiday dates by config["publicHolidays"], year and state; sized for
+# decades of history in every state
+_DATES_CACHE = ConfigCache(1024)
+
+def build_holiday_dates(config_holidays: Dict, year: int, state: str) -> FrozenSet[str]:
+    """Collect the national and (non-regional) state holiday dates of a year."""
+    holidays = get_public_holidays(config_holidays, year)
+    dates = {item["date"] for item in holidays.get("national", [])}
+    for item in holidays.get(state, []):
+        # Skip regional holidays unless we want to implement regional checking
+        if "regional" in item and isinstance(item["regional"], bool) and item["regional"]:
+            continue
+        dates.add(item["date"])
+
+    return frozenset(dates)
+
+def get_holiday_dates(config_holidays: Dict, year: int, state: str) -> FrozenSet[str]:
+    """Return the dates (YYYY-MM-DD) that are public holidays in a state and year."""
+    return _DATES_CACHE.get_or_build(config_holidays,
+                                     lambda: build_holiday_dates(config_holidays, year, state),
+                                     year, state)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="List the generated public holidays of a year.")
+    parser.add_argument("year", type=int, help="Year to generate")
+    parser.add_argument("state", nargs="?", choices=STATES, help="Only show national and this state's holidays")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    holidays = generate_public_holidays(args.year)
+    if args.state:
+        holidays = {section: holidays[section] for section in ("national", args.state)}
+    print(json.dumps(holidays, indent=2))
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Regression Check
+
+This script runs the pay pipeline (calculate_shift_pay followed by
+calculate_pay_periods) on the checked-in datasets and on seeded synthetic
+rosters, and fails if either the results or the performance have regressed.
+
+Correctness: the computed shiftspay and payperiods data are compared field by
+field against golden files in golden/. Numbers are compared in whole cents,
+so any change to a money figure, hour count or rate is reported.
+
+Performance: the wall time and peak RSS of each dataset are compared against
+golden/baseline.json. A run fails if it is slower or larger than the baseline
+by more than the given tolerance. Each dataset runs in its own process so the
+peak RSS of one run doesn't hide another.
+
+Usage:
+    python regression_check.py                  # check against golden files
+    python regression_check.py --update         # rewrite golden files and baseline
+    python regression_check.py --dataset demo --time-tolerance 0.5
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, "golden")
+BASELINE_FILE = os.path.join(GOLDEN_DIR, "baseline.json")
+
+# Checked-in datasets: name -> (shifts file, user file)
+FILE_DATASETS = {
+    "demo": ("shifts.json", "user.json"),
+    "jessica": ("shiftsjessica.json", "userjessica.json"),
+}
+
+# Synthetic rosters: name -> (random seed, number of shifts)
+SYNTHETIC_DATASETS = {
+    "synthetic-small": (20250101, 500),
+    "synthetic-large": (20260101, 5000),
+}
+
+DEFAULT_TIME_TOLERANCE = 0.5   # allow 50% slower than baseline
+DEFAULT_RSS_TOLERANCE = 0.2    # allow 20% more memory than baseline
+DEFAULT_TIME_SLACK = 0.05      # seconds, so tiny datasets don't fail on noise
+
+def load_json_file(file_path: str) -> Dict:
+    """Load and parse a JSON file."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+def build_synthetic_dataset(seed: int, shift_count: int) -> Tuple[Dict, Dict]:
+    """
+    Build a reproducible roster for a seed.
+
+    The roster covers 2025 and 2026 across employers with different states,
+    levels, pay cycles, tax-free threshold claims and allowances. Some shifts
+    run past midnight.
+
+    Returns:
+        (shifts data, user data) in the same shape as shifts.json and user.json
+    """
+    rng = random.Random(seed)
+
+    employers = [
+        {
+            "id": "S1", "name": "Synthetic Grocer", "state": "VIC",
+            "level": "retail_employee_level_1", "taxFreeThreshold": True,
+            "paycycle": "weekly", "payday": "Wednesday",
+            "payPeriodStart": "Monday", "payPeriodDays": 7,
+            "applicableAllowances": [
+                {"name": "Laundry allowance - part-time or casual employees", "enabled": True}
+            ]
+        },
+        {
+            "id": "S2", "name": "Synthetic Hardware", "state": "NSW",
+            "level": "retail_employee_level_3", "taxFreeThreshold": False,
+            "paycycle": "fortnightly", "payday": "Thursday",
+            "payPeriodStart": "Monday", "payPeriodDays": 14,
+            "applicableAllowances": [
+                {"name": "Cold work allowance - 0°C and above", "enabled": True,
+                 "notes": "Freezer section"},
+                {"name": "Meal allowance", "enabled": True}
+            ]
+        },
+        {
+            "id": "S3", "name": "Synthetic Pharmacy", "state": "QLD",
+            "level": "retail_employee_level_5", "taxFreeThreshold": False,
+            "paycycle": "weekly", "payday": "Friday",
+            "payPeriodStart": "Saturday", "payPeriodDays": 7,
+            "applicableAllowances": []
+        },
+    ]
+
+    first_day = date(2025, 1, 1)
+    days_in_range = (date(2026, 12, 31) - first_day).days + 1
+
+    shifts = []
+    for _ in range(shift_count):
+        employer = rng.choice(employers)
+        shift_date = first_day + timedelta(days=rng.randrange(days_in_range))
+        start_minute = rng.randrange(5 * 60, 23 * 60, 15)
+        duration = rng.randrange(3 * 60, 10 * 60 + 1, 15)
+        end_minute = (start_minute + duration) % (24 * 60)
+        shifts.append({
+            "date": shift_date.strftime("%Y-%m-%d"),
+            "employerId": employer["id"],
+            "employer": employer["name"],
+            "start": f"{start_minute // 60:02d}:{start_minute % 60:02d}",
+            "end": f"{end_minute // 60:02d}:{end_minute % 60:02d}"
+        })
+
+    shifts.sort(key=lambda shift: (shift["date"], shift["start"], shift["employerId"]))
+    user_data = {"user": f"synthetic_{seed}", "name": "Synthetic User", "employers": employers}
+    return {"shifts": shifts}, user_data
+
+def load_dataset(name: str) -> Tuple[Dict, Dict]:
+    """Load or build the shifts and user data for a dataset."""
+    if name in FILE_DATASETS:
+        shifts_file, user_file = FILE_DATASETS[name]
+        return (load_json_file(os.path.join(DATA_DIR, shifts_file)),
+                load_json_file(os.path.join(DATA_DIR, user_file)))
+    if name in SYNTHETIC_DATASETS:
+        return build_synthetic_dataset(*SYNTHETIC_DATASETS[name])
+    raise ValueError(f"Unknown dataset: {name}")
+
+def get_peak_rss_kb() -> Optional[int]:
+    """Return the peak resident set size of this process in KB, if available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def run_pipeline(name: str) -> Dict[str, Any]:
+    """
+    Run the pipeline on a dataset in this process.
+
+    Returns:
+        The outputs and the measured wall time and peak RSS
+    """
+    sys.path.insert(0, SCRIPTS_DIR)
+    from calculate_shift_pay import process_shifts
+    from calculate_pay_periods import build_pay_periods
+    from pay_cache import ShiftPayCache
+
+    shifts_data, user_data = load_dataset(name)
+    config_data = load_json_file(CONFIG_FILE)
+
+    # The pipeline reports progress on stdout, which we don't want here
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        processed_shifts = process_shifts(shifts_data["shifts"], user_data, config_data, ShiftPayCache())
+        shiftspay_data = {"shifts": processed_shifts}
+        payperiods_data = build_pay_periods(shiftspay_data, user_data, config_data)
+        wall_time = time.perf_counter() - started
+
+    return {
+        "outputs": {"shiftspay": shiftspay_data, "payperiods": payperiods_data},
+        "wallTime": wall_time,
+        "peakRssKb": get_peak_rss_kb()
+    }
+
+def run_dataset(name: str, repeat: int) -> Dict[str, Any]:
+    """
+    Run a dataset in fresh processes and keep the fastest run.
+
+    Returns:
+        The outputs of the last run with the best wall time and peak RSS
+    """
+    best: Optional[Dict[str, Any]] = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result_file = os.path.join(temp_dir, "result.json")
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-one", name, "--result-file", result_file],
+                check=True
+            )
+            result = load_json_file(result_file)
+
+        if best is None:
+            best = result
+        else:
+            best["outputs"] = result["outputs"]
+            best["wallTime"] = min(best["wallTime"], result["wallTime"])
+            if result["peakRssKb"] is not None and best["peakRssKb"] is not None:
+                best["peakRssKb"] = min(best["peakRssKb"], result["peakRssKb"])
+
+    return best
+
+def to_cents(value: float) -> int:
+    """Convert a number to whole cents (or hundredths of an hour)."""
+    return round(value * 100)
+
+def diff_values(expected: Any, actual: Any, path: str, differences: List[str]) -> None:
+    """Compare two JSON values field by field, collecting readable differences."""
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        if expected is not actual:
+            differences.append(f"{path}: expected {expected!r}, got {actual!r}")
+    elif isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        if to_cents(expected) != to_cents(actual):
+            differences.append(f"{path}: expected {expected}, got {actual}")
+    elif isinstance(expected, dict) and isinstance(actual, dict):
+        for key in expected:
+            if key not in actual:
+                differences.append(f"{path}.{key}: missing")
+            else:
+                diff_values(expected[key], actual[key], f"{path}.{key}", differences)
+        for key in actual:
+            if key not in expected:
+                differences.append(f"{path}.{key}: unexpected field")
+    elif isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            differences.append(f"{path}: expected {len(expected)} items, got {len(actual)}")
+        for index, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            diff_values(expected_item, actual_item, f"{path}[{index}]", differences)
+    elif expected != actual:
+        differences.append(f"{path}: expected {expected!r}, got {actual!r}")
+
+def golden_path(name: str) -> str:
+    """Return the golden output file for a dataset."""
+    return os.path.join(GOLDEN_DIR, f"{name}.json.gz")
+
+def load_golden(name: str) -> Optional[Dict]:
+    """Load the golden outputs for a dataset, or None if there are none."""
+    try:
+        with gzip.open(golden_path(name), 'rt') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_golden(name: str, outputs: Dict) -> None:
+    """Save the golden outputs for a dataset."""
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    # mtime=0 keeps the file identical when the outputs haven't changed
+    with open(golden_path(name), 'wb') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(outputs, indent=1, sort_keys=True).encode("utf-8"))
+
+def check_performance(name: str, result: Dict, baseline: Dict, args: argparse.Namespace) -> List[str]:
+    """Compare wall time and peak RSS with the baseline."""
+    failures = []
+    expected = baseline.get(name)
+    if not expected:
+        return [f"no performance baseline for {name} (run with --update)"]
+
+    time_limit = expected["wallTime"] * (1 + args.time_tolerance) + args.time_slack
+    if result["wallTime"] > time_limit:
+        failures.append(
+            f"wall time {result['wallTime']:.3f}s exceeds {time_limit:.3f}s "
+            f"(baseline {expected['wallTime']:.3f}s)"
+        )
+
+    if result["peakRssKb"] is not None and expected.get("peakRssKb"):
+        rss_limit = expected["peakRssKb"] * (1 + args.rss_tolerance)
+        if result["peakRssKb"] > rss_limit:
+            failures.append(
+                f"peak RSS {result['peakRssKb']} KB exceeds {rss_limit:.0f} KB "
+                f"(baseline {expected['peakRssKb']} KB)"
+            )
+
+    return failures
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    all_datasets = list(FILE_DATASETS) + list(SYNTHETIC_DATASETS)
+    parser = argparse.ArgumentParser(description="Check pay pipeline results and performance.")
+    parser.add_argument("--dataset", action="append", choices=all_datasets,
+                        help="Dataset to check (repeatable, default all)")
+    parser.add_argument("--update", action="store_true",
+                        help="Rewrite the golden files and performance baseline")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per dataset; the fastest is kept (default 3)")
+    parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE,
+                        help=f"Allowed wall time increase as a fraction (default {DEFAULT_TIME_TOLERANCE})")
+    parser.add_argument("--rss-tolerance", type=float, default=DEFAULT_RSS_TOLERANCE,
+                        help=f"Allowed peak RSS increase as a fraction (default {DEFAULT_RSS_TOLERANCE})")
+    parser.add_argument("--time-slack", type=float, default=DEFAULT_TIME_SLACK,
+                        help=f"Extra seconds allowed on top of the tolerance (default {DEFAULT_TIME_SLACK})")
+    parser.add_argument("--skip-performance", action="store_true",
+                        help="Only check the results")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.dataset = args.dataset or all_datasets
+    return args
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the checks and return the process exit code."""
+    args = parse_args(argv)
+
+    # Child process: run one dataset and hand the result back
+    if args.run_one:
+        result = run_pipeline(args.run_one)
+        with open(args.result_file, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    try:
+        baseline = load_json_file(BASELINE_FILE)
+    except FileNotFoundError:
+        baseline = {}
+
+    failed = False
+    for name in args.dataset:
+        result = run_dataset(name, max(args.repeat, 1))
+        rss = f"{result['peakRssKb']} KB" if result["peakRssKb"] is not None else "n/a"
+        print(f"{name}: {len(result['outputs']['shiftspay']['shifts'])} shifts, "
+              f"{result['wallTime']:.3f}s, peak RSS {rss}")
+
+        if args.update:
+            save_golden(name, result["outputs"])
+            baseline[name] = {"wallTime": round(result["wallTime"], 4), "peakRssKb": result["peakRssKb"]}
+            continue
+
+        golden = load_golden(name)
+        if golden is None:
+            print(f"  FAIL: no golden outputs for {name} (run with --update)")
+            failed = True
+            continue
+
+        differences: List[str] = []
+        diff_values(golden, result["outputs"], name, differences)
+        for difference in differences[:50]:
+            print(f"  FAIL: {difference}")
+        if len(differences) > 50:
+            print(f"  ... and {len(differences) - 50} more differences")
+        failed = failed or bool(differences)
+
+        if not args.skip_performance:
+            for failure in check_performance(name, result, baseline, args):
+                print(f"  FAIL: {failure}")
+                failed = True
+
+    if args.update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Updated golden files and baseline in {GOLDEN_DIR}")
+        return 0
+
+    print("FAILED" if failed else "All checks passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Roster Validation
+
+This utility checks a list of shifts for problems before they are paid:
+
+- invalid_record: a missing field or a date or time that can't be parsed
+- unknown_employer: an employer ID that isn't in user.json
+- zero_duration: a shift that starts and ends at the same time
+- duplicate: a shift identical to an earlier one (same employer, date, start and end)
+- overlap: a shift that starts before another shift has ended, for the same
+  or a different employer
+
+Shifts are placed on one timeline in absolute minutes, sorted by start and
+end, and swept once while tracking the latest-ending shift seen so far. Each
+overlapping shift is reported against that shift, so the check is O(n log n)
+however many shifts overlap.
+
+Each problem is reported as a dict with its type, severity, the index and
+key fields of the shift, the index of the other shift for duplicates and
+overlaps, and a message.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from shift_units import get_shift_interval
+
+# Problems that stop a shift being paid; the rest are reported only
+SKIPPED_ISSUES = ("invalid_record", "unknown_employer", "duplicate")
+
+SHIFT_FIELDS = ("date", "employerId", "start", "end")
+
+def make_issue(issue_type: str, severity: str, index: int, shift: Dict, message: str,
+               other_index: Optional[int] = None) -> Dict:
+    """Build a structured issue report for a shift."""
+    issue = {
+        "type": issue_type,
+        "severity": severity,
+        "index": index,
+        "shift": {field: shift.get(field) for field in SHIFT_FIELDS},
+    }
+    if other_index is not None:
+        issue["otherIndex"] = other_index
+    issue["message"] = message
+    return issue
+
+def find_roster_issues(shifts: List[Dict], employer_ids: Optional[Set[str]] = None) -> List[Dict]:
+    """
+    Find invalid, duplicate and overlapping shifts.
+
+    Args:
+        shifts: Shifts as in shifts.json
+        employer_ids: Known employer IDs, or None to skip the employer check
+
+    Returns:
+        The issues found, ordered by the index of the shift they refer to
+    """
+    issues = []
+    intervals = []
+    for index, shift in enumerate(shifts):
+        missing = [field for field in SHIFT_FIELDS if not isinstance(shift.get(field), str)]
+        if missing:
+            issues.append(make_issue("invalid_record", "error", index, shift,
+                                     f"Missing or invalid fields: {', '.join(missing)}"))
+            continue
+        try:
+            start, end = get_shift_interval(shift)
+        except ValueError as e:
+            issues.append(make_issue("invalid_record", "error", index, shift, f"Can't parse shift: {e}"))
+            continue
+
+        if employer_ids is not None and shift["employerId"] not in employer_ids:
+            issues.append(make_issue("unknown_employer", "error", index, shift,
+                                     f"Employer {shift['employerId']} not found in user data"))
+            continue
+        if start == end:
+            issues.append(make_issue("zero_duration", "warning", index, shift,
+                                     f"Shift on {shift['date']} starts and ends at {shift['start']}"))
+            continue
+
+        intervals.append((start, end, index))
+
+    # Sweep in start order, remembering the shift that ends latest so far
+    intervals.sort()
+    latest_end = None
+    latest_index = -1
+    seen: Dict[Tuple[str, int, int], int] = {}
+    for start, end, index in intervals:
+        shift = shifts[index]
+        identity = (shift["employerId"], start, end)
+        if identity in seen:
+            issues.append(make_issue("duplicate", "error", index, shift,
+                                     f"Duplicate of shift {seen[identity]} on {shift['date']} "
+                                     f"{shift['start']}-{shift['end']}", seen[identity]))
+            continue
+        seen[identity] = index
+
+        if latest_end is not None and start < latest_end:
+            other = shifts[latest_index]
+            employer_note = ("the same employer" if other["employerId"] == shift["employerId"]
+                             else f"employer {other['employerId']}")
+            issues.append(make_issue("overlap", "warning", index, shift,
+                                     f"Shift on {shift['date']} {shift['start']}-{shift['end']} overlaps "
+                                     f"{other['date']} {other['start']}-{other['end']} for {employer_note}",
+                                     latest_index))
+
+        if latest_end is None or end > latest_end:
+            latest_end = end
+            latest_index = index
+
+    issues.sort(key=lambda issue: issue["index"])
+    return issues
+
+def get_paid_indices(shifts: List[Dict], issues: List[Dict]) -> List[int]:
+    """Return the indices of the shifts without issues that stop them being paid."""
+    skipped = {issue["index"] for issue in issues if issue["type"] in SKIPPED_ISSUES}
+    return [index for index in range(len(shifts)) if index not in skipped]
+
+def filter_shifts(shifts: List[Dict], issues: List[Dict]) -> List[Dict]:
+    """Return the shifts without those whose issues stop them being paid."""
+    return [shifts[index] for index in get_paid_indices(shifts, issues)]
+
+def summarize_issues(issues: List[Dict]) -> Dict[str, int]:
+    """Count issues by type."""
+    counts: Dict[str, int] = {}
+    for issue in issues:
+        counts[issue["type"]] = counts.get(issue["type"], 0) + 1
+    return counts
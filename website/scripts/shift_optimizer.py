@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Shift Offer Optimizer
+
+This utility picks which offered shifts to accept to earn the most net pay.
+The value of a shift isn't fixed: penalty rates, breaks and allowances set
+its gross pay, and PAYG withholding is worked out on each pay period's total,
+so the tax on an extra shift depends on the other shifts in the same period.
+
+Each candidate is priced once with calculate_shift_pay and assigned to its
+employer's pay period. The existing roster's gross pay in those periods is
+the starting point. A depth-first branch and bound search then tries
+accepting or declining each candidate:
+
+- Accepting a candidate re-taxes only its own pay period, with the net pay
+  of each (period, gross total) memoized.
+- A branch is pruned when its net gain plus the gross pay of every remaining
+  candidate (net pay can't grow faster than gross) can't beat the best found.
+- Candidates that clash with the roster, or would break the weekly hours cap
+  on their own, are rejected up front. Clashes between candidates are
+  precomputed, so checking a branch is a lookup.
+
+Constraints:
+- no overlapping shifts, across all employers
+- at least min_rest_hours between the end of one shift and the start of the next
+- at most max_weekly_hours worked (after unpaid breaks) per Monday to Sunday week
+
+The search stops after max_nodes branches and returns the best selection
+found, with optimal set to False.
+
+The search relies on a shift's gross pay not depending on which other shifts
+are worked, so configs with overtime rules (see overtime.py) are refused.
+
+Usage:
+    python shift_optimizer.py CANDIDATES.json [--max-weekly-hours H] [--min-rest-hours H]
+"""
+
+import argparse
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from calculate_pay_periods import calculate_period_tax, generate_pay_periods
+from calculate_shift_pay import calculate_shift_pay
+from overtime import is_overtime_configured
+from pay_cache import ShiftPayCache
+from shift_units import MINUTES_PER_DAY, get_shift_interval
+
+# Paths to data files
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+SHIFTS_FILE = os.path.join(DATA_DIR, "shifts.json")
+USER_FILE = os.path.join(DATA_DIR, "user.json")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+
+DEFAULT_MAX_WEEKLY_HOURS = 38.0
+DEFAULT_MIN_REST_HOURS = 10.0
+DEFAULT_MAX_NODES = 200_000
+
+# (employerId, period startDate)
+PeriodKey = Tuple[str, str]
+
+def load_json_file(file_path: str) -> Dict:
+    """Load and parse a JSON file."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+def get_week_start(date_str: str) -> str:
+    """Return the Monday of a date's week."""
+    day = date.fromisoformat(date_str)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+def price_shifts(shifts: List[Dict], user_data: Dict, config_data: Dict,
+                 cache: ShiftPayCache) -> List[Dict]:
+    """Calculate pay for shifts, without the per-shift debug output."""
+    return [calculate_shift_pay(shift, user_data, config_data, cache, verbose=False) for shift in shifts]
+
+def conflicts(first: Tuple[int, int], second: Tuple[int, int], rest_minutes: int) -> bool:
+    """Return whether two shift intervals overlap or leave less than the minimum rest between them."""
+    return first[0] < second[1] + rest_minutes and second[0] < first[1] + rest_minutes
+
+class PeriodTaxTable:
+    """Memoized net pay of each pay period at a given gross total."""
+
+    def __init__(self, periods: Dict[PeriodKey, Dict], employers: Dict[str, Dict]):
+        self.periods = periods
+        self.employers = employers
+        self._net_pay: Dict[Tuple[PeriodKey, int], float] = {}
+
+    def net_pay(self, key: PeriodKey, gross_cents: int) -> float:
+        """Return the net pay of a period whose total gross pay is gross_cents."""
+        cached = self._net_pay.get((key, gross_cents))
+        if cached is None:
+            gross = gross_cents / 100
+            tax = round(calculate_period_tax(gross, self.employers[key[0]], self.periods[key], verbose=False), 2)
+            cached = gross - tax
+            self._net_pay[(key, gross_cents)] = cached
+        return cached
+
+def optimize_shift_offers(roster: List[Dict], candidates: List[Dict], user_data: Dict, config_data: Dict,
+                          max_weekly_hours: float = DEFAULT_MAX_WEEKLY_HOURS,
+                          min_rest_hours: float = DEFAULT_MIN_REST_HOURS,
+                          max_nodes: int = DEFAULT_MAX_NODES) -> Dict:
+    """
+    Choose the subset of candidate shifts that maximises net pay.
+
+    Args:
+        roster: Shifts already worked or accepted, as in shifts.json
+        candidates: Offered shifts, as in shifts.json
+        user_data: User and employer information, as stored in user.json
+        config_data: Pay rates and award rules, as stored in config.json
+        max_weekly_hours: Most hours that may be worked in a Monday to Sunday week
+        min_rest_hours: Least time between the end of one shift and the start of the next
+        max_nodes: Most search branches to explore before returning the best found
+
+    Returns:
+        The accepted shifts with their pay, the gross, tax and net gain, the
+        candidates rejected up front with reasons, whether the result is
+        proven optimal, and the number of branches explored
+
+    Raises:
+        ValueError: If the config has overtime rules
+    """
+    if is_overtime_configured(config_data):
+        raise ValueError("Can't optimize shift offers when overtime is configured: "
+                         "a shift's pay would depend on the other shifts accepted")
+
+    employers = {employer["id"]: employer for employer in user_data["employers"]}
+    rest_minutes = round(min_rest_hours * 60)
+    max_weekly_hundredths = round(max_weekly_hours * 100)
+
+    cache = ShiftPayCache()
+    priced_roster = price_shifts(roster, user_data, config_data, cache)
+    # Roster intervals sorted by start, so clashes are found by bisecting around a candidate
+    roster_intervals = sorted((get_shift_interval(shift) + (index,) for index, shift in enumerate(roster)))
+    roster_starts = [interval[0] for interval in roster_intervals]
+
+    roster_week_hours: Dict[str, int] = {}
+    for shift in priced_roster:
+        week = get_week_start(shift["date"])
+        roster_week_hours[week] = roster_week_hours.get(week, 0) + round(shift["hoursWorked"] * 100)
+
+    # Price the candidates and reject those that can't be accepted whatever else is chosen
+    rejected = []
+    options = []
+    for shift in candidates:
+        if shift.get("employerId") not in employers:
+            rejected.append({"shift": shift, "reason": f"Employer {shift.get('employerId')} not found in user data"})
+            continue
+        try:
+            interval = get_shift_interval(shift)
+        except (KeyError, ValueError) as e:
+            rejected.append({"shift": shift, "reason": f"Can't parse shift: {e}"})
+            continue
+
+        # No shift is longer than a day, so only roster shifts starting near this one can clash
+        low = bisect_left(roster_starts, interval[0] - MINUTES_PER_DAY - rest_minutes)
+        high = bisect_right(roster_starts, interval[1] + rest_minutes)
+        clash = next((roster[other[2]] for other in roster_intervals[low:high]
+                      if conflicts(interval, other, rest_minutes)), None)
+        if clash is not None:
+            rejected.append({"shift": shift, "reason": f"Overlaps or leaves too little rest around the rostered "
+                                                       f"shift on {clash['date']} {clash['start']}-{clash['end']}"})
+            continue
+
+        priced = price_shifts([shift], user_data, config_data, cache)[0]
+        week = get_week_start(shift["date"])
+        hours = round(priced["hoursWorked"] * 100)
+        if roster_week_hours.get(week, 0) + hours > max_weekly_hundredths:
+            rejected.append({"shift": shift, "reason": f"Would exceed {max_weekly_hours:g} hours in the week of {week}"})
+            continue
+
+        options.append({"shift": priced, "interval": interval, "week": week, "hours": hours,
+                        "grossCents": round(priced["totalGrossPay"] * 100)})
+
+    # Assign each option to its pay period and total the roster's gross pay in those periods
+    periods: Dict[PeriodKey, Dict] = {}
+    for option in options:
+        shift = option["shift"]
+        period = generate_pay_periods(employers[shift["employerId"]], shift["date"], shift["date"], config_data,
+                                      verbose=False)[0]
+        option["period"] = (shift["employerId"], period["startDate"])
+        periods.setdefault(option["period"], period)
+
+    base_gross: Dict[PeriodKey, int] = {key: 0 for key in periods}
+    for shift in priced_roster:
+        for key, period in periods.items():
+            if key[0] == shift["employerId"] and period["startDate"] <= shift["date"] <= period["endDate"]:
+                base_gross[key] += round(shift["totalGrossPay"] * 100)
+
+    tax_table = PeriodTaxTable(periods, employers)
+
+    # Try the most valuable candidates first so good selections are found early
+    options.sort(key=lambda option: option["grossCents"], reverse=True)
+    count = len(options)
+    clashes = [
+        [j for j in range(count) if j != i and conflicts(options[i]["interval"], options[j]["interval"], rest_minutes)]
+        for i in range(count)
+    ]
+    # Most gross pay still available from option i onwards
+    remaining_gross = [0] * (count + 1)
+    for i in range(count - 1, -1, -1):
+        remaining_gross[i] = remaining_gross[i + 1] + options[i]["grossCents"] / 100
+
+    period_gross = dict(base_gross)
+    week_hours = dict(roster_week_hours)
+    blocked = [0] * count
+    chosen: List[int] = []
+    best = {"gain": 0.0, "chosen": []}
+    nodes = 0
+    limit_reached = False
+
+    # Depth first over an explicit stack, so long candidate lists can't hit the
+    # recursion limit. Entries are (index, gain, undo): a node to explore, or with
+    # undo set, a candidate whose accept branch is done, to be taken back out and
+    # declined instead
+    stack = [(0, 0.0, False)]
+    while stack:
+        index, gain, undo = stack.pop()
+        if undo:
+            option = options[index]
+            chosen.pop()
+            for other in clashes[index]:
+                blocked[other] -= 1
+            week_hours[option["week"]] -= option["hours"]
+            period_gross[option["period"]] -= option["grossCents"]
+            stack.append((index + 1, gain, False))
+            continue
+
+        if nodes >= max_nodes:
+            limit_reached = True
+            break
+        nodes += 1
+        if gain > best["gain"] + 1e-9:
+            best["gain"] = gain
+            best["chosen"] = list(chosen)
+        if index == count or gain + remaining_gross[index] <= best["gain"] + 1e-9:
+            continue
+
+        option = options[index]
+        week = option["week"]
+        if not blocked[index] and week_hours.get(week, 0) + option["hours"] <= max_weekly_hundredths:
+            key = option["period"]
+            old_gross = period_gross[key]
+            new_gross = old_gross + option["grossCents"]
+            delta = tax_table.net_pay(key, new_gross) - tax_table.net_pay(key, old_gross)
+
+            period_gross[key] = new_gross
+            week_hours[week] = week_hours.get(week, 0) + option["hours"]
+            for other in clashes[index]:
+                blocked[other] += 1
+            chosen.append(index)
+
+            # Accept first, then come back to decline
+            stack.append((index, gain, True))
+            stack.append((index + 1, gain + delta, False))
+        else:
+            stack.append((index + 1, gain, False))
+
+    chosen_set = set(best["chosen"])
+    accepted = [options[index] for index in sorted(chosen_set, key=lambda i: options[i]["interval"])]
+    final_gross = dict(base_gross)
+    for option in accepted:
+        final_gross[option["period"]] += option["grossCents"]
+    gross_gain = sum(option["grossCents"] for option in accepted) / 100
+    net_gain = sum(tax_table.net_pay(key, final_gross[key]) - tax_table.net_pay(key, base_gross[key])
+                   for key in periods)
+
+    return {
+        "accepted": [option["shift"] for option in accepted],
+        "declined": [option["shift"] for index, option in enumerate(options) if index not in chosen_set],
+        "rejected": rejected,
+        "grossGain": round(gross_gain, 2),
+        "taxIncrease": round(gross_gain - net_gain, 2),
+        "netGain": round(net_gain, 2),
+        "optimal": not limit_reached,
+        "nodes": nodes
+    }
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Choose which offered shifts to accept for the most net pay.")
+    parser.add_argument("candidates", help="JSON file of offered shifts, in the shifts.json format")
+    parser.add_argument("--max-weekly-hours", type=float, default=DEFAULT_MAX_WEEKLY_HOURS,
+                        help=f"Most hours worked per week (default {DEFAULT_MAX_WEEKLY_HOURS:g})")
+    parser.add_argument("--min-rest-hours", type=float, default=DEFAULT_MIN_REST_HOURS,
+                        help=f"Least rest between shifts (default {DEFAULT_MIN_REST_HOURS:g})")
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES,
+                        help=f"Most search branches to explore (default {DEFAULT_MAX_NODES})")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    roster = load_json_file(SHIFTS_FILE)["shifts"]
+    candidates = load_json_file(args.candidates)["shifts"]
+    user_data = load_json_file(USER_FILE)
+    config_data = load_json_file(CONFIG_FILE)
+
+    try:
+        result = optimize_shift_offers(roster, candidates, user_data, config_data,
+                                       args.max_weekly_hours, args.min_rest_hours, args.max_nodes)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    for shift in result["accepted"]:
+        print(f"Accept {shift['date']} {shift['start']}-{shift['end']} at {shift['employer']}: "
+              f"${shift['totalGrossPay']:.2f} gross")
+    for shift in result["declined"]:
+        print(f"Decline {shift['date']} {shift['start']}-{shift['end']} at {shift['employer']}")
+    for rejection in result["rejected"]:
+        shift = rejection["shift"]
+        print(f"Can't take {shift.get('date')} {shift.get('start')}-{shift.get('end')}: {rejection['reason']}")
+
+    print(f"Net gain ${result['netGain']:.2f} (gross ${result['grossGain']:.2f}, "
+          f"extra tax ${result['taxIncrease']:.2f})"
+          f"{'' if result['optimal'] else ' - search limit reached, may not be optimal'}")
+
+if __name__ == "__main__":
+    main()
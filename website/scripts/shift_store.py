@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Binary Shift Store
+
+This utility keeps computed shift pay in a fixed-width binary file, so large
+shift histories can be loaded without parsing shiftspay.json. The file is
+memory-mapped and read as a zero-copy NumPy structured array, and the period
+aggregation works on that array directly, without building a Python object
+per shift.
+
+File layout:
+- 8 byte magic, then a little-endian uint32 header length
+- a JSON header with the employer IDs, pay categories and allowances the
+  records refer to by index, padded to a multiple of 8 bytes
+- fixed-width little-endian records, one per shift:
+    date          int32    date ordinal
+    start, end    int16    minutes after midnight of the shift date (end may pass 1440)
+    employer      uint16   index into the header's employers
+    flags         uint16   bit 0: public holiday
+    hoursWorked   int32    hundredths of an hour
+    grossPay, allowanceTotal, totalGrossPay             int64 cents
+    categoryHours int32[n] hundredths of an hour, one per header category
+    categoryPay   int64[n] cents, one per header category
+    allowancePay  int64[m] cents, one per header allowance
+
+Writes only ever append records. The header is fixed when the file is
+created, so appending a shift with an employer, category or allowance the
+header doesn't list raises ValueError and the store has to be rebuilt.
+A partly written record at the end of the file (from an interrupted append)
+is ignored when reading.
+
+NumPy is only needed to read the store; writing uses the struct module. It
+is an optional dependency of the scripts (pip install numpy):
+calculate_pay_periods.py --binary-store stops with a message if it's
+missing, and no other option imports this module.
+
+Usage:
+    python shift_store.py build [--shiftspay FILE] [--output PATH]
+    python shift_store.py info [--output PATH]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from shift_units import MINUTES_PER_DAY, parse_minutes, to_hundredths
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Paths to data files
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+SHIFTSPAY_FILE = os.path.join(DATA_DIR, "shiftspay.json")
+SHIFT_STORE_FILE = os.path.join(DATA_DIR, "shiftspay.bin")
+
+MAGIC = b"CFSHIFT1"
+STORE_FORMAT_VERSION = 1
+HEADER_ALIGNMENT = 8
+PUBLIC_HOLIDAY_FLAG = 1
+
+# Fixed fields of a record: (name, struct code, NumPy type)
+BASE_FIELDS: List[Tuple[str, str, str]] = [
+    ("date", "i", "<i4"),
+    ("start", "h", "<i2"),
+    ("end", "h", "<i2"),
+    ("employer", "H", "<u2"),
+    ("flags", "H", "<u2"),
+    ("hoursWorked", "i", "<i4"),
+    ("grossPay", "q", "<i8"),
+    ("allowanceTotal", "q", "<i8"),
+    ("totalGrossPay", "q", "<i8"),
+]
+
+def get_record_format(header: Dict) -> str:
+    """Return the struct format of one record for a header."""
+    categories = len(header["categories"])
+    allowances = len(header["allowances"])
+    return ("<" + "".join(code for _, code, _ in BASE_FIELDS)
+            + "i" * categories + "q" * categories + "q" * allowances)
+
+def get_record_dtype(header: Dict) -> "np.dtype":
+    """Return the NumPy structured dtype of one record for a header."""
+    if np is None:
+        raise ImportError("Reading the binary shift store requires NumPy (pip install numpy)")
+
+    fields: List[Tuple[Any, ...]] = [(name, dtype) for name, _, dtype in BASE_FIELDS]
+    categories = len(header["categories"])
+    allowances = len(header["allowances"])
+    # Zero-width subarrays aren't portable, so fields without entries are left out
+    if categories:
+        fields.append(("categoryHours", "<i4", (categories,)))
+        fields.append(("categoryPay", "<i8", (categories,)))
+    if allowances:
+        fields.append(("allowancePay", "<i8", (allowances,)))
+    return np.dtype(fields)
+
+def build_header(shifts: List[Dict], categories: Optional[List[str]] = None) -> Dict:
+    """
+    Build a header listing the employers, categories and allowances of some shifts.
+
+    Pass every category of the award (the keys of config["timeCategories"])
+    so later appends can use categories the first shifts didn't.
+    """
+    employers: List[str] = []
+    categories = list(categories or [])
+    allowances: Dict[str, Dict] = {}
+    for shift in shifts:
+        if shift["employerId"] not in employers:
+            employers.append(shift["employerId"])
+        for category in shift.get("payCategories", []):
+            if category["category"] not in categories:
+                categories.append(category["category"])
+        for allowance in shift.get("allowances", []):
+            allowances.setdefault(allowance["name"], {
+                "name": allowance["name"],
+                "type": allowance.get("type", ""),
+                "notes": allowance.get("notes", "")
+            })
+
+    return {
+        "version": STORE_FORMAT_VERSION,
+        "employers": employers,
+        "categories": categories,
+        "allowances": list(allowances.values())
+    }
+
+def encode_header(header: Dict) -> bytes:
+    """Encode the magic, header length and padded JSON header."""
+    header = dict(header, recordSize=struct.calcsize(get_record_format(header)))
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix_size = len(MAGIC) + 4
+    padding = -(prefix_size + len(encoded)) % HEADER_ALIGNMENT
+    encoded += b" " * padding
+    return MAGIC + struct.pack("<I", len(encoded)) + encoded
+
+def read_header(f) -> Tuple[Dict, int]:
+    """Read the header of an open store file, returning it and the offset of the first record."""
+    magic = f.read(len(MAGIC))
+    if magic != MAGIC:
+        raise ValueError("Not a binary shift store")
+    (header_size,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(header_size))
+    if header.get("version") != STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported shift store version {header.get('version')}")
+    return header, len(MAGIC) + 4 + header_size
+
+def pack_shift(shift: Dict, header: Dict, record_struct: struct.Struct) -> bytes:
+    """Pack one computed shift into a record."""
+    try:
+        employer = header["employers"].index(shift["employerId"])
+        category_hours = [0] * len(header["categories"])
+        category_pay = [0] * len(header["categories"])
+        for category in shift.get("payCategories", []):
+            position = header["categories"].index(category["category"])
+            category_hours[position] += to_hundredths(category["hours"])
+            category_pay[position] += to_hundredths(category["hours"] * category["rate"])
+
+        allowance_names = [allowance["name"] for allowance in header["allowances"]]
+        allowance_pay = [0] * len(allowance_names)
+        for allowance in shift.get("allowances", []):
+            allowance_pay[allowance_names.index(allowance["name"])] += to_hundredths(allowance["amount"])
+    except ValueError:
+        raise ValueError(f"Shift on {shift['date']} for {shift['employerId']} uses an employer, "
+                         f"category or allowance not in the store header; rebuild the store")
+
+    start = parse_minutes(shift["start"])
+    end = parse_minutes(shift["end"])
+    if end < start:
+        end += MINUTES_PER_DAY
+
+    return record_struct.pack(
+        date.fromisoformat(shift["date"]).toordinal(),
+        start,
+        end,
+        employer,
+        PUBLIC_HOLIDAY_FLAG if shift.get("isPublicHoliday") else 0,
+        to_hundredths(shift["hoursWorked"]),
+        to_hundredths(shift["grossPay"]),
+        to_hundredths(shift.get("allowanceTotal", 0)),
+        to_hundredths(shift["totalGrossPay"]),
+        *category_hours,
+        *category_pay,
+        *allowance_pay
+    )
+
+def append_shifts(file_path: str, shifts: List[Dict]) -> int:
+    """
+    Append computed shifts to an existing store.
+
+    Returns:
+        The number of records appended
+    """
+    with open(file_path, 'rb') as f:
+        header, data_offset = read_header(f)
+        record_size = header["recordSize"]
+        # Drop a partly written record left by an interrupted append
+        f.seek(0, os.SEEK_END)
+        complete_size = data_offset + (f.tell() - data_offset) // record_size * record_size
+
+    record_struct = struct.Struct(get_record_format(header))
+    records = b"".join(pack_shift(shift, header, record_struct) for shift in shifts)
+
+    with open(file_path, 'r+b') as f:
+        f.truncate(complete_size)
+        f.seek(complete_size)
+        f.write(records)
+
+    return len(shifts)
+
+def write_shift_store(file_path: str, shifts: List[Dict], categories: Optional[List[str]] = None) -> None:
+    """Create a store holding the given computed shifts, replacing any existing file."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial store
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(encode_header(build_header(shifts, categories)))
+    append_shifts(temp_path, shifts)
+    os.replace(temp_path, file_path)
+
+class ShiftStore:
+    """A binary shift store opened read-only through mmap."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self.header, data_offset = read_header(f)
+            dtype = get_record_dtype(self.header)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        count = (len(self._mmap) - data_offset) // dtype.itemsize
+        # A view onto the mapped file: no records are copied
+        self.records = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=data_offset)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def close(self) -> None:
+        # The array must be released before the mapping can be closed
+        self.records = None
+        self._mmap.close()
+
+    def __enter__(self) -> "ShiftStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def get_date_ranges(self) -> Dict:
+        """
+        Return the first and last shift of each employer as a minimal shiftspay structure.
+
+        This is all create_pay_periods needs to lay out the pay periods.
+        """
+        shifts = []
+        for index, employer_id in enumerate(self.header["employers"]):
+            dates = self.records["date"][self.records["employer"] == index]
+            if len(dates):
+                for ordinal in (dates.min(), dates.max()):
+                    shifts.append({"employerId": employer_id, "date": date.fromordinal(int(ordinal)).isoformat()})
+        return {"shifts": shifts}
+
+def cumulative(values: "np.ndarray") -> "np.ndarray":
+    """Return prefix sums along the first axis with a leading zero row."""
+    zeros = np.zeros((1,) + values.shape[1:], dtype=np.int64)
+    return np.concatenate((zeros, np.cumsum(values, axis=0, dtype=np.int64)))
+
+def aggregate_store_periods(store: ShiftStore, payperiods_data: Dict,
+                            user_data: Dict) -> Dict[str, List[Optional[float]]]:
+    """
+    Sum the stored shifts that fall within each pay period.
+
+    This sets the same period fields as aggregate_pay_periods in
+    calculate_pay_periods.py, using prefix sums over each employer's
+    date-sorted records. Period allowances are listed in the order of the
+    store header.
+
+    Returns:
+        The total gross amount of each period, by employer ID, in the same
+        order as the periods (None where the employer is unknown)
+    """
+    header = store.header
+    records = store.records
+    known_employers = {employer["id"] for employer in user_data["employers"]}
+    gross_amounts = {}
+
+    for employer_data in payperiods_data["payPeriods"]:
+        employer_id = employer_data["employerId"]
+        periods = employer_data["periods"]
+
+        if employer_id in header["employers"]:
+            employer_records = records[records["employer"] == header["employers"].index(employer_id)]
+            employer_records = employer_records[np.argsort(employer_records["date"], kind="stable")]
+        else:
+            employer_records = records[:0]
+
+        dates = employer_records["date"]
+        sums = {
+            field: cumulative(employer_records[field])
+            for field in ("hoursWorked", "grossPay", "allowanceTotal")
+        }
+        if header["categories"]:
+            sums["categoryHours"] = cumulative(employer_records["categoryHours"])
+        if header["allowances"]:
+            sums["allowancePay"] = cumulative(employer_records["allowancePay"])
+
+        # Locate every period's records at once
+        starts = np.array([date.fromisoformat(period["startDate"]).toordinal() for period in periods], dtype=np.int32)
+        ends = np.array([date.fromisoformat(period["endDate"]).toordinal() for period in periods], dtype=np.int32)
+        lows = np.searchsorted(dates, starts, side="left")
+        highs = np.searchsorted(dates, ends, side="right")
+
+        employer_amounts: List[Optional[float]] = []
+        for period, low, high in zip(periods, lows.tolist(), highs.tolist()):
+            period["shifts"] = [date.fromordinal(ordinal).isoformat() for ordinal in dates[low:high].tolist()]
+
+            category_hours = {}
+            if header["categories"]:
+                hours = (sums["categoryHours"][high] - sums["categoryHours"][low]).tolist()
+                category_hours = dict(zip(header["categories"], hours))
+            for category in period["payCategories"]:
+                category["hours"] = category_hours.get(category["category"], 0) / 100
+
+            if employer_id not in known_employers:
+                employer_amounts.append(None)
+                continue
+
+            total_hours, gross_pay, allowance_total = (
+                int(sums[field][high] - sums[field][low])
+                for field in ("hoursWorked", "grossPay", "allowanceTotal")
+            )
+
+            period["allowances"] = []
+            if header["allowances"]:
+                amounts = (sums["allowancePay"][high] - sums["allowancePay"][low]).tolist()
+                period["allowances"] = [
+                    {"name": allowance["name"], "amount": amount / 100,
+                     "type": allowance["type"], "notes": allowance["notes"]}
+                    for allowance, amount in zip(header["allowances"], amounts) if amount
+                ]
+
+            period["totalHours"] = total_hours / 100
+            period["grossPay"] = gross_pay / 100
+            period["allowanceTotal"] = allowance_total / 100
+            period["totalGrossPay"] = (gross_pay + allowance_total) / 100
+            employer_amounts.append((gross_pay + allowance_total) / 100)
+
+        gross_amounts[employer_id] = employer_amounts
+
+    return gross_amounts
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Build or inspect the binary shift store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build the store from shiftspay.json")
+    build_parser.add_argument("--shiftspay", default=SHIFTSPAY_FILE, help="Computed shifts to store")
+    build_parser.add_argument("--output", default=SHIFT_STORE_FILE, help="Store file to write")
+
+    info_parser = subparsers.add_parser("info", help="Describe a store")
+    info_parser.add_argument("--output", default=SHIFT_STORE_FILE, help="Store file to read")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if args.command == "build":
+        with open(args.shiftspay, 'r') as f:
+            shifts = json.load(f)["shifts"]
+        write_shift_store(args.output, shifts)
+        print(f"Saved {len(shifts)} shifts to {args.output}")
+    else:
+        with ShiftStore(args.output) as store:
+            print(f"{args.output}: {len(store)} shifts of {store.header['recordSize']} bytes")
+            print(f"  Employers: {', '.join(store.header['employers'])}")
+            print(f"  Categories: {', '.join(store.header['categories'])}")
+            print(f"  Allowances: {', '.join(allowance['name'] for allowance in store.header['allowances'])}")
+
+if __name__ == "__main__":
+    main()
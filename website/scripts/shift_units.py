@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Shift Units
+
+This utility holds the conversions the pay scripts share: times of day as
+minutes after midnight, shifts as intervals of absolute minutes, and money
+and hours as whole hundredths so running totals don't drift.
+"""
+
+from datetime import date
+from typing import Dict, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+
+def to_hundredths(value: float) -> int:
+    """Convert dollars to cents, or hours to hundredths of an hour."""
+    return round(value * 100)
+
+def parse_minutes(time_str: str) -> int:
+    """Parse HH:MM into minutes after midnight, raising ValueError if invalid."""
+    hours, separator, minutes = time_str.partition(":")
+    if not separator or not hours.isdigit() or not minutes.isdigit() or len(minutes) != 2:
+        raise ValueError(f"invalid time {time_str!r}")
+    hour, minute = int(hours), int(minutes)
+    if hour > 23 or minute > 59:
+        raise ValueError(f"invalid time {time_str!r}")
+    return hour * 60 + minute
+
+def get_shift_interval(shift: Dict) -> Tuple[int, int]:
+    """Return a shift's start and end in absolute minutes, ending the next day if end < start."""
+    day_start = date.fromisoformat(shift["date"]).toordinal() * MINUTES_PER_DAY
+    start_minute = parse_minutes(shift["start"])
+    end_minute = parse_minutes(shift["end"])
+    if end_minute < start_minute:
+        end_minute += MINUTES_PER_DAY
+    return day_start + start_minute, day_start + end_minute
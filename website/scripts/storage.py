@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+SQLite Storage
+
+This utility keeps shifts, computed shift pay, pay periods and employers in a
+local SQLite database instead of rewriting the JSON data files on every run.
+
+Tables:
+- user: the user record from user.json, without the employer list
+- employers: one row per employer, keyed by id
+- shifts: one row per shift, keyed by (employer_id, date, start, end)
+- shift_pay: one row per computed shift, keyed like shifts
+- pay_periods: one row per pay period, keyed by (employer_id, start_date)
+
+Shifts and shift pay are indexed by (employer_id, date) and by date, and pay
+periods by pay date, so date-range queries don't scan the whole history.
+Each record is stored as JSON alongside its key columns. Writes compare the
+new records with the stored ones and only upsert or delete rows that changed,
+in one transaction per batch.
+
+The export command writes the database back out in the JSON shapes the web
+app reads (shifts.json, shiftspay.json, payperiods.json and user.json).
+
+Usage:
+    python storage.py import --db pay.db [--data-dir DIR] [--shifts FILE] [--user FILE]
+    python storage.py export --db pay.db [--data-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "src", "api", "data")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS employers (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shifts (
+    employer_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (employer_id, date, start, end)
+);
+CREATE INDEX IF NOT EXISTS shifts_date ON shifts (date);
+CREATE TABLE IF NOT EXISTS shift_pay (
+    employer_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (employer_id, date, start, end)
+);
+CREATE INDEX IF NOT EXISTS shift_pay_date ON shift_pay (date);
+CREATE TABLE IF NOT EXISTS pay_periods (
+    employer_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    pay_date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (employer_id, start_date)
+);
+CREATE INDEX IF NOT EXISTS pay_periods_pay_date ON pay_periods (pay_date);
+"""
+
+# Key columns for the tables that hold shift records
+SHIFT_TABLES = ("shifts", "shift_pay")
+
+# Bumped when the schema changes; version 2 added end to the shift keys
+SCHEMA_VERSION = 2
+
+def encode(record: Dict) -> str:
+    """Encode a record as compact JSON for storage and comparison."""
+    return json.dumps(record, separators=(",", ":"))
+
+def shift_key(shift: Dict) -> Tuple[str, str, str, str]:
+    """
+    Return the stable (employerId, date, start, end) key of a shift.
+
+    The end is part of the key because two shifts for an employer can start
+    together and end at different times (roster validation only reports them
+    as an overlap), and both must be kept.
+    """
+    return (shift["employerId"], shift["date"], shift["start"], shift["end"])
+
+class PayStore:
+    """SQLite store for shifts, shift pay, pay periods and employers."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate(self) -> None:
+        """Rebuild shift tables from before schema version 2 with end in their key."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= 2:
+            return
+
+        old_tables = []
+        for table in SHIFT_TABLES:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if columns and "end" not in columns:
+                old_tables.append(table)
+        if not old_tables:
+            return
+
+        # Rename the old tables, create the new ones and copy the rows across in one transaction
+        script = ["BEGIN;"]
+        for table in old_tables:
+            script.append(f"ALTER TABLE {table} RENAME TO {table}_v1; DROP INDEX IF EXISTS {table}_date;")
+        script.append(SCHEMA)
+        for table in old_tables:
+            script.append(
+                f"INSERT INTO {table} (employer_id, date, start, end, position, data) "
+                f"SELECT employer_id, date, start, json_extract(data, '$.end'), position, data FROM {table}_v1; "
+                f"DROP TABLE {table}_v1;"
+            )
+        script.append("COMMIT;")
+        self.conn.executescript("\n".join(script))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PayStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Shifts and shift pay
+
+    def _sync_shift_table(self, table: str, shifts: List[Dict], delete_missing: bool) -> Dict[str, int]:
+        """Upsert changed shift rows and optionally delete rows not in the list."""
+        if table not in SHIFT_TABLES:
+            raise ValueError(f"Not a shift table: {table}")
+
+        existing = {
+            (employer_id, date, start, end): (position, data)
+            for employer_id, date, start, end, position, data in self.conn.execute(
+                f"SELECT employer_id, date, start, end, position, data FROM {table}"
+            )
+        }
+
+        # A full sync orders rows like the list; a partial upsert keeps existing
+        # rows in place and appends new ones after them
+        next_position = max((position for position, _ in existing.values()), default=-1) + 1
+
+        changed = []
+        seen = set()
+        for index, shift in enumerate(shifts):
+            key = shift_key(shift)
+            seen.add(key)
+            if delete_missing:
+                position = index
+            elif key in existing:
+                position = existing[key][0]
+            else:
+                position = next_position
+                next_position += 1
+            row = (position, encode(shift))
+            if existing.get(key) != row:
+                changed.append(key + row)
+
+        removed = [key for key in existing if key not in seen] if delete_missing else []
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {table} (employer_id, date, start, end, position, data) VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT (employer_id, date, start, end) DO UPDATE SET "
+                f"position = excluded.position, data = excluded.data",
+                changed
+            )
+            self.conn.executemany(
+                f"DELETE FROM {table} WHERE employer_id = ? AND date = ? AND start = ? AND end = ?",
+                removed
+            )
+
+        return {"upserted": len(changed), "deleted": len(removed)}
+
+    def _query_shift_table(self, table: str, employer_id: Optional[str],
+                           start_date: Optional[str], end_date: Optional[str]) -> List[Dict]:
+        """Return shift rows for an optional employer and inclusive date range."""
+        conditions = []
+        params: List[str] = []
+        if employer_id is not None:
+            conditions.append("employer_id = ?")
+            params.append(employer_id)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("date <= ?")
+            params.append(end_date)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.conn.execute(f"SELECT data FROM {table} {where} ORDER BY position", params)
+        return [json.loads(data) for (data,) in rows]
+
+    def sync_shifts(self, shifts: List[Dict]) -> Dict[str, int]:
+        """Make the stored shifts match the list, writing only changed rows."""
+        return self._sync_shift_table("shifts", shifts, delete_missing=True)
+
+    def upsert_shifts(self, shifts: List[Dict]) -> Dict[str, int]:
+        """Insert or update shifts without touching any others."""
+        return self._sync_shift_table("shifts", shifts, delete_missing=False)
+
+    def get_shifts(self, employer_id: Optional[str] = None, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> List[Dict]:
+        """Return stored shifts, optionally for one employer and date range."""
+        return self._query_shift_table("shifts", employer_id, start_date, end_date)
+
+    def sync_shift_pay(self, shifts: List[Dict]) -> Dict[str, int]:
+        """Make the stored shift pay match the list, writing only changed rows."""
+        return self._sync_shift_table("shift_pay", shifts, delete_missing=True)
+
+    def get_shift_pay(self, employer_id: Optional[str] = None, start_date: Optional[str] = None,
+                      end_date: Optional[str] = None) -> List[Dict]:
+        """Return computed shift pay, optionally for one employer and date range."""
+        return self._query_shift_table("shift_pay", employer_id, start_date, end_date)
+
+    # Pay periods
+
+    def sync_pay_periods(self, payperiods_data: Dict) -> Dict[str, int]:
+        """Make the stored pay periods match payperiods_data, writing only changed rows."""
+        existing = {
+            (employer_id, start_date): data
+            for employer_id, start_date, data in self.conn.execute(
+                "SELECT employer_id, start_date, data FROM pay_periods"
+            )
+        }
+
+        changed = []
+        seen = set()
+        for employer_data in payperiods_data["payPeriods"]:
+            for period in employer_data["periods"]:
+                key = (employer_data["employerId"], period["startDate"])
+                seen.add(key)
+                data = encode(period)
+                if existing.get(key) != data:
+                    changed.append(key + (period["endDate"], period["payDate"], data))
+
+        removed = [key for key in existing if key not in seen]
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO pay_periods (employer_id, start_date, end_date, pay_date, data) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (employer_id, start_date) DO UPDATE SET "
+                "end_date = excluded.end_date, pay_date = excluded.pay_date, data = excluded.data",
+                changed
+            )
+            self.conn.executemany(
+                "DELETE FROM pay_periods WHERE employer_id = ? AND start_date = ?",
+                removed
+            )
+
+        return {"upserted": len(changed), "deleted": len(removed)}
+
+    def get_pay_periods(self, employer_id: Optional[str] = None, start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> List[Dict]:
+        """Return pay periods, optionally for one employer and paid within a date range."""
+        conditions = []
+        params: List[str] = []
+        if employer_id is not None:
+            conditions.append("employer_id = ?")
+            params.append(employer_id)
+        if start_date is not None:
+            conditions.append("pay_date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("pay_date <= ?")
+            params.append(end_date)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.conn.execute(
+            f"SELECT data FROM pay_periods {where} ORDER BY employer_id, start_date", params
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def get_payperiods_data(self) -> Dict:
+        """Return all pay periods in the payperiods.json shape."""
+        periods_by_employer: Dict[str, List[Dict]] = {}
+        for employer_id, data in self.conn.execute(
+            "SELECT employer_id, data FROM pay_periods ORDER BY start_date"
+        ):
+            periods_by_employer.setdefault(employer_id, []).append(json.loads(data))
+
+        return {
+            "payPeriods": [
+                {
+                    "employerId": employer["id"],
+                    "employer": employer["name"],
+                    "periods": periods_by_employer.get(employer["id"], [])
+                }
+                for employer in self._get_employers()
+            ]
+        }
+
+    # User and employers
+
+    def _get_employers(self) -> List[Dict]:
+        return [json.loads(data) for (data,) in
+                self.conn.execute("SELECT data FROM employers ORDER BY position")]
+
+    def has_user(self) -> bool:
+        """Return whether a user record has been stored."""
+        return self.conn.execute("SELECT 1 FROM user").fetchone() is not None
+
+    def sync_user(self, user_data: Dict) -> Dict[str, int]:
+        """Store the user record and its employers, writing only changed rows."""
+        user_record = {key: value for key, value in user_data.items() if key != "employers"}
+        existing = {
+            employer_id: (position, data)
+            for employer_id, position, data in self.conn.execute(
+                "SELECT id, position, data FROM employers"
+            )
+        }
+
+        changed = []
+        seen = set()
+        for position, employer in enumerate(user_data.get("employers", [])):
+            seen.add(employer["id"])
+            row = (position, encode(employer))
+            if existing.get(employer["id"]) != row:
+                changed.append((employer["id"],) + row)
+
+        removed = [(employer_id,) for employer_id in existing if employer_id not in seen]
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO user (id, data) VALUES (1, ?) "
+                "ON CONFLICT (id) DO UPDATE SET data = excluded.data WHERE user.data != excluded.data",
+                (encode(user_record),)
+            )
+            self.conn.executemany(
+                "INSERT INTO employers (id, position, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET position = excluded.position, data = excluded.data",
+                changed
+            )
+            self.conn.executemany("DELETE FROM employers WHERE id = ?", removed)
+
+        return {"upserted": len(changed), "deleted": len(removed)}
+
+    def get_user(self) -> Dict:
+        """Return the user record with its employers in the user.json shape."""
+        row = self.conn.execute("SELECT data FROM user").fetchone()
+        if row is None:
+            raise ValueError(f"No user stored in {self.db_path}")
+
+        user_data = json.loads(row[0])
+        user_data["employers"] = self._get_employers()
+        return user_data
+
+    # JSON import and export
+
+    def import_json(self, shifts_file: str, user_file: str,
+                    shiftspay_file: Optional[str] = None,
+                    payperiods_file: Optional[str] = None) -> None:
+        """Load the JSON data files into the database."""
+        self.sync_user(load_json_file(user_file))
+        self.sync_shifts(load_json_file(shifts_file)["shifts"])
+        if shiftspay_file and os.path.exists(shiftspay_file):
+            self.sync_shift_pay(load_json_file(shiftspay_file)["shifts"])
+        if payperiods_file and os.path.exists(payperiods_file):
+            self.sync_pay_periods(load_json_file(payperiods_file))
+
+    def export_json(self, data_dir: str) -> List[str]:
+        """
+        Write the database out as the JSON files the web app reads.
+
+        Returns:
+            The paths written
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        outputs = [
+            ("shifts.json", {"shifts": self.get_shifts()}, 4),
+            ("shiftspay.json", {"shifts": self.get_shift_pay()}, 4),
+            ("payperiods.json", self.get_payperiods_data(), 2),
+            ("user.json", self.get_user(), 2),
+        ]
+
+        written = []
+        for file_name, data, indent in outputs:
+            file_path = os.path.join(data_dir, file_name)
+            with open(file_path, 'w') as f:
+                json.dump(data, f, indent=indent)
+            written.append(file_path)
+        return written
+
+def load_json_file(file_path: str) -> Dict:
+    """Load and parse a JSON file."""
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+def open_store(db_path: str, shifts_file: str, user_file: str) -> PayStore:
+    """
+    Open a store, importing the JSON shifts and user data if it is empty.
+
+    This lets the scripts switch to a database without a separate import step.
+    """
+    store = PayStore(db_path)
+    if not store.has_user():
+        print(f"Importing {shifts_file} and {user_file} into {db_path}")
+        store.import_json(shifts_file, user_file)
+    return store
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Import or export the SQLite pay store.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("--db", required=True, help="SQLite database file")
+    parser.add_argument("--data-dir", default=DATA_DIR, help=f"JSON data directory (default {DATA_DIR})")
+    parser.add_argument("--shifts", default="shifts.json", help="Shifts file name for import")
+    parser.add_argument("--user", default="user.json", help="User file name for import")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    """Import JSON data into the store or export it back to JSON."""
+    args = parse_args(argv)
+
+    with PayStore(args.db) as store:
+        if args.command == "import":
+            store.import_json(
+                os.path.join(args.data_dir, args.shifts),
+                os.path.join(args.data_dir, args.user),
+                os.path.join(args.data_dir, "shiftspay.json"),
+                os.path.join(args.data_dir, "payperiods.json"),
+            )
+            print(f"Imported {args.data_dir} into {args.db}")
+        else:
+            for file_path in store.export_json(args.data_dir):
+                print(f"Exported {file_path}")
+
+if __name__ == "__main__":
+    main()
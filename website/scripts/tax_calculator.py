@@ -9,7 +9,8 @@ Reference: https://www.ato.gov.au/tax-rates-and-codes/payg-withholding-schedule-
 """
 
 import math
-from typing import Dict, List, Literal, TypedDict, Union
+from bisect import bisect_right
+from typing import Dict, List, Literal, Optional, TypedDict, Union
 
 # Type definitions
 class TaxCoefficients(TypedDict):
@@ -50,12 +51,76 @@ TAX_FREE_THRESHOLD_BRACKETS: List[TaxBracket] = [
     {"upperLimit": float('inf'), "coefficients": {"a": 0.4700, "b": 650.6154}},
 ]
 
+# Scales in force from 13 October 2020 until the 2024-25 changes
+NO_TAX_FREE_THRESHOLD_BRACKETS_2020: List[TaxBracket] = [
+    {"upperLimit": 88, "coefficients": {"a": 0.1900, "b": 0.1900}},
+    {"upperLimit": 371, "coefficients": {"a": 0.2348, "b": 3.9639}},
+    {"upperLimit": 515, "coefficients": {"a": 0.2190, "b": -1.9003}},
+    {"upperLimit": 932, "coefficients": {"a": 0.3477, "b": 64.4297}},
+    {"upperLimit": 1957, "coefficients": {"a": 0.3450, "b": 61.9132}},
+    {"upperLimit": 3111, "coefficients": {"a": 0.3900, "b": 150.0093}},
+    {"upperLimit": float('inf'), "coefficients": {"a": 0.4700, "b": 398.9324}},
+]
+
+TAX_FREE_THRESHOLD_BRACKETS_2020: List[TaxBracket] = [
+    {"upperLimit": 359, "coefficients": {"a": 0, "b": 0}},
+    {"upperLimit": 438, "coefficients": {"a": 0.1900, "b": 68.3462}},
+    {"upperLimit": 548, "coefficients": {"a": 0.2900, "b": 112.1942}},
+    {"upperLimit": 721, "coefficients": {"a": 0.2100, "b": 68.3465}},
+    {"upperLimit": 865, "coefficients": {"a": 0.2190, "b": 74.8369}},
+    {"upperLimit": 1282, "coefficients": {"a": 0.3477, "b": 186.2119}},
+    {"upperLimit": 2307, "coefficients": {"a": 0.3450, "b": 182.7504}},
+    {"upperLimit": 3461, "coefficients": {"a": 0.3900, "b": 286.5965}},
+    {"upperLimit": float('inf'), "coefficients": {"a": 0.4700, "b": 563.5196}},
+]
+
+class TaxScaleVersion(TypedDict):
+    """Tax brackets in force from an effective date"""
+    effectiveDate: str
+    taxFreeThreshold: List[TaxBracket]
+    noTaxFreeThreshold: List[TaxBracket]
+
+# Tax scale versions, sorted by the date they take effect
+TAX_SCALE_VERSIONS: List[TaxScaleVersion] = [
+    {
+        "effectiveDate": "2020-10-13",
+        "taxFreeThreshold": TAX_FREE_THRESHOLD_BRACKETS_2020,
+        "noTaxFreeThreshold": NO_TAX_FREE_THRESHOLD_BRACKETS_2020,
+    },
+    {
+        "effectiveDate": "2024-07-01",
+        "taxFreeThreshold": TAX_FREE_THRESHOLD_BRACKETS,
+        "noTaxFreeThreshold": NO_TAX_FREE_THRESHOLD_BRACKETS,
+    },
+]
+
+TAX_SCALE_DATES = [version["effectiveDate"] for version in TAX_SCALE_VERSIONS]
+
 # Tax rates for employees who didn't provide a TFN
 NO_TFN_TAX_RATES = {
     "resident": 0.4700,
     "foreignResident": 0.4500,
 }
 
+def get_tax_brackets(claims_tax_free_threshold: bool = True, as_of: Optional[str] = None) -> List[TaxBracket]:
+    """
+    Get the tax brackets in force on a date
+    
+    Args:
+        claims_tax_free_threshold: Whether the employee claims the tax-free threshold
+        as_of: The payment date (YYYY-MM-DD), or None for the current scales
+    
+    Returns:
+        The tax brackets for the applicable scale
+    """
+    if as_of is None:
+        version = TAX_SCALE_VERSIONS[-1]
+    else:
+        position = bisect_right(TAX_SCALE_DATES, as_of) - 1
+        version = TAX_SCALE_VERSIONS[max(position, 0)]
+    
+    return version["taxFreeThreshold"] if claims_tax_free_threshold else version["noTaxFreeThreshold"]
+
 def calculate_weekly_earnings(weekly_income: float, allowances: float = 0) -> float:
     """
     Calculate the weekly earnings for tax calculation purposes
@@ -83,7 +148,8 @@ def calculate_weekly_tax(
     claims_tax_free_threshold: bool = True,
     has_tfn: bool = True,
     is_foreign_resident: bool = False,
-    tax_offset_amount: float = 0
+    tax_offset_amount: float = 0,
+    as_of: Optional[str] = None
 ) -> float:
     """
     Calculate the weekly tax withholding amount
@@ -94,6 +160,7 @@ def calculate_weekly_tax(
         has_tfn: Whether the employee has provided a Tax File Number
         is_foreign_resident: Whether the employee is a foreign resident
         tax_offset_amount: The amount of tax offset claimed (if any)
+        as_of: The payment date (YYYY-MM-DD) used to pick the tax scale
     
     Returns:
         The weekly tax withholding amount
@@ -104,7 +171,7 @@ def calculate_weekly_tax(
         return math.floor(weekly_earnings * rate * 100) / 100
     
     # Select the appropriate tax brackets based on tax-free threshold claim
-    brackets = TAX_FREE_THRESHOLD_BRACKETS if claims_tax_free_threshold else NO_TAX_FREE_THRESHOLD_BRACKETS
+    brackets = get_tax_brackets(claims_tax_free_threshold, as_of)
     
     # Find the applicable tax bracket
     bracket = next((b for b in brackets if weekly_earnings < b["upperLimit"]), None)
@@ -131,7 +198,8 @@ def calculate_fortnightly_tax(
     claims_tax_free_threshold: bool = True,
     has_tfn: bool = True,
     is_foreign_resident: bool = False,
-    tax_offset_amount: float = 0
+    tax_offset_amount: float = 0,
+    as_of: Optional[str] = None
 ) -> float:
     """
     Calculate the fortnightly tax withholding amount
@@ -142,6 +210,7 @@ def calculate_fortnightly_tax(
         has_tfn: Whether the employee has provided a Tax File Number
         is_foreign_resident: Whether the employee is a foreign resident
         tax_offset_amount: The amount of tax offset claimed (if any)
+        as_of: The payment date (YYYY-MM-DD) used to pick the tax scale
     
     Returns:
         The fortnightly tax withholding amount
@@ -155,7 +224,8 @@ def calculate_fortnightly_tax(
         claims_tax_free_threshold,
         has_tfn,
         is_foreign_resident,
-        tax_offset_amount
+        tax_offset_amount,
+        as_of
     )
     
     # Double the weekly tax to get fortnightly tax
@@ -166,7 +236,8 @@ def calculate_monthly_tax(
     claims_tax_free_threshold: bool = True,
     has_tfn: bool = True,
     is_foreign_resident: bool = False,
-    tax_offset_amount: float = 0
+    tax_offset_amount: float = 0,
+    as_of: Optional[str] = None
 ) -> float:
     """
     Calculate the monthly tax withholding amount
@@ -177,6 +248,7 @@ def calculate_monthly_tax(
         has_tfn: Whether the employee has provided a Tax File Number
         is_foreign_resident: Whether the employee is a foreign resident
         tax_offset_amount: The amount of tax offset claimed (if any)
+        as_of: The payment date (YYYY-MM-DD) used to pick the tax scale
     
     Returns:
         The monthly tax withholding amount
@@ -190,7 +262,8 @@ def calculate_monthly_tax(
         claims_tax_free_threshold,
         has_tfn,
         is_foreign_resident,
-        tax_offset_amount
+        tax_offset_amount,
+        as_of
     )
     
     # Multiply weekly tax by 52 and divide by 12 to get monthly tax
@@ -202,7 +275,8 @@ def calculate_tax(
     claims_tax_free_threshold: bool = True,
     has_tfn: bool = True,
     is_foreign_resident: bool = False,
-    tax_offset_amount: float = 0
+    tax_offset_amount: float = 0,
+    as_of: Optional[str] = None
 ) -> float:
     """
     Calculate the tax for a specific pay period
@@ -214,6 +288,7 @@ def calculate_tax(
         has_tfn: Whether the employee has provided a Tax File Number
         is_foreign_resident: Whether the employee is a foreign resident
         tax_offset_amount: The amount of tax offset claimed (if any)
+        as_of: The payment date (YYYY-MM-DD) used to pick the tax scale
     
     Returns:
         The tax withholding amount for the specified pay period
@@ -224,7 +299,8 @@ def calculate_tax(
             claims_tax_free_threshold,
             has_tfn,
             is_foreign_resident,
-            tax_offset_amount
+            tax_offset_amount,
+            as_of
         )
     elif pay_period == 'fortnightly':
         return calculate_fortnightly_tax(
@@ -232,7 +308,8 @@ def calculate_tax(
             claims_tax_free_threshold,
             has_tfn,
             is_foreign_resident,
-            tax_offset_amount
+            tax_offset_amount,
+            as_of
         )
     elif pay_period == 'monthly':
         return calculate_monthly_tax(
@@ -240,7 +317,8 @@ def calculate_tax(
             claims_tax_free_threshold,
             has_tfn,
             is_foreign_resident,
-            tax_offset_amount
+            tax_offset_amount,
+            as_of
         )
     else:
         raise ValueError(f"Unsupported pay period: {pay_period}")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Tax Reconciliation Utility
+
+This utility reconciles PAYG withholding across all employers for each
+financial year. Each employer withholds tax as if it were the only job, so
+someone with two jobs can end the year owing tax (two tax-free threshold
+claims, or two incomes each taxed in a lower bracket) or due a refund.
+
+In one pass over the pay periods, periods are grouped into financial years by
+pay date and gross pay and withheld tax are totalled across employers. The
+annual liability is estimated from the resident tax rates, the low income tax
+offset and the Medicare levy for that year, and compared with the tax
+withheld. Other offsets, deductions and the Medicare levy surcharge aren't
+modelled, so the result is an estimate.
+
+Reference: https://www.ato.gov.au/tax-rates-and-codes/tax-rates-australian-residents
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Tuple, TypedDict
+
+class ResidentTaxRates(TypedDict):
+    """Annual resident tax rates in force from the start of a financial year"""
+    effectiveDate: str
+    # (threshold, tax on income up to the threshold, marginal rate above it)
+    brackets: List[Tuple[float, float, float]]
+    medicareLowIncomeThreshold: float
+
+# Resident tax rates, sorted by the financial year they take effect
+RESIDENT_TAX_RATES: List[ResidentTaxRates] = [
+    {
+        "effectiveDate": "2020-07-01",
+        "brackets": [(0, 0, 0), (18200, 0, 0.19), (45000, 5092, 0.325),
+                     (120000, 29467, 0.37), (180000, 51667, 0.45)],
+        "medicareLowIncomeThreshold": 23226,
+    },
+    {
+        "effectiveDate": "2021-07-01",
+        "brackets": [(0, 0, 0), (18200, 0, 0.19), (45000, 5092, 0.325),
+                     (120000, 29467, 0.37), (180000, 51667, 0.45)],
+        "medicareLowIncomeThreshold": 23365,
+    },
+    {
+        "effectiveDate": "2022-07-01",
+        "brackets": [(0, 0, 0), (18200, 0, 0.19), (45000, 5092, 0.325),
+                     (120000, 29467, 0.37), (180000, 51667, 0.45)],
+        "medicareLowIncomeThreshold": 24276,
+    },
+    {
+        "effectiveDate": "2023-07-01",
+        "brackets": [(0, 0, 0), (18200, 0, 0.19), (45000, 5092, 0.325),
+                     (120000, 29467, 0.37), (180000, 51667, 0.45)],
+        "medicareLowIncomeThreshold": 26000,
+    },
+    {
+        "effectiveDate": "2024-07-01",
+        "brackets": [(0, 0, 0), (18200, 0, 0.16), (45000, 4288, 0.30),
+                     (135000, 31288, 0.37), (190000, 51638, 0.45)],
+        "medicareLowIncomeThreshold": 27222,
+    },
+]
+
+RESIDENT_TAX_DATES = [rates["effectiveDate"] for rates in RESIDENT_TAX_RATES]
+
+MEDICARE_LEVY_RATE = 0.02
+# Above the low income threshold the levy phases in at 10c per dollar
+MEDICARE_SHADE_IN_RATE = 0.10
+
+# Low income tax offset: the full offset up to the first threshold, then
+# withdrawn at the first rate up to the second threshold and the second rate after
+LITO_MAXIMUM = 700
+LITO_THRESHOLDS = (37500, 45000)
+LITO_WITHDRAWAL_RATES = (0.05, 0.015)
+
+# Differences within this amount count as balanced
+BALANCED_TOLERANCE = 1.00
+
+def get_financial_year(date_str: str) -> int:
+    """Return the year a date's financial year starts in (1 July to 30 June)."""
+    year, month = int(date_str[:4]), int(date_str[5:7])
+    return year if month >= 7 else year - 1
+
+def format_financial_year(start_year: int) -> str:
+    """Format a financial year as e.g. 2024-25."""
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+def get_resident_tax_rates(start_year: int) -> ResidentTaxRates:
+    """Get the resident tax rates for the financial year starting 1 July of start_year."""
+    position = bisect_right(RESIDENT_TAX_DATES, f"{start_year}-07-01") - 1
+    return RESIDENT_TAX_RATES[max(position, 0)]
+
+def calculate_income_tax(taxable_income: float, rates: ResidentTaxRates) -> float:
+    """Calculate annual income tax before offsets and the Medicare levy."""
+    thresholds = [bracket[0] for bracket in rates["brackets"]]
+    threshold, base, rate = rates["brackets"][bisect_right(thresholds, taxable_income) - 1]
+    return base + (taxable_income - threshold) * rate
+
+def calculate_low_income_tax_offset(taxable_income: float) -> float:
+    """Calculate the low income tax offset."""
+    first_threshold, second_threshold = LITO_THRESHOLDS
+    first_rate, second_rate = LITO_WITHDRAWAL_RATES
+
+    offset = LITO_MAXIMUM - max(0, min(taxable_income, second_threshold) - first_threshold) * first_rate
+    offset -= max(0, taxable_income - second_threshold) * second_rate
+    return max(offset, 0)
+
+def calculate_medicare_levy(taxable_income: float, rates: ResidentTaxRates) -> float:
+    """Calculate the Medicare levy, including the phase-in above the low income threshold."""
+    threshold = rates["medicareLowIncomeThreshold"]
+    if taxable_income <= threshold:
+        return 0.0
+    return min(taxable_income * MEDICARE_LEVY_RATE, (taxable_income - threshold) * MEDICARE_SHADE_IN_RATE)
+
+def estimate_annual_tax(taxable_income: float, start_year: int) -> Dict[str, float]:
+    """
+    Estimate the annual tax liability of a resident.
+
+    Args:
+        taxable_income: Gross income for the year
+        start_year: The year the financial year starts in
+
+    Returns:
+        The income tax, low income tax offset, Medicare levy and total
+    """
+    rates = get_resident_tax_rates(start_year)
+    income_tax = calculate_income_tax(taxable_income, rates)
+    # The offset can reduce income tax to nil but not the Medicare levy
+    offset = min(calculate_low_income_tax_offset(taxable_income), income_tax)
+    medicare_levy = calculate_medicare_levy(taxable_income, rates)
+
+    return {
+        "incomeTax": round(income_tax, 2),
+        "lowIncomeTaxOffset": round(offset, 2),
+        "medicareLevy": round(medicare_levy, 2),
+        "total": round(income_tax - offset + medicare_levy, 2),
+    }
+
+def reconcile_financial_years(payperiods_data: Dict, user_data: Dict) -> List[Dict]:
+    """
+    Reconcile withholding against the estimated annual tax for each financial year.
+
+    Args:
+        payperiods_data: The payperiods.json structure with tax calculated
+        user_data: The user.json structure, for each employer's tax-free threshold claim
+
+    Returns:
+        One reconciliation per financial year with pay, in date order
+    """
+    employers_by_id = {employer["id"]: employer for employer in user_data.get("employers", [])}
+
+    # Single pass: financial year -> employer ID -> [gross, tax withheld, periods]
+    totals: Dict[int, Dict[str, List[float]]] = {}
+    for employer_data in payperiods_data["payPeriods"]:
+        employer_id = employer_data["employerId"]
+        for period in employer_data["periods"]:
+            if not period.get("totalGrossPay"):
+                continue
+            year_totals = totals.setdefault(get_financial_year(period["payDate"]), {})
+            employer_totals = year_totals.setdefault(employer_id, [0.0, 0.0, 0])
+            employer_totals[0] += period["totalGrossPay"]
+            employer_totals[1] += period.get("tax", 0)
+            employer_totals[2] += 1
+
+    reconciliations = []
+    for start_year in sorted(totals):
+        employers = []
+        for employer_id, (gross, withheld, periods) in totals[start_year].items():
+            employer_info = employers_by_id.get(employer_id, {})
+            employers.append({
+                "employerId": employer_id,
+                "employer": employer_info.get("name", employer_id),
+                "taxFreeThreshold": employer_info.get("taxFreeThreshold", True),
+                "periods": periods,
+                "grossIncome": round(gross, 2),
+                "taxWithheld": round(withheld, 2),
+            })
+
+        gross_income = round(sum(employer["grossIncome"] for employer in employers), 2)
+        tax_withheld = round(sum(employer["taxWithheld"] for employer in employers), 2)
+        estimated_tax = estimate_annual_tax(gross_income, start_year)
+        difference = round(tax_withheld - estimated_tax["total"], 2)
+
+        if difference > BALANCED_TOLERANCE:
+            status = "over_withheld"
+        elif difference < -BALANCED_TOLERANCE:
+            status = "under_withheld"
+        else:
+            status = "balanced"
+
+        flags = []
+        threshold_claims = [employer["employerId"] for employer in employers if employer["taxFreeThreshold"]]
+        if len(threshold_claims) > 1:
+            flags.append({
+                "type": "multiple_tax_free_threshold_claims",
+                "employers": threshold_claims,
+                "message": "The tax-free threshold is claimed with more than one employer; "
+                           "it should normally be claimed only from the highest paying job",
+            })
+        if status == "under_withheld":
+            flags.append({
+                "type": "under_withholding",
+                "amount": -difference,
+                "message": f"About ${-difference:.2f} more tax than was withheld may be payable",
+            })
+        elif status == "over_withheld":
+            flags.append({
+                "type": "over_withholding",
+                "amount": difference,
+                "message": f"About ${difference:.2f} of the tax withheld may be refunded",
+            })
+
+        reconciliations.append({
+            "financialYear": format_financial_year(start_year),
+            "startDate": f"{start_year}-07-01",
+            "endDate": f"{start_year + 1}-06-30",
+            "grossIncome": gross_income,
+            "taxWithheld": tax_withheld,
+            "estimatedTax": estimated_tax,
+            "difference": difference,
+            "status": status,
+            "employers": employers,
+            "flags": flags,
+        })
+
+    return reconciliations
+
+def print_reconciliations(reconciliations: List[Dict]) -> None:
+    """Print a short summary of each financial year's reconciliation."""
+    for reconciliation in reconciliations:
+        print(f"Financial year {reconciliation['financialYear']}: gross ${reconciliation['grossIncome']:.2f}, "
+              f"withheld ${reconciliation['taxWithheld']:.2f}, "
+              f"estimated tax ${reconciliation['estimatedTax']['total']:.2f} ({reconciliation['status']})")
+        for flag in reconciliation["flags"]:
+            print(f"  Warning: {flag['message']}")
+
+if __name__ == "__main__":
+    # Example usage
+    for income in (18000, 30000, 60000, 150000):
+        print(f"Estimated 2024-25 tax on ${income}:", estimate_annual_tax(income, 2024))
@@ -0,0 +1,80 @@
+"""Tests for the precomputed cashflow series."""
+
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from cashflow_series import LEVELS, build_cashflow_series
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+def make_payperiods(pay_dates_by_employer):
+    return {"payPeriods": [
+        {"employerId": employer_id, "employer": f"Company {employer_id}",
+         "periods": [{"payDate": pay_date, "netPay": net_pay} for pay_date, net_pay in periods]}
+        for employer_id, periods in pay_dates_by_employer.items()
+    ]}
+
+def test_start_date_carries_the_earlier_balance():
+    payperiods = make_payperiods({
+        "A": [("2025-01-01", 100.0), ("2025-01-08", 150.25), ("2025-01-15", 90.5)],
+        "B": [("2025-01-03", 200.0), ("2025-01-17", 210.0)],
+    })
+
+    full = build_cashflow_series(payperiods)
+    later = build_cashflow_series(payperiods, start_date="2025-01-08")
+
+    assert later["openingBalance"] == {"A": 100.0, "B": 200.0, "total": 300.0}
+    assert later["daily"]["inflows"]["total"][0] == 150.25
+    for key in ("A", "B", "total"):
+        assert later["daily"]["balance"][key] == full["daily"]["balance"][key][7:]
+    assert later["levels"]["monthly"]["series"]["total"]["close"] == [750.75]
+
+def test_levels_bucket_weeks_months_and_quarters():
+    payperiods = make_payperiods({
+        # A Sunday, the Monday after, and the first day of the next quarter
+        "A": [("2025-03-30", 100.0), ("2025-03-31", 50.0), ("2025-04-01", 25.0)],
+    })
+
+    levels = build_cashflow_series(payperiods)["levels"]
+
+    assert levels["weekly"]["starts"] == ["2025-03-24", "2025-03-31"]
+    assert levels["weekly"]["series"]["A"] == {"sum": [100.0, 75.0], "min": [100.0, 150.0],
+                                               "max": [100.0, 175.0], "close": [100.0, 175.0]}
+    assert levels["monthly"]["starts"] == ["2025-03-01", "2025-04-01"]
+    assert levels["monthly"]["series"]["A"]["sum"] == [150.0, 25.0]
+    assert levels["quarterly"]["starts"] == ["2025-01-01", "2025-04-01"]
+    assert levels["quarterly"]["series"]["total"]["close"] == [150.0, 175.0]
+
+@pytest.mark.parametrize("level", list(LEVELS))
+def test_levels_match_the_daily_series(level):
+    cashflow = build_cashflow_series(load_json_file("payperiods.json"))
+    first_day = date.fromisoformat(cashflow["startDate"])
+
+    # Group the daily values by bucket the slow way
+    buckets = {}
+    for offset in range(len(cashflow["daily"]["inflows"]["total"])):
+        bucket = LEVELS[level](first_day + timedelta(days=offset)).isoformat()
+        buckets.setdefault(bucket, []).append(offset)
+
+    rollup = cashflow["levels"][level]
+    assert rollup["starts"] == list(buckets)
+    for key, column in rollup["series"].items():
+        inflows = cashflow["daily"]["inflows"][key]
+        balances = cashflow["daily"]["balance"][key]
+        assert [round(value * 100) for value in column["sum"]] == [
+            sum(round(inflows[offset] * 100) for offset in offsets) for offsets in buckets.values()
+        ]
+        assert column["min"] == [min(balances[offset] for offset in offsets) for offsets in buckets.values()]
+        assert column["max"] == [max(balances[offset] for offset in offsets) for offsets in buckets.values()]
+        assert column["close"] == [balances[offsets[-1]] for offsets in buckets.values()]
+    # Every level totals to the same figure as the daily series
+    assert sum(round(value * 100) for value in rollup["series"]["total"]["sum"]) == \
+           round(cashflow["daily"]["balance"]["total"][-1] * 100)
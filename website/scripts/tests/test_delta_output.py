@@ -0,0 +1,89 @@
+"""Tests for delta patches: diffing results and applying the patch back."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from delta_output import (apply_patch, count_ops, diff_employers, diff_pay_periods, diff_shifts,
+                          read_patch_stream, write_patch_stream)
+from storage import shift_key
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def shiftspay_data():
+    return load_json_file("shiftspay.json")
+
+@pytest.fixture(scope="module")
+def payperiods_data():
+    return load_json_file("payperiods.json")
+
+def keyed(shifts):
+    return {shift_key(shift): shift for shift in shifts}
+
+def test_unchanged_results_give_an_empty_patch(shiftspay_data, payperiods_data):
+    assert diff_shifts(shiftspay_data["shifts"], copy.deepcopy(shiftspay_data["shifts"])) == []
+    assert diff_pay_periods(payperiods_data, copy.deepcopy(payperiods_data)) == []
+
+def test_shift_patch_round_trips(shiftspay_data, tmp_path):
+    previous = shiftspay_data["shifts"]
+    current = copy.deepcopy(previous)
+    current[3]["grossPay"] += 10
+    removed = current.pop(7)
+    # Starts with an existing shift but ends earlier, so it's a new record
+    current.append(dict(current[0], end="12:00", hoursWorked=1))
+
+    ops = diff_shifts(previous, current)
+
+    assert [(op["op"], tuple(op["key"])) for op in ops] == [
+        ("upsert", shift_key(current[3])),
+        ("upsert", shift_key(current[-1])),
+        ("delete", shift_key(removed)),
+    ]
+    assert count_ops(ops) == "2 upserts, 1 delete"
+
+    patch_file = str(tmp_path / "shiftspay.ndjson")
+    write_patch_stream(patch_file, ops)
+    patched = {"shifts": copy.deepcopy(previous)}
+    apply_patch(read_patch_stream(patch_file), shiftspay_data=patched)
+
+    assert keyed(patched["shifts"]) == keyed(current)
+    assert len(patched["shifts"]) == len(current)
+
+def test_period_patch_keeps_periods_in_start_date_order(payperiods_data):
+    previous = copy.deepcopy(payperiods_data)
+    current = copy.deepcopy(payperiods_data)
+    current["payPeriods"][0]["periods"][0]["netPay"] += 1
+    del current["payPeriods"][1]["periods"][-1]
+    current["payPeriods"].append({"employerId": "C", "employer": "Company C",
+                                  "periods": copy.deepcopy(current["payPeriods"][0]["periods"][:1])})
+    # A middle period missing from the old data has to be inserted back in place
+    del previous["payPeriods"][0]["periods"][2]
+
+    patched = copy.deepcopy(previous)
+    apply_patch(diff_pay_periods(previous, current), payperiods_data=patched)
+
+    assert patched == current
+
+def test_employer_patch_round_trips():
+    previous = {"employers": [{"id": "A", "level": "level_1"}, {"id": "B", "level": "level_1"}]}
+    current = {"employers": [{"id": "A", "level": "level_2"}, {"id": "C", "level": "level_1"}]}
+
+    patched = copy.deepcopy(previous)
+    apply_patch(diff_employers(previous, current), user_data=patched)
+
+    assert patched == current
+
+def test_an_empty_patch_writes_an_empty_file(tmp_path):
+    patch_file = str(tmp_path / "patch.ndjson")
+    write_patch_stream(patch_file, [])
+
+    assert os.path.getsize(patch_file) == 0
+    assert list(read_patch_stream(patch_file)) == []
@@ -0,0 +1,90 @@
+"""Tests for earnings index range queries against totals summed shift by shift."""
+
+import json
+import os
+
+import pytest
+
+from earnings_index import PERIOD_FIELDS, SHIFT_FIELDS, EarningsIndex, financial_year_range
+from shift_units import to_hundredths
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def shifts():
+    return load_json_file("shiftspay.json")["shifts"]
+
+@pytest.fixture(scope="module")
+def payperiods_data():
+    return load_json_file("payperiods.json")
+
+@pytest.fixture(scope="module")
+def index(shifts, payperiods_data):
+    return EarningsIndex(shifts, payperiods_data)
+
+def in_range(date, start_date, end_date):
+    return (start_date is None or date >= start_date) and (end_date is None or date <= end_date)
+
+# Open ends, a single day, bounds on shift dates, and ranges before and after the data
+RANGES = [
+    (None, None),
+    ("2025-02-01", "2025-02-28"),
+    ("2025-03-15", None),
+    (None, "2025-01-31"),
+    ("2025-04-12", "2025-04-12"),
+    ("2024-01-01", "2024-12-31"),
+    ("2026-01-01", None),
+    ("2025-03-01", "2025-02-01"),
+]
+
+@pytest.mark.parametrize("start_date,end_date", RANGES)
+@pytest.mark.parametrize("employer_id", [None, "A", "B", "missing"])
+def test_shift_totals_match_a_scan(index, shifts, start_date, end_date, employer_id):
+    matching = [shift for shift in shifts if in_range(shift["date"], start_date, end_date)
+                and employer_id in (None, shift["employerId"])]
+
+    totals = index.shift_totals(start_date, end_date, employer_id)
+
+    assert totals["shifts"] == len(matching)
+    for field in SHIFT_FIELDS:
+        assert to_hundredths(totals[field]) == sum(to_hundredths(shift.get(field, 0)) for shift in matching)
+    for category in index.categories:
+        assert to_hundredths(totals["categories"][category]) == sum(
+            to_hundredths(item["hours"]) for shift in matching
+            for item in shift["payCategories"] if item["category"] == category
+        )
+
+@pytest.mark.parametrize("start_date,end_date", RANGES + [financial_year_range(2024)])
+@pytest.mark.parametrize("employer_id", [None, "A", "B"])
+def test_period_totals_match_a_scan(index, payperiods_data, start_date, end_date, employer_id):
+    matching = [
+        period
+        for employer_data in payperiods_data["payPeriods"]
+        if employer_id in (None, employer_data["employerId"])
+        for period in employer_data["periods"]
+        if in_range(period["payDate"], start_date, end_date)
+    ]
+
+    totals = index.period_totals(start_date, end_date, employer_id)
+
+    assert totals["periods"] == len(matching)
+    for field in PERIOD_FIELDS:
+        assert to_hundredths(totals[field]) == sum(to_hundredths(period.get(field, 0)) for period in matching)
+
+def test_shifts_on_the_same_day_are_all_counted():
+    shifts = [
+        {"date": "2025-03-05", "employerId": "A", "hoursWorked": 2.5, "grossPay": 0.1,
+         "allowanceTotal": 0, "totalGrossPay": 0.1, "payCategories": []}
+        for _ in range(3)
+    ]
+    index = EarningsIndex(shifts)
+
+    assert index.shift_totals("2025-03-05", "2025-03-05")["shifts"] == 3
+    # Summed in cents, so no float drift
+    assert index.shift_totals("2025-03-05", "2025-03-05")["grossPay"] == 0.3
+    assert index.period_totals() == {"periods": 0, "totalHours": 0, "totalGrossPay": 0, "tax": 0, "netPay": 0}
@@ -0,0 +1,155 @@
+"""Tests for the overtime pass, on hand-built processed shifts."""
+
+from overtime import apply_overtime
+
+LEVEL = "level_1"
+
+TIERS = [
+    {"hours": 3, "category": "overtime_first_3", "multiplier": 1.5},
+    {"hours": None, "category": "overtime_after_3", "multiplier": 2},
+]
+
+USER = {"employers": [{"id": "E1", "level": LEVEL}]}
+
+def make_config(overtime=None, award_versions=None):
+    config = {
+        "award": {"effectiveDate": "2026-01-01"},
+        "casual": {LEVEL: {"hourly_rate": 30.0, "rates": {"ordinary": 30.0}}},
+        "timeCategories": {"ordinary": "Ordinary hours"},
+    }
+    if overtime is not None:
+        config["overtime"] = overtime
+    if award_versions is not None:
+        config["awardVersions"] = award_versions
+    return config
+
+def make_shift(date, start, end, hours):
+    return {
+        "date": date,
+        "employerId": "E1",
+        "start": start,
+        "end": end,
+        "hoursWorked": hours,
+        "payCategories": [{"category": "ordinary", "hours": hours, "rate": 30.0,
+                           "description": "Ordinary hours"}],
+        "grossPay": round(hours * 30, 2),
+        "allowanceTotal": 0,
+        "totalGrossPay": round(hours * 30, 2),
+    }
+
+def category_hours(shift):
+    return {category["category"]: category["hours"] for category in shift["payCategories"]}
+
+def test_split_shift_on_the_same_day_stays_ordinary():
+    config = make_config({"minRestHours": 10, "tiers": TIERS})
+    shifts = [
+        make_shift("2026-10-14", "09:00", "12:00", 3),
+        make_shift("2026-10-14", "13:00", "17:00", 4),
+    ]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert result == shifts
+    assert "overtimeHours" not in result[1]
+
+def test_short_turnaround_is_overtime_in_full():
+    config = make_config({"minRestHours": 10, "tiers": TIERS})
+    shifts = [
+        make_shift("2026-10-14", "09:00", "12:00", 3),
+        make_shift("2026-10-14", "15:00", "23:00", 8),
+        # 8 hours after the last shift of the previous day ended
+        make_shift("2026-10-15", "07:00", "12:00", 5),
+        # Later the same day, so not checked again
+        make_shift("2026-10-15", "13:00", "15:00", 2),
+        # 10 hours after the previous day's last shift ended
+        make_shift("2026-10-16", "01:00", "05:00", 4),
+    ]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert result[:2] == shifts[:2]
+    assert result[2]["overtimeHours"] == 5
+    assert category_hours(result[2]) == {"overtime_first_3": 3, "overtime_after_3": 2}
+    assert result[2]["grossPay"] == 3 * 45 + 2 * 60
+    assert result[3] == shifts[3]
+    assert result[4] == shifts[4]
+
+def test_rest_is_measured_from_a_shift_ending_after_midnight():
+    config = make_config({"minRestHours": 10, "tiers": TIERS})
+    shifts = [
+        make_shift("2026-10-14", "18:00", "02:00", 8),
+        make_shift("2026-10-15", "10:00", "14:00", 4),
+    ]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert result[1]["overtimeHours"] == 4
+
+def test_weekly_hours_roll_over_from_sunday_to_monday():
+    config = make_config({"weeklyHours": 38, "tiers": TIERS})
+    # Monday 12 to Sunday 18 October 2026, then Monday 19 October
+    shifts = [make_shift(f"2026-10-{day}", "09:00", "17:00", 8) for day in (12, 13, 14, 15, 18, 19)]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert result[:4] == shifts[:4]
+    assert category_hours(result[4]) == {"ordinary": 6, "overtime_first_3": 2}
+    assert result[5] == shifts[5]
+
+def test_overtime_tiers_carry_over_between_shifts_in_a_day():
+    config = make_config({"dailyHours": 8, "tiers": TIERS})
+    shifts = [
+        make_shift("2026-10-14", "06:00", "16:00", 10),
+        make_shift("2026-10-14", "17:00", "20:00", 3),
+        # A new day starts the tiers again
+        make_shift("2026-10-15", "06:00", "16:00", 10),
+    ]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert category_hours(result[0]) == {"ordinary": 8, "overtime_first_3": 2}
+    assert category_hours(result[1]) == {"overtime_first_3": 1, "overtime_after_3": 2}
+    assert result[1]["grossPay"] == 1 * 45 + 2 * 60
+    assert category_hours(result[2]) == {"ordinary": 8, "overtime_first_3": 2}
+
+def test_overtime_rules_follow_the_award_version():
+    config = make_config(award_versions=[{
+        "effectiveDate": "2026-07-01",
+        "casual": {LEVEL: {"hourly_rate": 32.0, "rates": {"ordinary": 32.0, "overtime_first_3": 50.0}}},
+        "overtime": {"dailyHours": 8, "tiers": TIERS},
+    }])
+    shifts = [
+        make_shift("2026-06-30", "06:00", "16:00", 10),
+        make_shift("2026-07-01", "06:00", "17:00", 11),
+    ]
+
+    result = apply_overtime(shifts, USER, config)
+
+    assert result[0] == shifts[0]
+    assert category_hours(result[1]) == {"ordinary": 8, "overtime_first_3": 3}
+    rates = {category["category"]: category["rate"] for category in result[1]["payCategories"]}
+    # Listed rates win over the tier multiplier
+    assert rates["overtime_first_3"] == 50.0
+
+def test_shifts_are_unchanged_without_overtime_rules():
+    shifts = [make_shift("2026-10-14", "06:00", "20:00", 14)]
+
+    assert apply_overtime(shifts, USER, make_config()) is shifts
+
+def test_hours_that_stay_ordinary_keep_their_original_pay():
+    config = make_config({"dailyHours": 9, "tiers": TIERS})
+    # 6.6667 and 3.3333 hours unrounded, so the categories alone would price it at 333.30
+    shift = make_shift("2026-10-14", "12:00", "22:00", 10)
+    shift["payCategories"] = [
+        {"category": "ordinary", "hours": 6.67, "rate": 30.0, "description": "Ordinary hours"},
+        {"category": "evening_mon_fri", "hours": 3.33, "rate": 40.0, "description": "Evening"},
+    ]
+    shift.update({"grossPay": 333.33, "totalGrossPay": 333.33})
+
+    result = apply_overtime([shift], USER, config)[0]
+
+    assert category_hours(result) == {"ordinary": 6.0, "evening_mon_fri": 3.0, "overtime_first_3": 1}
+    # Only the hour moved to overtime is repriced: 333.33 - 0.67 * 30 - 0.33 * 40 + 45
+    assert result["grossPay"] == 345.03
+    assert result["totalGrossPay"] == 345.03
+    assert result["hoursWorked"] == 10
@@ -0,0 +1,104 @@
+"""Tests for the shift pay cache and the config caches behind it."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from calculate_shift_pay import calculate_shift_pay
+from config_cache import ConfigCache
+from pay_cache import CACHE_FORMAT_VERSION, ShiftPayCache, get_config_fingerprint
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def config_data():
+    return load_json_file("config.json")
+
+@pytest.fixture(scope="module")
+def user_data():
+    return load_json_file("user.json")
+
+# Tuesdays a week apart, neither a public holiday
+SHIFT = {"date": "2025-05-06", "employerId": "A", "employer": "Company A", "start": "16:00", "end": "22:00"}
+NEXT_WEEK = dict(SHIFT, date="2025-05-13")
+
+def test_repeated_shifts_reuse_the_cached_components(config_data, user_data):
+    cache = ShiftPayCache()
+
+    first = calculate_shift_pay(SHIFT, user_data, config_data, cache, verbose=False)
+    second = calculate_shift_pay(NEXT_WEEK, user_data, config_data, cache, verbose=False)
+
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert second == calculate_shift_pay(NEXT_WEEK, user_data, config_data, verbose=False)
+    assert second["date"] == "2025-05-13"
+    assert {key: value for key, value in second.items() if key != "date"} == \
+           {key: value for key, value in first.items() if key != "date"}
+
+def test_changed_config_misses_the_cache(config_data, user_data):
+    cache = ShiftPayCache()
+    original = calculate_shift_pay(SHIFT, user_data, config_data, cache, verbose=False)
+    changed = copy.deepcopy(config_data)
+    changed["casual"]["retail_employee_level_1"]["rates"]["evening_mon_fri"] += 1
+
+    repriced = calculate_shift_pay(NEXT_WEEK, user_data, changed, cache, verbose=False)
+
+    assert get_config_fingerprint(changed) != get_config_fingerprint(config_data)
+    assert cache.stats()["hits"] == 0
+    assert repriced["grossPay"] > original["grossPay"]
+    assert repriced == calculate_shift_pay(NEXT_WEEK, user_data, changed, verbose=False)
+
+def test_cached_components_are_copies(config_data, user_data):
+    cache = ShiftPayCache()
+    first = calculate_shift_pay(SHIFT, user_data, config_data, cache, verbose=False)
+    first["payCategories"][0]["hours"] = 99
+
+    second = calculate_shift_pay(NEXT_WEEK, user_data, config_data, cache, verbose=False)
+
+    assert second["payCategories"][0]["hours"] != 99
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ShiftPayCache(maxsize=2)
+    components = {"payCategories": [], "allowances": []}
+    cache.put("a", components)
+    cache.put("b", components)
+    cache.get("a")
+    cache.put("c", components)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_saved_cache_loads_back(tmp_path):
+    cache = ShiftPayCache()
+    cache.put("a", {"payCategories": [{"category": "ordinary", "hours": 3}], "allowances": []})
+    path = str(tmp_path / "cache.json")
+    cache.save(path)
+
+    assert ShiftPayCache.load(path).get("a") == cache.get("a")
+
+    with open(path, 'w') as f:
+        json.dump({"version": CACHE_FORMAT_VERSION + 1, "entries": [["a", {}]]}, f)
+    assert len(ShiftPayCache.load(path)) == 0
+
+def test_config_cache_keeps_the_most_recently_used_sections():
+    cache = ConfigCache(maxsize=2)
+    first, second, third = {"n": 1}, {"n": 2}, {"n": 3}
+    builds = []
+
+    def build(section):
+        builds.append(section["n"])
+        return section["n"] * 10
+
+    for section in (first, second, first, third, first, second):
+        assert cache.get_or_build(section, lambda: build(section)) == section["n"] * 10
+
+    # second was the least recently used when third arrived
+    assert builds == [1, 2, 3, 2]
+    assert len(cache) == 2
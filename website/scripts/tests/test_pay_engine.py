@@ -0,0 +1,73 @@
+"""Tests for the in-memory pay engine."""
+
+import copy
+import json
+import os
+from datetime import date
+
+import pytest
+
+from pay_engine import PayEngine
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def config_data():
+    return load_json_file("config.json")
+
+@pytest.fixture(scope="module")
+def user_data():
+    return load_json_file("user.json")
+
+@pytest.fixture(scope="module")
+def shifts():
+    return load_json_file("shifts.json")["shifts"]
+
+def test_pricing_errors_are_returned_as_issues(config_data, user_data, shifts):
+    user = copy.deepcopy(user_data)
+    user["employers"][1]["level"] = "missing_level"
+    engine = PayEngine(config_data, user)
+    batch = [shifts[0], shifts[0], shifts[2]]
+
+    result = engine.calculate_shifts(batch)
+
+    assert [shift["employerId"] for shift in result["shifts"]] == ["A"]
+    assert [(issue["type"], issue["index"]) for issue in result["issues"]] == [
+        ("duplicate", 1), ("pricing_error", 2)
+    ]
+    assert "missing_level" in result["issues"][1]["message"]
+    assert result["issues"][1]["shift"]["employerId"] == "B"
+
+def test_employers_without_shifts_get_periods_in_december(config_data, user_data, shifts):
+    engine = PayEngine(config_data, user_data)
+    employer_a_shifts = [shift for shift in shifts if shift["employerId"] == "A"]
+
+    result = engine.run(employer_a_shifts, today=date(2025, 12, 5))
+
+    periods = next(employer["periods"] for employer in result["payPeriods"] if employer["employerId"] == "B")
+    assert periods
+    assert periods[0]["startDate"] <= "2025-12-01"
+    assert periods[-1]["endDate"] >= "2025-12-31"
+    assert all(period["grossPay"] == 0 for period in periods)
+
+def test_run_matches_the_data_files(config_data, user_data, shifts):
+    engine = PayEngine(config_data, user_data)
+    original_shifts = copy.deepcopy(shifts)
+
+    result = engine.run(shifts, today=date(2025, 4, 28))
+
+    assert result["issues"] == []
+    assert result["shifts"] == load_json_file("shiftspay.json")["shifts"]
+    assert result["payPeriods"] == load_json_file("payperiods.json")["payPeriods"]
+    # The Wednesday and Thursday after Monday 28 April
+    assert result["nextPayDates"] == {"A": "2025-04-30", "B": "2025-05-01"}
+    assert shifts == original_shifts
+
+    # A second run is priced from the cache and gives the same results
+    assert engine.run(shifts, today=date(2025, 4, 28)) == result
+    assert engine.cache_stats()["hits"] >= len(shifts)
@@ -0,0 +1,49 @@
+"""Tests for building pay periods from processed shifts."""
+
+import copy
+import json
+import os
+
+import pytest
+
+from calculate_pay_periods import build_pay_periods
+from calculate_shift_pay import process_shifts
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def config_data():
+    return load_json_file("config.json")
+
+@pytest.fixture(scope="module")
+def user_data():
+    return load_json_file("user.json")
+
+@pytest.fixture(scope="module")
+def shifts():
+    return load_json_file("shifts.json")["shifts"]
+
+def test_award_version_without_the_level_leaves_categories_empty(config_data, user_data, shifts, capsys):
+    user = copy.deepcopy(user_data)
+    user["employers"][1]["level"] = "retail_employee_level_2"
+    config = copy.deepcopy(config_data)
+    casual = {level: rates for level, rates in config["casual"].items() if level != "retail_employee_level_2"}
+    config["awardVersions"] = [{"effectiveDate": "2025-03-01", "casual": casual}]
+
+    # Shifts priced before the version was added
+    processed = process_shifts(shifts, user, config_data, verbose=False)
+    payperiods = build_pay_periods({"shifts": processed}, user, config, verbose=True)
+
+    periods = {employer["employerId"]: employer["periods"] for employer in payperiods["payPeriods"]}
+    assert all(period["payCategories"] for period in periods["A"])
+    assert all(period["payCategories"] for period in periods["B"] if period["startDate"] < "2025-03-01")
+    later = [period for period in periods["B"] if period["startDate"] >= "2025-03-01"]
+    assert later and all(period["payCategories"] == [] for period in later)
+    # Their shifts are still paid
+    assert sum(period["grossPay"] for period in later) > 0
+    assert "level retail_employee_level_2 of employer B isn't in the award" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+"""Tests for the public holiday rules."""
+
+from datetime import date
+
+import pytest
+
+from public_holidays import (STATES, easter_sunday, generate_public_holidays, get_holiday_dates,
+                             get_substituted_holidays)
+
+def holiday_dates(year, section):
+    return {item["name"]: item["date"] for item in generate_public_holidays(year)[section]}
+
+@pytest.mark.parametrize("year,expected", [
+    (2019, date(2019, 4, 21)),
+    (2024, date(2024, 3, 31)),
+    (2025, date(2025, 4, 20)),
+    # The latest possible date
+    (2038, date(2038, 4, 25)),
+])
+def test_easter_sunday(year, expected):
+    assert easter_sunday(year) == expected
+
+def test_each_holiday_date_is_generated_once():
+    for year in range(2000, 2051):
+        holidays = generate_public_holidays(year)
+        national_dates = [item["date"] for item in holidays["national"]]
+        assert len(national_dates) == len(set(national_dates)), year
+        for state in STATES:
+            state_dates = [item["date"] for item in holidays[state]]
+            assert len(state_dates) == len(set(state_dates)), (year, state)
+            assert not set(state_dates) & set(national_dates), (year, state)
+
+def test_holidays_on_the_same_date_share_an_entry():
+    # Anzac Day fell on Easter Monday in 2011
+    national = generate_public_holidays(2011)["national"]
+
+    assert {"date": "2011-04-25", "name": "Easter Monday / Anzac Day"} in national
+
+def test_easter_holidays_follow_easter_sunday():
+    national = holiday_dates(2025, "national")
+
+    assert [national[name] for name in ("Good Friday", "Easter Saturday", "Easter Sunday", "Easter Monday")] == \
+           ["2025-04-18", "2025-04-19", "2025-04-20", "2025-04-21"]
+
+def test_state_holidays_fall_on_the_right_weekday():
+    assert holiday_dates(2025, "NSW")["King's Birthday"] == "2025-06-09"
+    assert holiday_dates(2025, "QLD")["King's Birthday"] == "2025-10-06"
+    # The last Monday of September
+    assert holiday_dates(2025, "WA")["King's Birthday"] == "2025-09-29"
+    assert holiday_dates(2025, "VIC")["Melbourne Cup Day"] == "2025-11-04"
+    # The Monday on or after 27 May
+    assert holiday_dates(2024, "ACT")["Reconciliation Day"] == "2024-05-27"
+    assert holiday_dates(2025, "ACT")["Reconciliation Day"] == "2025-06-02"
+
+@pytest.mark.parametrize("year,expected", [
+    # No weekend holidays
+    (2025, {"2025-01-01": "New Year's Day", "2025-01-27": "Australia Day holiday",
+            "2025-12-25": "Christmas Day", "2025-12-26": "Boxing Day"}),
+    # New Year's Day on a Saturday and Christmas Day on a Sunday
+    (2022, {"2022-01-01": "New Year's Day", "2022-01-03": "New Year's Day observed",
+            "2022-01-26": "Australia Day", "2022-12-25": "Christmas Day", "2022-12-26": "Boxing Day",
+            "2022-12-27": "Christmas Day observed"}),
+    # Christmas Day on a Saturday and Boxing Day on a Sunday
+    (2021, {"2021-01-01": "New Year's Day", "2021-01-26": "Australia Day",
+            "2021-12-25": "Christmas Day", "2021-12-26": "Boxing Day",
+            "2021-12-27": "Christmas Day observed", "2021-12-28": "Boxing Day observed"}),
+    # Only Boxing Day on a Saturday
+    (2020, {"2020-01-01": "New Year's Day", "2020-01-27": "Australia Day holiday",
+            "2020-12-25": "Christmas Day", "2020-12-26": "Boxing Day", "2020-12-28": "Boxing Day observed"}),
+])
+def test_weekend_holidays_are_substituted(year, expected):
+    assert {item["date"]: item["name"] for item in get_substituted_holidays(year)} == expected
+
+def test_config_holidays_override_the_generated_ones():
+    config_holidays = {"2025": {"VIC": [
+        {"date": "2025-09-26", "name": "AFL Grand Final Friday"},
+        {"date": "2025-11-04", "name": "Melbourne Cup Day", "regional": True},
+    ]}}
+
+    dates = get_holiday_dates(config_holidays, 2025, "VIC")
+
+    assert "2025-09-26" in dates
+    # The config section replaces the generated one, and regional holidays are skipped
+    assert "2025-11-04" not in dates and "2025-03-10" not in dates
+    assert "2025-04-25" in dates
+    assert "2025-11-04" in get_holiday_dates({}, 2025, "VIC")
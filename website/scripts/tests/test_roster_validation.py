@@ -0,0 +1,93 @@
+"""Tests for roster validation on hand-built shift lists."""
+
+import json
+import os
+
+from roster_validation import filter_shifts, find_roster_issues, summarize_issues
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+def make_shift(date, start, end, employer_id="A"):
+    return {"date": date, "employerId": employer_id, "start": start, "end": end}
+
+def issue_pairs(issues):
+    return [(issue["type"], issue["index"], issue.get("otherIndex")) for issue in issues]
+
+def test_back_to_back_shifts_do_not_overlap():
+    shifts = [
+        make_shift("2025-03-03", "09:00", "13:00"),
+        make_shift("2025-03-03", "13:00", "17:00", "B"),
+        # Ends after midnight, right when the next shift starts
+        make_shift("2025-03-03", "20:00", "02:00"),
+        make_shift("2025-03-04", "02:00", "06:00", "B"),
+    ]
+
+    assert find_roster_issues(shifts, {"A", "B"}) == []
+
+def test_overlaps_are_reported_against_the_latest_ending_shift():
+    shifts = [
+        make_shift("2025-03-03", "09:00", "17:00"),
+        make_shift("2025-03-03", "10:00", "12:00", "B"),
+        # Clear of the B shift but still inside the first one
+        make_shift("2025-03-03", "13:00", "14:00", "B"),
+        # Overlaps the previous day's shift running past midnight
+        make_shift("2025-03-03", "22:00", "03:00"),
+        make_shift("2025-03-04", "01:00", "05:00", "B"),
+    ]
+
+    issues = find_roster_issues(shifts, {"A", "B"})
+
+    assert issue_pairs(issues) == [("overlap", 1, 0), ("overlap", 2, 0), ("overlap", 4, 3)]
+    assert issues[1]["message"] == ("Shift on 2025-03-03 13:00-14:00 overlaps "
+                                    "2025-03-03 09:00-17:00 for employer A")
+    assert all(issue["severity"] == "warning" for issue in issues)
+    # Overlaps are reported but still paid
+    assert filter_shifts(shifts, issues) == shifts
+
+def test_duplicates_are_skipped_but_other_employers_only_overlap():
+    shifts = [
+        make_shift("2025-03-03", "09:00", "17:00"),
+        make_shift("2025-03-03", "09:00", "17:00", "B"),
+        make_shift("2025-03-03", "09:00", "17:00"),
+    ]
+
+    issues = find_roster_issues(shifts)
+
+    assert issue_pairs(issues) == [("overlap", 1, 0), ("duplicate", 2, 0)]
+    assert filter_shifts(shifts, issues) == shifts[:2]
+
+def test_invalid_records_and_unknown_employers_are_skipped():
+    shifts = [
+        make_shift("2025-03-03", "09:00", "17:00"),
+        {"date": "2025-03-04", "employerId": "A", "start": "09:00"},
+        make_shift("2025-02-30", "09:00", "17:00"),
+        make_shift("2025-03-05", "9am", "17:00"),
+        make_shift("2025-03-06", "24:00", "02:00"),
+        make_shift("2025-03-07", "09:00", "17:00", "C"),
+        make_shift("2025-03-08", "09:00", "09:00"),
+    ]
+
+    issues = find_roster_issues(shifts, {"A", "B"})
+
+    assert issue_pairs(issues) == [
+        ("invalid_record", 1, None),
+        ("invalid_record", 2, None),
+        ("invalid_record", 3, None),
+        ("invalid_record", 4, None),
+        ("unknown_employer", 5, None),
+        ("zero_duration", 6, None),
+    ]
+    assert issues[0]["message"] == "Missing or invalid fields: end"
+    assert summarize_issues(issues) == {"invalid_record": 4, "unknown_employer": 1, "zero_duration": 1}
+    # A zero length shift is only a warning, so it is still passed on
+    assert filter_shifts(shifts, issues) == [shifts[0], shifts[6]]
+
+def test_the_sample_roster_is_clean():
+    employer_ids = {employer["id"] for employer in load_json_file("user.json")["employers"]}
+
+    assert find_roster_issues(load_json_file("shifts.json")["shifts"], employer_ids) == []
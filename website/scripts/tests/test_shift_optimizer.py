@@ -0,0 +1,142 @@
+"""Tests for the shift offer optimizer, checked against a brute-force search."""
+
+import json
+import os
+import random
+import sys
+from datetime import date, timedelta
+from itertools import combinations
+
+import pytest
+
+from calculate_pay_periods import calculate_period_tax, generate_pay_periods
+from calculate_shift_pay import calculate_shift_pay
+from pay_cache import ShiftPayCache
+from shift_optimizer import conflicts, get_week_start, optimize_shift_offers
+from shift_units import get_shift_interval
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+MAX_WEEKLY_HOURS = 20
+MIN_REST_HOURS = 10
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def user_data():
+    return load_json_file("user.json")
+
+@pytest.fixture(scope="module")
+def config_data():
+    return load_json_file("config.json")
+
+def make_candidates(seed, count):
+    """Offers at both employers over a fortnight, some clashing with each other."""
+    rng = random.Random(seed)
+    first_day = date(2025, 4, 28)
+    shifts = []
+    for _ in range(count):
+        employer_id = rng.choice("AB")
+        start = rng.randrange(6 * 60, 22 * 60, 30)
+        end = (start + rng.randrange(3 * 60, 9 * 60 + 1, 30)) % (24 * 60)
+        shifts.append({
+            "date": (first_day + timedelta(days=rng.randrange(14))).isoformat(),
+            "employerId": employer_id,
+            "employer": f"Company {employer_id}",
+            "start": f"{start // 60:02d}:{start % 60:02d}",
+            "end": f"{end // 60:02d}:{end % 60:02d}",
+        })
+    return shifts
+
+def brute_force_net_gain(roster, candidates, user_data, config_data):
+    """Best net gain over every feasible subset of the candidates."""
+    employers = {employer["id"]: employer for employer in user_data["employers"]}
+    rest_minutes = MIN_REST_HOURS * 60
+    cache = ShiftPayCache()
+    priced_roster = [calculate_shift_pay(shift, user_data, config_data, cache, verbose=False) for shift in roster]
+    priced = [calculate_shift_pay(shift, user_data, config_data, cache, verbose=False) for shift in candidates]
+    intervals = [get_shift_interval(shift) for shift in candidates]
+    periods = [generate_pay_periods(employers[shift["employerId"]], shift["date"], shift["date"], config_data)[0]
+               for shift in candidates]
+
+    def net(key, period, gross_cents):
+        gross = gross_cents / 100
+        return gross - round(calculate_period_tax(gross, employers[key[0]], period, verbose=False), 2)
+
+    def net_gain(selected):
+        """Net pay the selected candidates add to their pay periods."""
+        added = {}
+        for index in selected:
+            key = (candidates[index]["employerId"], periods[index]["startDate"])
+            period, gross = added.get(key, (periods[index], 0))
+            added[key] = (period, gross + round(priced[index]["totalGrossPay"] * 100))
+
+        gain = 0.0
+        for key, (period, gross) in added.items():
+            base = sum(round(shift["totalGrossPay"] * 100) for shift in priced_roster
+                       if shift["employerId"] == key[0] and period["startDate"] <= shift["date"] <= period["endDate"])
+            gain += net(key, period, base + gross) - net(key, period, base)
+        return gain
+
+    roster_intervals = [get_shift_interval(shift) for shift in roster]
+    roster_week_hours = {}
+    for shift in priced_roster:
+        week = get_week_start(shift["date"])
+        roster_week_hours[week] = roster_week_hours.get(week, 0) + round(shift["hoursWorked"] * 100)
+
+    best = 0.0
+    for size in range(1, len(candidates) + 1):
+        for selected in combinations(range(len(candidates)), size):
+            if any(conflicts(intervals[i], other, rest_minutes) for i in selected for other in roster_intervals):
+                continue
+            if any(conflicts(intervals[i], intervals[j], rest_minutes) for i, j in combinations(selected, 2)):
+                continue
+            week_hours = dict(roster_week_hours)
+            for index in selected:
+                week = get_week_start(candidates[index]["date"])
+                week_hours[week] = week_hours.get(week, 0) + round(priced[index]["hoursWorked"] * 100)
+            if any(hours > MAX_WEEKLY_HOURS * 100 for hours in week_hours.values()):
+                continue
+
+            best = max(best, net_gain(selected))
+    return best
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_branch_and_bound_matches_brute_force(seed, user_data, config_data):
+    roster = [
+        {"date": "2025-04-29", "employerId": "A", "employer": "Company A", "start": "09:00", "end": "15:00"},
+        {"date": "2025-05-06", "employerId": "B", "employer": "Company B", "start": "12:00", "end": "18:00"},
+    ]
+    candidates = make_candidates(seed, 10)
+
+    result = optimize_shift_offers(roster, candidates, user_data, config_data,
+                                   max_weekly_hours=MAX_WEEKLY_HOURS, min_rest_hours=MIN_REST_HOURS)
+
+    assert result["optimal"]
+    assert result["netGain"] == pytest.approx(brute_force_net_gain(roster, candidates, user_data, config_data),
+                                              abs=0.005)
+    assert len(result["accepted"]) + len(result["declined"]) + len(result["rejected"]) == len(candidates)
+
+def test_overtime_rules_are_refused(user_data, config_data):
+    config = {**config_data, "overtime": {"dailyHours": 8, "tiers": [{"hours": None, "category": "overtime",
+                                                                      "multiplier": 1.5}]}}
+
+    with pytest.raises(ValueError, match="overtime"):
+        optimize_shift_offers([], make_candidates(1, 2), user_data, config)
+
+def test_long_candidate_lists_search_without_recursion(user_data, config_data):
+    # One short shift a day, so the first dive accepts every candidate
+    first_day = date(2025, 1, 6)
+    candidates = [
+        {"date": (first_day + timedelta(days=offset)).isoformat(), "employerId": "A",
+         "employer": "Company A", "start": "09:00", "end": "12:00"}
+        for offset in range(sys.getrecursionlimit() + 200)
+    ]
+
+    result = optimize_shift_offers([], candidates, user_data, config_data, max_nodes=5000)
+
+    assert len(result["accepted"]) == len(candidates)
+    assert result["nodes"] <= 5000
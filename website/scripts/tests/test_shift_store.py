@@ -0,0 +1,85 @@
+"""Tests for the binary shift store against the JSON aggregation path."""
+
+import copy
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calculate_pay_periods import aggregate_pay_periods, create_pay_periods
+from calculate_shift_pay import process_shifts
+from regression_check import diff_values
+from shift_store import ShiftStore, aggregate_store_periods, append_shifts, write_shift_store
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def config_data():
+    return load_json_file("config.json")
+
+@pytest.fixture(scope="module")
+def user_data():
+    return load_json_file("user.json")
+
+@pytest.fixture(scope="module")
+def computed_shifts(config_data, user_data):
+    return process_shifts(load_json_file("shifts.json")["shifts"], user_data, config_data, verbose=False)
+
+def aggregate_json(shifts, user_data, config_data):
+    shiftspay_data = {"shifts": shifts}
+    payperiods_data = create_pay_periods(shiftspay_data, user_data, config_data, verbose=False)
+    gross_amounts = aggregate_pay_periods(payperiods_data, shiftspay_data, user_data)
+    return payperiods_data, gross_amounts
+
+def aggregate_store(file_path, user_data, config_data):
+    with ShiftStore(file_path) as store:
+        payperiods_data = create_pay_periods(store.get_date_ranges(), user_data, config_data, verbose=False)
+        gross_amounts = aggregate_store_periods(store, payperiods_data, user_data)
+    return payperiods_data, gross_amounts
+
+def assert_same_in_cents(expected, actual):
+    # The store sums whole cents, so compare as the regression check does
+    differences = []
+    diff_values(list(expected), list(actual), "", differences)
+    assert differences == []
+
+def test_store_aggregation_matches_the_json_path(tmp_path, computed_shifts, user_data, config_data):
+    file_path = str(tmp_path / "shiftspay.bin")
+    write_shift_store(file_path, computed_shifts, list(config_data["timeCategories"]))
+
+    expected = aggregate_json(computed_shifts, user_data, config_data)
+    actual = aggregate_store(file_path, user_data, config_data)
+
+    assert sum(len(employer_data["periods"]) for employer_data in actual[0]["payPeriods"]) > 0
+    assert_same_in_cents(expected, actual)
+
+def test_appended_shifts_match_a_rebuilt_store(tmp_path, computed_shifts, user_data, config_data):
+    file_path = str(tmp_path / "shiftspay.bin")
+    half = len(computed_shifts) // 2
+    write_shift_store(file_path, computed_shifts[:half], list(config_data["timeCategories"]))
+    # Leave a partly written record behind, as an interrupted append would
+    with open(file_path, 'ab') as f:
+        f.write(b"\0" * 5)
+
+    assert append_shifts(file_path, computed_shifts[half:]) == len(computed_shifts) - half
+
+    with ShiftStore(file_path) as store:
+        assert len(store) == len(computed_shifts)
+    assert_same_in_cents(aggregate_json(computed_shifts, user_data, config_data),
+                         aggregate_store(file_path, user_data, config_data))
+
+def test_appending_an_unknown_employer_needs_a_rebuild(tmp_path, computed_shifts):
+    file_path = str(tmp_path / "shiftspay.bin")
+    write_shift_store(file_path, computed_shifts)
+    shift = copy.deepcopy(computed_shifts[0])
+    shift["employerId"] = "Z"
+
+    with pytest.raises(ValueError, match="rebuild the store"):
+        append_shifts(file_path, [shift])
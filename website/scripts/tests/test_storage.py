@@ -0,0 +1,108 @@
+"""Tests for the SQLite store: change-only syncs, range queries and the v2 migration."""
+
+import json
+import sqlite3
+
+import pytest
+
+from storage import SCHEMA_VERSION, PayStore
+
+def make_shift(date, start, end, employer_id="A"):
+    return {"date": date, "employerId": employer_id, "employer": f"Company {employer_id}",
+            "start": start, "end": end}
+
+SHIFTS = [
+    make_shift("2025-03-03", "09:00", "17:00"),
+    make_shift("2025-03-04", "16:00", "22:00", "B"),
+    make_shift("2025-03-05", "09:00", "13:00"),
+]
+
+@pytest.fixture
+def store(tmp_path):
+    with PayStore(str(tmp_path / "pay.db")) as store:
+        yield store
+
+def test_sync_writes_only_changed_rows(store):
+    assert store.sync_shifts(SHIFTS) == {"upserted": 3, "deleted": 0}
+    assert store.sync_shifts(SHIFTS) == {"upserted": 0, "deleted": 0}
+
+    edited = [SHIFTS[0], dict(SHIFTS[2], end="14:00")]
+
+    # The edited end is a new key, so the old shift goes with the dropped one
+    assert store.sync_shifts(edited) == {"upserted": 1, "deleted": 2}
+    assert store.get_shifts() == edited
+
+def test_shifts_starting_together_are_both_kept(store):
+    short = make_shift("2025-03-03", "09:00", "12:00")
+
+    store.sync_shifts([SHIFTS[0], short])
+
+    assert store.get_shifts() == [SHIFTS[0], short]
+
+def test_upsert_appends_new_shifts_after_the_stored_ones(store):
+    store.sync_shifts(SHIFTS[1:])
+    updated = dict(SHIFTS[1], notes="covering")
+
+    assert store.upsert_shifts([SHIFTS[0], updated]) == {"upserted": 2, "deleted": 0}
+    assert store.get_shifts() == [updated, SHIFTS[2], SHIFTS[0]]
+
+def test_shift_queries_filter_by_employer_and_date(store):
+    store.sync_shifts(SHIFTS)
+
+    assert store.get_shifts(employer_id="A") == [SHIFTS[0], SHIFTS[2]]
+    assert store.get_shifts(start_date="2025-03-04") == SHIFTS[1:]
+    assert store.get_shifts(employer_id="A", start_date="2025-03-04", end_date="2025-03-05") == [SHIFTS[2]]
+    assert store.get_shifts(end_date="2025-03-02") == []
+
+def test_pay_periods_and_user_round_trip(store):
+    user_data = {"name": "Test", "employers": [{"id": "A", "name": "Company A"},
+                                               {"id": "B", "name": "Company B"}]}
+    payperiods_data = {"payPeriods": [
+        {"employerId": "A", "employer": "Company A", "periods": [
+            {"startDate": "2025-03-03", "endDate": "2025-03-16", "payDate": "2025-03-20", "grossPay": 100},
+            {"startDate": "2025-03-17", "endDate": "2025-03-30", "payDate": "2025-04-03", "grossPay": 50},
+        ]},
+        {"employerId": "B", "employer": "Company B", "periods": []},
+    ]}
+
+    assert not store.has_user()
+    store.sync_user(user_data)
+    assert store.sync_pay_periods(payperiods_data) == {"upserted": 2, "deleted": 0}
+    assert store.sync_pay_periods(payperiods_data) == {"upserted": 0, "deleted": 0}
+
+    assert store.get_user() == user_data
+    assert store.get_payperiods_data() == payperiods_data
+    assert store.get_pay_periods(start_date="2025-04-01") == payperiods_data["payPeriods"][0]["periods"][1:]
+
+def test_version_1_database_is_migrated(tmp_path):
+    db_path = str(tmp_path / "pay.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE shifts (
+            employer_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            start TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (employer_id, date, start)
+        );
+        CREATE INDEX shifts_date ON shifts (date);
+    """)
+    conn.executemany(
+        "INSERT INTO shifts (employer_id, date, start, position, data) VALUES (?, ?, ?, ?, ?)",
+        [(shift["employerId"], shift["date"], shift["start"], position, json.dumps(shift))
+         for position, shift in enumerate(SHIFTS)]
+    )
+    conn.commit()
+    conn.close()
+
+    with PayStore(db_path) as store:
+        assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert [row[0] for row in store.conn.execute("SELECT end FROM shifts ORDER BY position")] == \
+               [shift["end"] for shift in SHIFTS]
+        assert store.get_shifts() == SHIFTS
+
+        # The old key would have rejected a second shift with the same start
+        short = make_shift("2025-03-03", "09:00", "12:00")
+        assert store.upsert_shifts([short]) == {"upserted": 1, "deleted": 0}
+        assert store.get_shifts(start_date="2025-03-03", end_date="2025-03-03") == [SHIFTS[0], short]
@@ -0,0 +1,99 @@
+"""Tests for the annual tax estimate and the reconciliation across employers."""
+
+import json
+import os
+
+import pytest
+
+from tax_reconciliation import estimate_annual_tax, get_financial_year, reconcile_financial_years
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        "src", "api", "data")
+
+def load_json_file(file_name):
+    with open(os.path.join(DATA_DIR, file_name), 'r') as f:
+        return json.load(f)
+
+USER = {"employers": [
+    {"id": "A", "name": "Company A", "taxFreeThreshold": True},
+    {"id": "B", "name": "Company B", "taxFreeThreshold": False},
+]}
+
+def make_period(pay_date, gross, tax):
+    return {"payDate": pay_date, "totalGrossPay": gross, "tax": tax}
+
+def make_payperiods(periods_by_employer):
+    return {"payPeriods": [
+        {"employerId": employer_id, "employer": f"Company {employer_id}", "periods": periods}
+        for employer_id, periods in periods_by_employer.items()
+    ]}
+
+@pytest.mark.parametrize("income,expected", [
+    # Below the tax-free threshold and the Medicare low income threshold
+    (18000, {"incomeTax": 0, "lowIncomeTaxOffset": 0, "medicareLevy": 0, "total": 0}),
+    # The offset is capped at the income tax, and the levy is still phasing in
+    (28000, {"incomeTax": 1568, "lowIncomeTaxOffset": 700, "medicareLevy": 77.8, "total": 945.8}),
+    # 4288 + 30% over 45000, less the partly withdrawn offset, plus the full 2% levy
+    (60000, {"incomeTax": 8788, "lowIncomeTaxOffset": 100, "medicareLevy": 1200, "total": 9888}),
+])
+def test_annual_tax_estimate(income, expected):
+    assert estimate_annual_tax(income, 2024) == expected
+
+def test_estimate_uses_the_rates_for_the_financial_year():
+    # 2023-24 taxed 45000 to 120000 at 32.5%
+    assert estimate_annual_tax(60000, 2023)["incomeTax"] == 9967
+
+def test_financial_years_start_on_1_july():
+    assert get_financial_year("2024-06-30") == 2023
+    assert get_financial_year("2024-07-01") == 2024
+
+def test_years_are_reconciled_across_employers():
+    payperiods_data = make_payperiods({
+        "A": [make_period("2024-06-30", 18000, 100), make_period("2024-07-10", 10000, 1000),
+              make_period("2025-06-30", 20000, 2000)],
+        "B": [make_period("2024-06-30", 0, 0), make_period("2025-01-15", 30000, 4000)],
+    })
+
+    earlier, later = reconcile_financial_years(payperiods_data, USER)
+
+    # The empty B period isn't counted, and the tax on 18000 is nil
+    assert earlier["financialYear"] == "2023-24"
+    assert [employer["employerId"] for employer in earlier["employers"]] == ["A"]
+    assert (earlier["grossIncome"], earlier["taxWithheld"], earlier["difference"]) == (18000, 100, 100)
+    assert earlier["status"] == "over_withheld"
+    assert [flag["type"] for flag in earlier["flags"]] == ["over_withholding"]
+
+    assert later["financialYear"] == "2024-25"
+    assert [(employer["periods"], employer["grossIncome"], employer["taxWithheld"])
+            for employer in later["employers"]] == [(2, 30000, 3000), (1, 30000, 4000)]
+    assert later["estimatedTax"]["total"] == 9888
+    assert later["difference"] == 7000 - 9888
+    assert later["status"] == "under_withheld"
+    assert later["flags"] == [{
+        "type": "under_withholding",
+        "amount": 2888,
+        "message": "About $2888.00 more tax than was withheld may be payable",
+    }]
+
+def test_small_differences_balance_and_threshold_claims_are_flagged():
+    user_data = {"employers": [dict(employer, taxFreeThreshold=True) for employer in USER["employers"]]}
+    payperiods_data = make_payperiods({
+        "A": [make_period("2025-01-15", 40000, 5000)],
+        "B": [make_period("2025-01-15", 20000, 4888.5)],
+    })
+
+    (reconciliation,) = reconcile_financial_years(payperiods_data, user_data)
+
+    assert reconciliation["difference"] == 0.5
+    assert reconciliation["status"] == "balanced"
+    assert reconciliation["flags"] == [{
+        "type": "multiple_tax_free_threshold_claims",
+        "employers": ["A", "B"],
+        "message": "The tax-free threshold is claimed with more than one employer; "
+                   "it should normally be claimed only from the highest paying job",
+    }]
+
+def test_reconciliation_matches_the_data_files():
+    reconciliations = reconcile_financial_years(load_json_file("payperiods.json"), load_json_file("user.json"))
+
+    assert reconciliations == load_json_file("taxreconciliation.json")["financialYears"]
@@ -0,0 +1,65 @@
+"""Tests for splitting shifts across time bands."""
+
+import pytest
+
+from time_bands import DEFAULT_TIME_BANDS, compile_time_bands, split_minutes
+
+MONDAY, TUESDAY, THURSDAY, FRIDAY, SUNDAY = 0, 1, 3, 4, 6
+
+def hhmm(time_str):
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+def split(time_bands, weekday, start, end, holidays=None):
+    """Split a shift, given as HH:MM times, into non-zero minutes per category."""
+    start_minute, end_minute = hhmm(start), hhmm(end)
+    if end_minute <= start_minute:
+        end_minute += 24 * 60
+    minutes = split_minutes(compile_time_bands(time_bands), start_minute, end_minute, weekday,
+                            holidays or [False, False])
+    return {category: value for category, value in minutes.items() if value}
+
+def test_weekday_shift_is_split_at_the_evening_band():
+    assert split(DEFAULT_TIME_BANDS, TUESDAY, "09:00", "20:00") == {"ordinary": 540, "evening_mon_fri": 120}
+
+def test_friday_night_pays_saturday_rates_after_midnight():
+    assert split(DEFAULT_TIME_BANDS, FRIDAY, "20:00", "02:00") == {"evening_mon_fri": 240, "saturday": 120}
+
+def test_weekday_hours_after_midnight_use_the_overnight_bands():
+    # Wednesday's normal bands would pay the hours after midnight as ordinary
+    assert split(DEFAULT_TIME_BANDS, TUESDAY, "22:00", "06:00") == {"evening_mon_fri": 480}
+
+def test_sunday_night_into_monday_uses_the_monday_overnight_bands():
+    assert split(DEFAULT_TIME_BANDS, SUNDAY, "22:00", "04:00") == {"sunday": 120, "evening_mon_fri": 240}
+
+def test_shift_into_a_public_holiday_is_split_at_midnight():
+    assert split(DEFAULT_TIME_BANDS, THURSDAY, "20:00", "02:00", [False, True]) == {
+        "evening_mon_fri": 240, "public_holiday": 120
+    }
+
+def test_overnight_bands_can_hand_back_to_day_rates():
+    time_bands = {
+        "weekday": {
+            "bands": [
+                {"start": "00:00", "category": "night"},
+                {"start": "07:00", "category": "ordinary"},
+                {"start": "19:00", "category": "evening"},
+            ],
+            "overnight": [
+                {"start": "00:00", "category": "evening"},
+                {"start": "07:00", "category": "ordinary"},
+            ],
+        },
+        "saturday": {"bands": [{"start": "00:00", "category": "saturday"}]},
+        "sunday": {"bands": [{"start": "00:00", "category": "sunday"}]},
+        "publicHoliday": {"bands": [{"start": "00:00", "category": "public_holiday"}]},
+    }
+
+    assert split(time_bands, MONDAY, "05:00", "09:00") == {"night": 120, "ordinary": 120}
+    assert split(time_bands, MONDAY, "18:00", "08:00") == {"ordinary": 120, "evening": 720}
+
+def test_bands_must_start_at_midnight():
+    time_bands = dict(DEFAULT_TIME_BANDS, saturday={"bands": [{"start": "06:00", "category": "saturday"}]})
+
+    with pytest.raises(ValueError, match="00:00"):
+        compile_time_bands(time_bands)
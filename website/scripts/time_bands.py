@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Time Band Engine
+
+This utility splits a shift into pay categories using time bands compiled
+from config["timeBands"]. Each day profile lists the points in the day where a
+new category starts:
+
+    "timeBands": {
+        "weekday": {
+            "bands": [
+                {"start": "00:00", "category": "ordinary"},
+                {"start": "18:00", "category": "evening_mon_fri"}
+            ],
+            "overnight": [
+                {"start": "00:00", "category": "evening_mon_fri"}
+            ]
+        },
+        "saturday": {"bands": [{"start": "00:00", "category": "saturday"}]},
+        "sunday": {"bands": [{"start": "00:00", "category": "sunday"}]},
+        "publicHoliday": {"bands": [{"start": "00:00", "category": "public_holiday"}]}
+    }
+
+Profiles can be given for "monday" to "sunday". "weekday" covers Monday to
+Friday unless a specific day is configured. "publicHoliday" applies to any day
+that is a public holiday. A band runs until the next band's start or until
+midnight, so early morning or late night bands are just extra entries in the
+list.
+
+"overnight" bands are used for the part of a shift that carries over from the
+previous day. This is how midnight crossover is configured. A day without
+"overnight" bands uses its normal bands for carried over hours. Public
+holidays always use the holiday bands.
+
+A shift is split by walking its minutes across the sorted band boundaries of
+each calendar day it touches, so a Friday night shift pays Saturday rates
+after midnight and a shift running into a public holiday is split at
+midnight.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from config_cache import ConfigCache
+from shift_units import MINUTES_PER_DAY, parse_minutes
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Bands matching the original weekday/evening/weekend/holiday rules
+DEFAULT_TIME_BANDS: Dict = {
+    "weekday": {
+        "bands": [
+            {"start": "00:00", "category": "ordinary"},
+            {"start": "18:00", "category": "evening_mon_fri"}
+        ],
+        "overnight": [
+            {"start": "00:00", "category": "evening_mon_fri"}
+        ]
+    },
+    "saturday": {"bands": [{"start": "00:00", "category": "saturday"}]},
+    "sunday": {"bands": [{"start": "00:00", "category": "sunday"}]},
+    "publicHoliday": {"bands": [{"start": "00:00", "category": "public_holiday"}]}
+}
+
+# Band boundaries in minutes after midnight, with the category for each band
+BandList = Tuple[List[int], List[str]]
+
+class DayProfile(TypedDict):
+    """Compiled bands for one kind of day"""
+    bands: BandList
+    overnight: BandList
+
+class CompiledTimeBands(TypedDict):
+    """Compiled day profiles and the categories they use"""
+    days: List[DayProfile]
+    publicHoliday: DayProfile
+    categories: List[str]
+
+# Compiled bands, by the timeBands section they came from
+_COMPILED_CACHE = ConfigCache()
+
+def _compile_band_list(bands: List[Dict], categories: List[str]) -> BandList:
+    """Sort a band list and convert its start times to minutes."""
+    if not bands:
+        raise ValueError("Time band list must not be empty")
+
+    ordered = sorted(bands, key=lambda band: parse_minutes(band["start"]))
+    starts = [parse_minutes(band["start"]) for band in ordered]
+    if starts[0] != 0:
+        raise ValueError("The first time band of a day must start at 00:00")
+    if len(set(starts)) != len(starts):
+        raise ValueError("Time bands must have distinct start times")
+
+    band_categories = [band["category"] for band in ordered]
+    for category in band_categories:
+        if category not in categories:
+            categories.append(category)
+
+    return starts, band_categories
+
+def _compile_profile(profile: Dict, categories: List[str]) -> DayProfile:
+    """Compile the normal and overnight bands for one day profile."""
+    bands = _compile_band_list(profile["bands"], categories)
+    overnight = _compile_band_list(profile["overnight"], categories) if profile.get("overnight") else bands
+    return {"bands": bands, "overnight": overnight}
+
+def compile_time_bands(time_bands: Dict) -> CompiledTimeBands:
+    """
+    Compile a timeBands config section.
+
+    Args:
+        time_bands: The "timeBands" section of the config
+
+    Returns:
+        Day profiles for Monday to Sunday and public holidays, plus the
+        categories in the order they first appear
+    """
+    categories: List[str] = []
+    days = []
+    for day_index, day_name in enumerate(DAY_NAMES):
+        profile = time_bands.get(day_name)
+        if profile is None and day_index < 5:
+            profile = time_bands.get("weekday")
+        if profile is None:
+            raise ValueError(f"No time bands configured for {day_name}")
+        days.append(_compile_profile(profile, categories))
+
+    if "publicHoliday" not in time_bands:
+        raise ValueError("No time bands configured for public holidays")
+    holiday = _compile_profile(time_bands["publicHoliday"], categories)
+
+    return {"days": days, "publicHoliday": holiday, "categories": categories}
+
+def get_time_bands(config_data: Optional[Dict]) -> CompiledTimeBands:
+    """Return the compiled time bands for a config, compiling them once."""
+    time_bands = DEFAULT_TIME_BANDS
+    if config_data is not None:
+        time_bands = config_data.get("timeBands", DEFAULT_TIME_BANDS)
+
+    return _COMPILED_CACHE.get_or_build(time_bands, lambda: compile_time_bands(time_bands))
+
+def split_minutes(compiled: CompiledTimeBands, start_minute: int, end_minute: int,
+                  first_weekday: int, holidays: List[bool]) -> Dict[str, int]:
+    """
+    Split a shift into minutes per category.
+
+    Args:
+        compiled: Compiled time bands
+        start_minute: Shift start in minutes after midnight of the shift date
+        end_minute: Shift end in minutes after midnight of the shift date
+        first_weekday: Weekday of the shift date (0 = Monday, 6 = Sunday)
+        holidays: Whether each calendar day touched by the shift is a public holiday
+
+    Returns:
+        A dictionary with every category as a key and minutes as values
+    """
+    minutes = {category: 0 for category in compiled["categories"]}
+
+    position = start_minute
+    day = start_minute // MINUTES_PER_DAY
+    while position < end_minute:
+        day_start = day * MINUTES_PER_DAY
+        day_end = day_start + MINUTES_PER_DAY
+
+        # Pick the profile for this calendar day
+        if day < len(holidays) and holidays[day]:
+            profile = compiled["publicHoliday"]
+        else:
+            profile = compiled["days"][(first_weekday + day) % 7]
+        starts, categories = profile["overnight"] if day > 0 else profile["bands"]
+
+        # Walk the band boundaries until the shift or the day ends
+        index = bisect_right(starts, position - day_start) - 1
+        segment_end = min(end_minute, day_end)
+        while position < segment_end:
+            next_start = day_start + starts[index + 1] if index + 1 < len(starts) else day_end
+            stop = min(next_start, segment_end)
+            minutes[categories[index]] += stop - position
+            position = stop
+            index += 1
+
+        day += 1
+
+    return minutes